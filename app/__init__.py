@@ -1,12 +1,13 @@
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from datetime import timedelta
+import logging
 import os
 
 # Initialize SQLAlchemy instance globally
 db = SQLAlchemy()
 
-def create_app():
+def create_app(test_config=None):
     # Get the absolute path to the templates directory
     template_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'templates'))
     static_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'static'))
@@ -21,19 +22,113 @@ def create_app():
     app.config['SECRET_KEY'] = 'your-secret-key-change-in-production'
     app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=30)
     
+    # Logging: per-module levels and sampling rates for noisy loggers
+    app.config['LOG_LEVEL'] = os.environ.get('LOG_LEVEL', 'INFO')
+    app.config['LOG_LEVELS'] = {}
+    app.config['LOG_SAMPLING'] = {}
+    
+    # Compile all templates into the bytecode cache at startup (e.g. TEMPLATE_PRECOMPILE=1 in production)
+    app.config['TEMPLATE_PRECOMPILE'] = os.environ.get('TEMPLATE_PRECOMPILE', '') == '1'
+    
+    # Worker threads, schedulers, sweepers and write-behind flushers run only in the
+    # server process (run.py turns this on); CLI commands, scripts and tests leave it off
+    app.config['BACKGROUND_SERVICES'] = False
+    
+    # Overrides used by the test suite (e.g. an in-memory database) and by run.py
+    if test_config:
+        app.config.update(test_config)
+    
+    # Set up queue-based logging before anything else writes log records
+    from app.logging_config import configure_logging
+    configure_logging(app)
+    
     # Initialize SQLAlchemy with the app
     db.init_app(app)
     
     # Import models after db is initialized (to avoid circular imports)
-    from app.models import User, JobPosting, Application
+    from app.models import (User, JobPosting, Application, JobPostingArchive, ApplicationArchive,
+                            ApplicationFitScore, JobMinHash, JobLshBand, SeekerRecommendation, DailyStat, AuditLog,
+                            SavedSearch, SavedSearchMatch, QueuedTask, TaskSchedule)
     
     # Register blueprints
     from app.routes import main
     app.register_blueprint(main)
     
+    # Request, SQL and connection pool instrumentation plus /metrics
+    from app.metrics import init_metrics
+    init_metrics(app, db)
+    
+    # Tagged cache for dashboard/model query results, invalidated through signals
+    from app.cache import init_cache
+    init_cache(app)
+    
+    # Token-bucket limits on login/register/search/apply, checked before any view runs
+    from app.ratelimit import init_rate_limiting
+    init_rate_limiting(app)
+    
+    # Fingerprinted static assets and maintenance CLI commands
+    from app.assets import init_assets
+    from app.commands import register_commands
+    init_assets(app)
+    register_commands(app)
+    
+    # gzip/brotli for rendered pages and JSON, with ETag/304 handling
+    from app.compression import init_compression
+    init_compression(app)
+    
     # Create tables within app context
     with app.app_context():
         db.create_all()
-        print("Database tables created successfully with SQLite3!")
+        
+        # Add columns/indexes introduced since the database file was created
+        from app.schema import upgrade_schema
+        upgrade_schema(db)
+        logging.getLogger(__name__).info("Database tables created successfully with SQLite3!")
+    
+    # In-memory typeahead index and facet counts over active postings
+    from app.search_index import init_search_index
+    from app.facets import init_facets
+    init_search_index(app)
+    init_facets(app)
+    
+    # TF-IDF job vectors for seeker recommendations
+    from app.recommend import init_recommendations
+    init_recommendations(app)
+    
+    # Applicant fit scores, computed in queued tasks
+    from app.fit_scores import init_fit_scores
+    init_fit_scores(app)
+    
+    # Saved-search alerts: new postings percolated against stored searches, sent as digests
+    from app.alerts import init_alerts
+    init_alerts(app)
+    
+    # Last-seen/last-login tracking flushed to users in batches
+    from app.activity import init_activity
+    init_activity(app)
+    
+    # Periodic expiry sweep and archival of old inactive postings
+    from app.lifecycle import init_lifecycle
+    init_lifecycle(app)
+    
+    # Admin audit trail written in batches
+    from app.audit import init_audit
+    init_audit(app)
+    
+    # Scheduled online backups of the SQLite database
+    from app.backup import init_backups
+    init_backups(app)
+    
+    # Daily activity rollups behind the admin reports
+    from app.analytics import init_analytics
+    init_analytics(app)
+    
+    # Persistent task queue: worker threads and the shared periodic scheduler
+    from app.tasks import init_tasks
+    init_tasks(app)
+    
+    # Jinja bytecode cache shared by workers, optionally filled at startup
+    from app.template_cache import init_templates
+    init_templates(app)
     
     return app
@@ -0,0 +1,123 @@
+"""
+Write-behind tracking of user logins and last-seen times
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from flask import session
+from sqlalchemy import update, bindparam
+
+from app.background import PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ACTIVE_WINDOW_MINUTES = 15
+
+
+class ActivityTracker:
+    """Last-seen times in recency order plus the pending writes for the next flush"""
+
+    def __init__(self, window_seconds=DEFAULT_ACTIVE_WINDOW_MINUTES * 60):
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._recent = OrderedDict()   # user_id -> monotonic last-seen, least recent first
+        self._pending = {}             # user_id -> {'last_seen': ..., 'last_login': ...}
+
+    def _touch(self, user_id, fields):
+        now = time.monotonic()
+        with self._lock:
+            self._recent[user_id] = now
+            self._recent.move_to_end(user_id)
+            self._pending.setdefault(user_id, {}).update(fields)
+            self._evict(now)
+
+    def _evict(self, now):
+        # Users idle past the window sit at the front, so this is amortised O(1)
+        cutoff = now - self.window_seconds
+        while self._recent and next(iter(self._recent.values())) < cutoff:
+            self._recent.popitem(last=False)
+
+    def seen(self, user_id):
+        """Record a request from user_id"""
+        self._touch(user_id, {'last_seen': datetime.utcnow()})
+
+    def login(self, user_id):
+        """Record a successful login"""
+        now = datetime.utcnow()
+        self._touch(user_id, {'last_seen': now, 'last_login': now})
+
+    def active_count(self):
+        """Number of users seen within the window"""
+        with self._lock:
+            self._evict(time.monotonic())
+            return len(self._recent)
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        """Write pending last_login/last_seen values to users in batched UPDATEs; returns rows written"""
+        from app.models import db, User
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        users = User.__table__
+        logins = [dict(fields, user_id=user_id) for user_id, fields in pending.items() if 'last_login' in fields]
+        visits = [dict(fields, user_id=user_id) for user_id, fields in pending.items() if 'last_login' not in fields]
+        try:
+            # One executemany per column set; users deleted in the meantime just match nothing
+            if logins:
+                db.session.execute(update(users).where(users.c.id == bindparam('user_id')).values(
+                    last_seen=bindparam('last_seen'), last_login=bindparam('last_login')), logins)
+            if visits:
+                db.session.execute(update(users).where(users.c.id == bindparam('user_id')).values(
+                    last_seen=bindparam('last_seen')), visits)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            # Put the batch back unless newer values arrived meanwhile
+            with self._lock:
+                for user_id, fields in pending.items():
+                    merged = dict(fields)
+                    merged.update(self._pending.get(user_id, {}))
+                    self._pending[user_id] = merged
+            raise
+        logger.debug("Activity flushed", extra={'users': len(pending)})
+        return len(pending)
+
+    def clear(self):
+        with self._lock:
+            self._recent.clear()
+            self._pending.clear()
+
+
+activity_tracker = ActivityTracker()
+
+
+def init_activity(app):
+    """Record last-seen times per request and flush them periodically in the server process"""
+    app.config.setdefault('ACTIVE_WINDOW_MINUTES', DEFAULT_ACTIVE_WINDOW_MINUTES)
+    app.config.setdefault('ACTIVITY_FLUSH_INTERVAL', 60)
+    app.config.setdefault('ACTIVITY_FLUSH_ENABLED', app.config['BACKGROUND_SERVICES'])
+    activity_tracker.window_seconds = app.config['ACTIVE_WINDOW_MINUTES'] * 60
+
+    @app.before_request
+    def record_activity():
+        user_id = session.get('user_id')
+        if user_id is not None:
+            activity_tracker.seen(user_id)
+
+    if app.config['ACTIVITY_FLUSH_ENABLED']:
+        flusher = PeriodicTask(app, 'activity-flush', app.config['ACTIVITY_FLUSH_INTERVAL'], activity_tracker.flush)
+        app.extensions['activity_flusher'] = flusher
+        flusher.start()
+        # Don't lose the last interval's writes on a clean shutdown
+        atexit.register(flusher.run_once)
@@ -0,0 +1,437 @@
+"""
+Saved job searches matched against new postings (percolator) and sent out as digests
+"""
+import abc
+import itertools
+import logging
+import os
+import smtplib
+import threading
+import uuid
+from collections import namedtuple
+from datetime import datetime
+from email.message import EmailMessage
+from urllib.parse import urlencode
+
+from flask import current_app
+from sqlalchemy import exists, func, insert, literal, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.geo import gazetteer
+from app.metrics import registry
+from app.search_index import normalize
+from app.signals import jobs_posted
+from app.tasks import task, enqueue, schedule
+
+logger = logging.getLogger(__name__)
+
+MAX_SAVED_SEARCHES = 20
+
+# Postings listed per saved search in one digest; the rest are summarised with a link
+MAX_JOBS_PER_SEARCH = 10
+
+ALERT_MATCHES = registry.counter(
+    'jobboard_alert_matches_total', 'Saved-search matches recorded for new postings')
+ALERT_DIGESTS = registry.counter(
+    'jobboard_alert_digests_total', 'Alert digests by outcome', ('outcome',))
+
+# A saved search compiled for matching; place_id is set when its location resolved to a known place
+SearchSpec = namedtuple('SearchSpec', ['search_id', 'terms', 'place_id', 'location_terms', 'job_type'])
+
+# The same fields extracted once from a new posting
+JobFeatures = namedtuple('JobFeatures', ['terms', 'place_id', 'location_terms', 'job_type'])
+
+
+def _words(text):
+    return frozenset(normalize(text).split())
+
+
+def compile_search(search_id, keywords=None, location=None, job_type=None):
+    # Same resolution as the /jobs location filter: a facet place id or free text
+    place = (gazetteer().get(location) or gazetteer().resolve(location)) if location else None
+    return SearchSpec(
+        search_id,
+        _words(keywords),
+        place.place_id if place is not None else None,
+        _words(location) if location and place is None else frozenset(),
+        job_type or None,
+    )
+
+
+def job_features(job):
+    text = ' '.join(filter(None, (job.title, job.description, job.company_name, job.location)))
+    return JobFeatures(_words(text), job.location_place_id, _words(job.location), job.job_type)
+
+
+def matches(spec, features):
+    """Every keyword appears as a word in the posting, and location and job type agree"""
+    return (spec.terms <= features.terms
+            and (spec.place_id is None or spec.place_id == features.place_id)
+            and spec.location_terms <= features.location_terms
+            and (spec.job_type is None or spec.job_type == features.job_type))
+
+
+def _anchor(spec):
+    """The single index key a saved search is filed under: its most selective criterion"""
+    if spec.terms:
+        # Longer words tend to be rarer, so fewer postings wake the search up
+        return ('term', max(spec.terms, key=lambda term: (len(term), term)))
+    if spec.place_id:
+        return ('place', spec.place_id)
+    if spec.location_terms:
+        return ('location', max(spec.location_terms, key=lambda term: (len(term), term)))
+    if spec.job_type:
+        return ('type', spec.job_type)
+    return ('any', None)
+
+
+def _probe_keys(features):
+    """Every anchor a posting with these features could satisfy"""
+    keys = [('term', term) for term in features.terms]
+    keys += [('location', term) for term in features.location_terms]
+    if features.place_id:
+        keys.append(('place', features.place_id))
+    if features.job_type:
+        keys.append(('type', features.job_type))
+    keys.append(('any', None))
+    return keys
+
+
+class Percolator:
+    """Inverted index over saved searches
+
+    Each search is filed under one anchor key it requires, so a posting is
+    checked in full only against the searches filed under its own words,
+    place and job type instead of against every saved search.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._specs = {}      # search_id -> SearchSpec
+        self._index = {}      # anchor key -> {search_id, ...}
+        self.max_id = 0       # highest search id loaded, for catching up on other workers' saves
+
+    def __len__(self):
+        return len(self._specs)
+
+    def _add(self, spec):
+        self._remove(spec.search_id)
+        self._specs[spec.search_id] = spec
+        self._index.setdefault(_anchor(spec), set()).add(spec.search_id)
+        self.max_id = max(self.max_id, spec.search_id)
+
+    def _remove(self, search_id):
+        spec = self._specs.pop(search_id, None)
+        if spec is not None:
+            bucket = self._index.get(_anchor(spec))
+            bucket.discard(search_id)
+            if not bucket:
+                del self._index[_anchor(spec)]
+
+    def add(self, spec):
+        with self._lock:
+            self._add(spec)
+
+    def remove(self, search_id):
+        with self._lock:
+            self._remove(search_id)
+
+    def rebuild(self, specs):
+        with self._lock:
+            self._specs, self._index, self.max_id = {}, {}, 0
+            for spec in specs:
+                self._add(spec)
+
+    def candidates(self, features):
+        """Searches sharing an anchor with the posting; only these are checked in full"""
+        with self._lock:
+            ids = set()
+            for key in _probe_keys(features):
+                ids.update(self._index.get(key, ()))
+            return [self._specs[search_id] for search_id in ids]
+
+    def match(self, features):
+        """Ids of the saved searches this posting satisfies"""
+        return sorted(spec.search_id for spec in self.candidates(features) if matches(spec, features))
+
+
+# Process-wide percolator, loaded on startup and kept current by save_search/delete_search
+percolator = Percolator()
+
+
+def _spec_for(search):
+    return compile_search(search.id, search.keywords, search.location, search.job_type)
+
+
+def _catch_up():
+    """Load searches saved through other worker processes since this one last looked"""
+    from app.models import SavedSearch
+
+    for search in SavedSearch.query.filter(SavedSearch.id > percolator.max_id).order_by(SavedSearch.id):
+        percolator.add(_spec_for(search))
+
+
+def save_search(seeker_id, name, keywords=None, location=None, job_type=None):
+    """Store a seeker's search and start matching new postings against it; raises ValueError if invalid"""
+    from app.models import db, SavedSearch
+
+    keywords, location, job_type = (keywords or '').strip(), (location or '').strip(), (job_type or '').strip()
+    if not (keywords or location or job_type):
+        raise ValueError('Add keywords, a location or a job type before saving a search.')
+    if SavedSearch.query.filter_by(seeker_id=seeker_id).count() >= MAX_SAVED_SEARCHES:
+        raise ValueError(f'You can keep up to {MAX_SAVED_SEARCHES} saved searches.')
+
+    name = (name or '').strip() or ' / '.join(filter(None, (keywords, location, job_type)))
+    search = SavedSearch(seeker_id=seeker_id, name=name[:100], keywords=keywords[:200] or None,
+                         location=location[:100] or None, job_type=job_type[:20] or None)
+    db.session.add(search)
+    db.session.commit()
+    percolator.add(_spec_for(search))
+    return search
+
+
+def delete_search(seeker_id, search_id):
+    """Delete one of the seeker's saved searches and its pending matches; returns whether it existed"""
+    from app.models import db, SavedSearch, SavedSearchMatch
+
+    search = SavedSearch.query.filter_by(id=search_id, seeker_id=seeker_id).first()
+    if search is None:
+        return False
+    SavedSearchMatch.query.filter_by(saved_search_id=search.id).delete(synchronize_session=False)
+    db.session.delete(search)
+    db.session.commit()
+    percolator.remove(search_id)
+    return True
+
+
+def saved_searches_for(seeker_id):
+    """The seeker's saved searches with their match counts, newest first"""
+    from app.models import db, SavedSearch, SavedSearchMatch
+
+    return db.session.query(
+        SavedSearch, func.count(SavedSearchMatch.id).label('matches'),
+        func.count(SavedSearchMatch.id).filter(SavedSearchMatch.notified_at.is_(None)).label('unsent')
+    ).outerjoin(SavedSearchMatch, SavedSearchMatch.saved_search_id == SavedSearch.id
+    ).filter(SavedSearch.seeker_id == seeker_id
+    ).group_by(SavedSearch.id).order_by(SavedSearch.created_at.desc(), SavedSearch.id.desc()).all()
+
+
+def percolate_job(job, now=None):
+    """Record a match for every saved search the posting satisfies; returns how many were new
+
+    Searches deleted by another worker may still be in this process's index,
+    so the insert only selects ids that still exist.
+    """
+    from app.models import db, SavedSearch, SavedSearchMatch
+
+    _catch_up()
+    search_ids = percolator.match(job_features(job))
+    if not search_ids:
+        return 0
+
+    already_matched = select(SavedSearchMatch.id).where(
+        SavedSearchMatch.saved_search_id == SavedSearch.id, SavedSearchMatch.job_id == job.id
+    )
+    source = select(SavedSearch.id, literal(job.id), literal(now or datetime.utcnow())).where(
+        SavedSearch.id.in_(search_ids), ~exists(already_matched)
+    )
+    try:
+        result = db.session.execute(insert(SavedSearchMatch).from_select(
+            ['saved_search_id', 'job_id', 'matched_at'], source
+        ))
+        db.session.commit()
+    except IntegrityError:
+        # Another worker recorded the same matches first
+        db.session.rollback()
+        return 0
+    ALERT_MATCHES.inc(result.rowcount)
+    return result.rowcount
+
+
+class DigestSender(abc.ABC):
+    """Base for digest delivery; implement send() to plug in another transport"""
+
+    def __init__(self, from_address):
+        self.from_address = from_address
+
+    @abc.abstractmethod
+    def send(self, to_address, subject, body):
+        """Deliver one digest email"""
+
+    def _message(self, to_address, subject, body):
+        message = EmailMessage()
+        message['From'] = self.from_address
+        message['To'] = to_address
+        message['Subject'] = subject
+        message.set_content(body)
+        return message
+
+
+class FileSender(DigestSender):
+    """Write each digest as an .eml file in a directory, standing in for SMTP in development and tests"""
+
+    def __init__(self, directory, from_address):
+        super().__init__(from_address)
+        self.directory = directory
+
+    def send(self, to_address, subject, body):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f'{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.eml')
+        with open(path, 'wb') as handle:
+            handle.write(self._message(to_address, subject, body).as_bytes())
+        return path
+
+
+class SMTPSender(DigestSender):
+    """Deliver digests through an SMTP relay"""
+
+    def __init__(self, host, port, from_address, username=None, password=None, use_tls=False, timeout=10):
+        super().__init__(from_address)
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+
+    def send(self, to_address, subject, body):
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            smtp.send_message(self._message(to_address, subject, body))
+
+
+def _search_url(row):
+    params = {'search': row.keywords, 'location': row.location, 'job_type': row.job_type}
+    query = urlencode({key: value for key, value in params.items() if value})
+    return f"{current_app.config['ALERT_BASE_URL'].rstrip('/')}/jobs?{query}"
+
+
+def _digest_body(name, rows):
+    """Plain-text digest of one seeker's active matches, grouped by saved search"""
+    lines = [f'Hi {name},', '', 'New postings match your saved searches:']
+    for _search_id, search_rows in itertools.groupby(rows, key=lambda row: row.saved_search_id):
+        search_rows = list(search_rows)
+        lines += ['', f'{search_rows[0].search_name}:']
+        for row in search_rows[:MAX_JOBS_PER_SEARCH]:
+            where = ', '.join(filter(None, (row.company_name, row.job_location)))
+            lines.append(f'  - {row.title}' + (f' ({where})' if where else ''))
+        if len(search_rows) > MAX_JOBS_PER_SEARCH:
+            lines.append(f'  ... and {len(search_rows) - MAX_JOBS_PER_SEARCH} more')
+        lines.append(f'  {_search_url(search_rows[0])}')
+    lines += ['', 'You can remove a saved search from your dashboard to stop these emails.']
+    return '\n'.join(lines)
+
+
+@task('alerts.send_digests', max_attempts=1)
+def send_digests(sender=None, now=None):
+    """Send each seeker one digest of their unsent matches; returns the number of digests sent
+
+    Matches are marked sent only after their digest goes out, so a failed
+    delivery is retried on the next run. Matches whose posting has closed
+    in the meantime are marked without being listed.
+    """
+    from app.models import db, User, JobPosting, SavedSearch, SavedSearchMatch
+
+    sender = sender or current_app.extensions['alert_sender']
+    now = now or datetime.utcnow()
+    rows = db.session.query(
+        SavedSearchMatch.id.label('match_id'), SavedSearch.id.label('saved_search_id'),
+        SavedSearch.seeker_id, SavedSearch.name.label('search_name'),
+        SavedSearch.keywords, SavedSearch.location, SavedSearch.job_type,
+        User.email, User.full_name, User.username,
+        JobPosting.title, JobPosting.company_name, JobPosting.location.label('job_location'), JobPosting.is_active
+    ).join(SavedSearch, SavedSearch.id == SavedSearchMatch.saved_search_id
+    ).join(User, User.id == SavedSearch.seeker_id
+    ).join(JobPosting, JobPosting.id == SavedSearchMatch.job_id
+    ).filter(SavedSearchMatch.notified_at.is_(None)
+    ).order_by(SavedSearch.seeker_id, SavedSearch.id, JobPosting.posted_date.desc()).all()
+
+    done, sent = [], 0
+    for _seeker_id, seeker_rows in itertools.groupby(rows, key=lambda row: row.seeker_id):
+        seeker_rows = list(seeker_rows)
+        listed = [row for row in seeker_rows if row.is_active]
+        if listed:
+            first = listed[0]
+            subject = f'{len(listed)} new job{"s" if len(listed) != 1 else ""} for your saved searches'
+            try:
+                sender.send(first.email, subject, _digest_body(first.full_name or first.username, listed))
+            except Exception as e:
+                ALERT_DIGESTS.inc(outcome='failed')
+                logger.exception("Alert digest to seeker %s failed: %s", first.seeker_id, e)
+                continue
+            ALERT_DIGESTS.inc(outcome='sent')
+            sent += 1
+        done.extend(row.match_id for row in seeker_rows)
+
+    for start in range(0, len(done), 500):
+        db.session.execute(update(SavedSearchMatch).where(
+            SavedSearchMatch.id.in_(done[start:start + 500])
+        ).values(notified_at=now))
+    db.session.commit()
+    if sent:
+        logger.info("Alert digests sent", extra={'digests': sent, 'matches': len(done)})
+    return sent
+
+
+@task('alerts.percolate_jobs')
+def percolate_jobs_task(job_ids):
+    """Match a batch of new postings (e.g. one import chunk) against the saved searches"""
+    from app.models import JobPosting
+
+    for job in JobPosting.query.filter(JobPosting.id.in_(job_ids), JobPosting.is_active == True):
+        percolate_job(job)
+
+
+def _on_jobs_posted(sender, jobs=(), **extra):
+    job_ids = [job.id for job in jobs if job.is_active]
+    if not job_ids:
+        return
+    try:
+        enqueue('alerts.percolate_jobs', job_ids=job_ids)
+    except Exception as e:
+        # Alerts must never fail the posting itself
+        logger.exception("Queueing saved-search matching for %s jobs failed: %s", len(job_ids), e)
+
+
+def _make_sender(app):
+    config = app.config
+    choice = config['ALERT_SENDER']
+    if isinstance(choice, DigestSender):
+        return choice
+    if choice == 'file':
+        return FileSender(config['ALERT_OUTBOX_DIR'], config['ALERT_FROM_ADDRESS'])
+    if choice == 'smtp':
+        return SMTPSender(config['SMTP_HOST'], config['SMTP_PORT'], config['ALERT_FROM_ADDRESS'],
+                          username=config['SMTP_USERNAME'], password=config['SMTP_PASSWORD'],
+                          use_tls=config['SMTP_USE_TLS'])
+    raise ValueError(f'Unsupported ALERT_SENDER: {choice}')
+
+
+def init_alerts(app):
+    """Load saved searches into the percolator, queue matching for new postings and schedule digests (not under TESTING)"""
+    from app.models import SavedSearch
+
+    app.config.setdefault('ALERT_SENDER', 'file')
+    app.config.setdefault('ALERT_OUTBOX_DIR', os.path.join(app.instance_path, 'outbox'))
+    app.config.setdefault('ALERT_FROM_ADDRESS', 'alerts@jobboard.local')
+    app.config.setdefault('ALERT_BASE_URL', 'http://localhost:5000')
+    app.config.setdefault('SMTP_HOST', 'localhost')
+    app.config.setdefault('SMTP_PORT', 25)
+    app.config.setdefault('SMTP_USERNAME', None)
+    app.config.setdefault('SMTP_PASSWORD', None)
+    app.config.setdefault('SMTP_USE_TLS', False)
+    app.config.setdefault('ALERT_DIGEST_INTERVAL', 3600)
+    app.config.setdefault('ALERT_DIGEST_ENABLED', not app.testing)
+
+    app.extensions['alert_sender'] = _make_sender(app)
+    with app.app_context():
+        percolator.rebuild(_spec_for(search) for search in SavedSearch.query)
+    logger.info("Saved searches loaded", extra={'searches': len(percolator)})
+    jobs_posted.connect(_on_jobs_posted, weak=False)
+
+    if app.config['ALERT_DIGEST_ENABLED']:
+        # Queued through the shared scheduler, so only one process sends each round of digests
+        schedule('alerts.send_digests', app.config['ALERT_DIGEST_INTERVAL'], 'alerts.send_digests')
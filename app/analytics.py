@@ -0,0 +1,194 @@
+"""
+Daily activity rollups for the admin dashboard
+"""
+import logging
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import delete, func, insert
+
+from app.background import PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+METRICS = ('signups', 'postings', 'applications')
+
+# One row per rolled-up day, so days without any activity still advance the watermark
+DAY_MARKER = 'rolled_up'
+
+
+def _sources():
+    """metric -> (timestamp column, dimension column or None)"""
+    from app.models import User, JobPosting, Application
+
+    return {
+        'signups': (User.created_at, User.role),
+        'postings': (JobPosting.posted_date, None),
+        'applications': (Application.application_date, Application.status),
+    }
+
+
+def _as_date(value):
+    # SQLite's date() returns text, other databases a date
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _day_start(day):
+    return datetime(day.year, day.month, day.day)
+
+
+def live_counts(start, end=None):
+    """Count raw rows created in [start, end) grouped by metric and dimension: {metric: {dimension: n}}"""
+    from app.models import db
+
+    counts = {metric: {} for metric in METRICS}
+    for metric, (column, dimension) in _sources().items():
+        keys = [dimension] if dimension is not None else []
+        query = db.session.query(*keys, func.count()).filter(column >= start)
+        if end is not None:
+            query = query.filter(column < end)
+        for row in query.group_by(*keys):
+            if row[-1]:
+                counts[metric][(row[0] or '') if keys else ''] = row[-1]
+    return counts
+
+
+def daily_counts(first_day, last_day):
+    """Count raw rows created on [first_day, last_day] as [{'day', 'metric', 'dimension', 'count'}]"""
+    from app.models import db
+
+    start, end = _day_start(first_day), _day_start(last_day + timedelta(days=1))
+    rows = []
+    for metric, (column, dimension) in _sources().items():
+        keys = [func.date(column)] + ([dimension] if dimension is not None else [])
+        query = db.session.query(*keys, func.count()).filter(column >= start, column < end).group_by(*keys)
+        rows += [{'day': _as_date(row[0]), 'metric': metric, 'dimension': (row[1] or '') if len(keys) > 1 else '',
+                  'count': row[-1]} for row in query]
+    return rows
+
+
+def rollup_days(first_day, last_day):
+    """Recount [first_day, last_day] from the raw tables and replace those days' rollup rows"""
+    from app.models import db, DailyStat
+
+    rows = daily_counts(first_day, last_day)
+    day = first_day
+    while day <= last_day:
+        rows.append({'day': day, 'metric': DAY_MARKER, 'dimension': '', 'count': 1})
+        day += timedelta(days=1)
+
+    db.session.execute(delete(DailyStat).where(DailyStat.day >= first_day, DailyStat.day <= last_day))
+    if rows:
+        db.session.execute(insert(DailyStat), rows)
+    db.session.commit()
+    return len(rows)
+
+
+def last_rolled_up_day():
+    """The latest day with stored rollups, or None before the first rollup"""
+    from app.models import db, DailyStat
+
+    latest = db.session.query(func.max(DailyStat.day)).filter(DailyStat.metric == DAY_MARKER).scalar()
+    return _as_date(latest) if latest is not None else None
+
+
+def _live_range(first_day, last_day, rolled_up):
+    """The part of [first_day, last_day] after the rollup watermark, which readers count live, or None"""
+    live_from = first_day if rolled_up is None else max(first_day, rolled_up + timedelta(days=1))
+    return (live_from, last_day) if live_from <= last_day else None
+
+
+def refresh_rollups(today=None):
+    """Roll up every completed day after the last one rolled up; returns the number of days processed
+
+    Today is never stored: it is still changing, so readers count it live.
+    Applications are counted under the status they had when their day was
+    rolled up.
+    """
+    from app.models import db, DailyStat
+
+    today = today or datetime.utcnow().date()
+    last_day = today - timedelta(days=1)
+    latest = last_rolled_up_day()
+    if latest is not None:
+        first_day = latest + timedelta(days=1)
+    else:
+        earliest = [db.session.query(func.min(column)).scalar() for column, _dimension in _sources().values()]
+        earliest = [value for value in earliest if value is not None]
+        if not earliest:
+            return 0
+        first_day = min(earliest).date()
+    if first_day > last_day:
+        return 0
+
+    rows = rollup_days(first_day, last_day)
+    days = (last_day - first_day).days + 1
+    logger.info("Daily rollups refreshed", extra={'first_day': str(first_day), 'days': days, 'rows': rows})
+    return days
+
+
+def period_totals(first_day, last_day):
+    """{metric: {dimension: total}} for [first_day, last_day]
+
+    Days up to the rollup watermark are summed from the rollups; later days
+    (today, and any the rollup task hasn't reached yet) are counted live.
+    """
+    from app.models import db, DailyStat
+
+    rolled_up = last_rolled_up_day()
+    totals = {metric: {} for metric in METRICS}
+    if rolled_up is not None:
+        rows = db.session.query(DailyStat.metric, DailyStat.dimension, func.sum(DailyStat.count)).filter(
+            DailyStat.metric.in_(METRICS), DailyStat.day >= first_day, DailyStat.day <= min(last_day, rolled_up)
+        ).group_by(DailyStat.metric, DailyStat.dimension)
+        for metric, dimension, total in rows:
+            totals.setdefault(metric, {})[dimension] = int(total)
+
+    live = _live_range(first_day, last_day, rolled_up)
+    if live is not None:
+        start, end = _day_start(live[0]), _day_start(live[1] + timedelta(days=1))
+        for metric, counts in live_counts(start, end).items():
+            for dimension, count in counts.items():
+                totals[metric][dimension] = totals[metric].get(dimension, 0) + count
+    return totals
+
+
+def daily_series(first_day, last_day):
+    """[(day, {metric: total})] for every day in the range, zero-filled, for charts
+
+    Days after the rollup watermark are counted live, as in period_totals.
+    """
+    from app.models import db, DailyStat
+
+    rolled_up = last_rolled_up_day()
+    by_day = {}
+    if rolled_up is not None:
+        rows = db.session.query(DailyStat.day, DailyStat.metric, func.sum(DailyStat.count)).filter(
+            DailyStat.metric.in_(METRICS), DailyStat.day >= first_day, DailyStat.day <= min(last_day, rolled_up)
+        ).group_by(DailyStat.day, DailyStat.metric)
+        for day, metric, total in rows:
+            by_day.setdefault(_as_date(day), {})[metric] = int(total)
+
+    live = _live_range(first_day, last_day, rolled_up)
+    if live is not None:
+        for row in daily_counts(*live):
+            counts = by_day.setdefault(row['day'], {})
+            counts[row['metric']] = counts.get(row['metric'], 0) + row['count']
+
+    series = []
+    day = first_day
+    while day <= last_day:
+        series.append((day, {metric: by_day.get(day, {}).get(metric, 0) for metric in METRICS}))
+        day += timedelta(days=1)
+    return series
+
+
+def init_analytics(app):
+    """Roll up completed days periodically in the server process"""
+    app.config.setdefault('ANALYTICS_ROLLUP_INTERVAL', 3600)
+    app.config.setdefault('ANALYTICS_ROLLUP_ENABLED', app.config['BACKGROUND_SERVICES'])
+
+    if app.config['ANALYTICS_ROLLUP_ENABLED']:
+        task = PeriodicTask(app, 'analytics-rollup', app.config['ANALYTICS_ROLLUP_INTERVAL'], refresh_rollups)
+        app.extensions['analytics_rollup'] = task
+        task.run_once()
+        task.start()
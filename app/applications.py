@@ -0,0 +1,195 @@
+"""
+Employer-side application status workflow with set-based bulk updates
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import select, update, insert, exists, literal
+from sqlalchemy.exc import IntegrityError
+
+from app.metrics import registry, record_cache_lookup
+from app.signals import application_status_changed, application_submitted
+
+logger = logging.getLogger(__name__)
+
+APPLICATION_STATUSES = ('pending', 'reviewed', 'accepted', 'rejected')
+
+STATUS_CHANGES = registry.counter(
+    'jobboard_application_status_changes_total', 'Applications moved to a status by employers', ('status',))
+
+APPLY_OUTCOMES = registry.counter(
+    'jobboard_apply_total', 'Job applications by outcome', ('outcome',))
+
+# apply_to_job outcomes
+APPLIED, DUPLICATE, CLOSED = 'applied', 'duplicate', 'closed'
+
+# How long a client idempotency key is remembered, and how many are kept
+IDEMPOTENCY_TTL_SECONDS = 600
+IDEMPOTENCY_MAX_KEYS = 10000
+
+
+class IdempotencyCache:
+    """Bounded, expiring map of (seeker, job, client key) -> apply outcome"""
+
+    def __init__(self, ttl=IDEMPOTENCY_TTL_SECONDS, max_size=IDEMPOTENCY_MAX_KEYS):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()    # key -> (expires_at, outcome), oldest first
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._entries[key]
+                return None
+            return entry[1]
+
+    def put(self, key, outcome):
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (now + self.ttl, outcome)
+            self._entries.move_to_end(key)
+            # Entries are in insertion order, so expired ones sit at the front
+            while self._entries and (len(self._entries) > self.max_size or next(iter(self._entries.values()))[0] <= now):
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+idempotency_keys = IdempotencyCache()
+
+
+def _insert_ignore(table):
+    """INSERT that skips rows violating a unique constraint, where the dialect supports it"""
+    from app.models import db
+
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return insert(table), False
+    return dialect_insert(table), True
+
+
+def apply_to_job(job_id, seeker_id, cover_letter=None, idempotency_key=None):
+    """Apply a seeker to an active job in one statement; returns APPLIED, DUPLICATE or CLOSED
+
+    The active-job guard and the duplicate check are part of a single
+    INSERT ... SELECT ... WHERE EXISTS ... ON CONFLICT DO NOTHING, so a burst
+    of submissions costs one round-trip each and can't race. A repeated
+    client idempotency key replays the first outcome without touching the
+    database.
+    """
+    from app.models import db, Application, JobPosting
+
+    cache_key = (seeker_id, job_id, idempotency_key) if idempotency_key else None
+    if cache_key:
+        outcome = idempotency_keys.get(cache_key)
+        record_cache_lookup('apply_idempotency', outcome is not None)
+        if outcome is not None:
+            APPLY_OUTCOMES.inc(outcome='replayed')
+            return outcome
+
+    job_is_active = exists().where(JobPosting.id == job_id, JobPosting.is_active.is_(True))
+    row = select(
+        literal(job_id), literal(seeker_id), literal(cover_letter), literal(datetime.utcnow()), literal('pending')
+    ).where(job_is_active)
+    columns = ['job_id', 'seeker_id', 'cover_letter', 'application_date', 'status']
+
+    stmt, ignores_conflicts = _insert_ignore(Application)
+    stmt = stmt.from_select(columns, row)
+    if ignores_conflicts:
+        stmt = stmt.on_conflict_do_nothing(index_elements=['job_id', 'seeker_id'])
+    try:
+        inserted = db.session.execute(stmt.returning(Application.id)).first()
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        inserted = None
+
+    if inserted is not None:
+        outcome = APPLIED
+        application_submitted.send(current_app._get_current_object(), job_id=job_id, seeker_id=seeker_id,
+                                   application_id=inserted[0])
+    else:
+        # Slow path only: tell a closed posting apart from a repeat application
+        active = db.session.query(job_is_active).scalar()
+        outcome = DUPLICATE if active else CLOSED
+
+    if cache_key:
+        idempotency_keys.put(cache_key, outcome)
+    APPLY_OUTCOMES.inc(outcome=outcome)
+    return outcome
+
+
+def update_application_status(employer_id, status, application_ids=None, job_ids=None, from_status=None):
+    """Move the employer's matching applications to `status` in one UPDATE; returns how many changed
+
+    Applications are selected by id and/or job and optionally by current
+    status (e.g. every pending applicant of a closed posting). Ownership is
+    part of the WHERE clause, so ids belonging to other employers are
+    skipped without ever being loaded.
+    """
+    from app.models import db, Application, JobPosting
+
+    if status not in APPLICATION_STATUSES:
+        raise ValueError(f'Unknown application status: {status}')
+    if from_status is not None and from_status not in APPLICATION_STATUSES:
+        raise ValueError(f'Unknown application status: {from_status}')
+    if not application_ids and not job_ids:
+        return 0
+
+    owned_jobs = select(JobPosting.id).where(JobPosting.employer_id == employer_id)
+    if job_ids:
+        owned_jobs = owned_jobs.where(JobPosting.id.in_(job_ids))
+
+    condition = Application.job_id.in_(owned_jobs) & (Application.status != status)
+    if application_ids:
+        condition &= Application.id.in_(application_ids)
+    if from_status is not None:
+        condition &= Application.status == from_status
+
+    changed = db.session.execute(
+        update(Application).where(condition).values(status=status)
+        .returning(Application.job_id, Application.seeker_id),
+        execution_options={'synchronize_session': False}
+    ).all()
+    db.session.commit()
+
+    if changed:
+        STATUS_CHANGES.inc(len(changed), status=status)
+        # One notification for the whole batch so dashboards are invalidated once
+        application_status_changed.send(
+            current_app._get_current_object(),
+            employer_id=employer_id,
+            job_ids=sorted({row.job_id for row in changed}),
+            seeker_ids=sorted({row.seeker_id for row in changed}),
+            status=status
+        )
+        logger.info("Application statuses updated",
+                    extra={'employer_id': employer_id, 'status': status, 'applications': len(changed)})
+    return len(changed)
+
+
+def status_counts(employer_id):
+    """{status: count} over all applications to the employer's postings"""
+    from app.models import db, Application, JobPosting
+
+    rows = db.session.query(Application.status, db.func.count(Application.id)).join(
+        JobPosting, Application.job_id == JobPosting.id
+    ).filter(JobPosting.employer_id == employer_id).group_by(Application.status).all()
+    counts = dict.fromkeys(APPLICATION_STATUSES, 0)
+    counts.update(rows)
+    return counts
@@ -0,0 +1,264 @@
+"""
+Static asset pipeline: vendoring, bundling, fingerprinting and precompression
+"""
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+import urllib.request
+
+from flask import abort, current_app, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; .gz siblings are always produced
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Third-party assets previously loaded from CDNs, vendored under static/vendor/
+VENDOR_ASSETS = {
+    'vendor/bootstrap/bootstrap.min.css': 'https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css',
+    'vendor/bootstrap/bootstrap.bundle.min.js': 'https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js',
+    'vendor/fontawesome/css/all.min.css': 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css',
+}
+
+# Logical bundle name -> source files relative to the static folder, in load order
+BUNDLES = {
+    'app.css': [
+        'vendor/bootstrap/bootstrap.min.css',
+        'vendor/fontawesome/css/all.min.css',
+        'css/style.css',
+    ],
+    'app.js': [
+        'vendor/bootstrap/bootstrap.bundle.min.js',
+        'js/main.js',
+    ],
+}
+
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+ONE_YEAR = 31536000
+
+_CSS_URL_RE = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+_CSS_IMPORT_RE = re.compile(r'@import\s+url\(\s*[\'"]?([^\'")]+)[\'"]?\s*\)\s*;')
+
+_manifest_cache = {}
+
+
+def _fingerprint(data):
+    """Short content hash used in built filenames"""
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def _fetch(url):
+    """Download a vendored asset"""
+    with urllib.request.urlopen(url, timeout=30) as response:
+        return response.read()
+
+
+def vendor_assets(static_dir, force=False):
+    """Download CDN assets (and the fonts they reference) into static/vendor/"""
+    fetched = []
+    for relative_path, url in VENDOR_ASSETS.items():
+        target = os.path.join(static_dir, relative_path)
+        if force or not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as handle:
+                handle.write(_fetch(url))
+            fetched.append(relative_path)
+
+        # Fetch fonts and images referenced relative to the stylesheet
+        if relative_path.endswith('.css'):
+            with open(target, 'r', encoding='utf-8') as handle:
+                css = handle.read()
+            for _quote, ref in _CSS_URL_RE.findall(css):
+                if ref.startswith(('data:', 'http:', 'https:', '#')):
+                    continue
+                ref_path = ref.split('?')[0].split('#')[0]
+                ref_target = os.path.normpath(os.path.join(os.path.dirname(target), ref_path))
+                if force or not os.path.exists(ref_target):
+                    os.makedirs(os.path.dirname(ref_target), exist_ok=True)
+                    with open(ref_target, 'wb') as handle:
+                        handle.write(_fetch(urllib.request.urljoin(url, ref_path)))
+                    fetched.append(os.path.relpath(ref_target, static_dir))
+    return fetched
+
+
+def minify_css(css):
+    """Conservative CSS minifier: strips comments and collapses whitespace"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    css = css.replace(';}', '}')
+    return css.strip()
+
+
+def minify_js(js):
+    """Conservative JS minifier: drops comment-only lines, indentation and blank lines"""
+    lines = []
+    for line in js.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith('//'):
+            continue
+        lines.append(stripped)
+    return '\n'.join(lines)
+
+
+def _rewrite_css(css, source_path, static_dir, dist_dir, built_files):
+    """Drop @imports of vendored assets and fingerprint relative url() references"""
+    vendored_urls = set(VENDOR_ASSETS.values())
+
+    def replace_import(match):
+        return '' if match.group(1) in vendored_urls else match.group(0)
+
+    css = _CSS_IMPORT_RE.sub(replace_import, css)
+
+    def replace_url(match):
+        ref = match.group(2)
+        if ref.startswith(('data:', 'http:', 'https:', '#', '/')):
+            return match.group(0)
+        ref_path, _sep, suffix = ref.partition('?')
+        ref_path, _hash, fragment = ref_path.partition('#')
+        absolute = os.path.normpath(os.path.join(os.path.dirname(source_path), ref_path))
+        if not os.path.exists(absolute):
+            logger.warning("Asset reference not found: %s", os.path.relpath(absolute, static_dir))
+            return match.group(0)
+
+        if absolute not in built_files:
+            with open(absolute, 'rb') as handle:
+                data = handle.read()
+            stem, ext = os.path.splitext(os.path.basename(absolute))
+            built_name = f'{stem}.{_fingerprint(data)}{ext}'
+            with open(os.path.join(dist_dir, built_name), 'wb') as handle:
+                handle.write(data)
+            built_files[absolute] = built_name
+
+        new_ref = built_files[absolute] + (f'#{fragment}' if fragment else '')
+        return f'url({new_ref})'
+
+    return _CSS_URL_RE.sub(replace_url, css)
+
+
+def _write_precompressed(path, data):
+    """Write .gz (and .br when available) siblings next to a built file"""
+    with open(path + '.gz', 'wb') as handle:
+        handle.write(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(path + '.br', 'wb') as handle:
+            handle.write(brotli.compress(data, quality=11))
+
+
+def build_assets(static_dir, fetch=True):
+    """Build fingerprinted bundles into static/dist/ and write the manifest"""
+    if fetch:
+        vendor_assets(static_dir)
+
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+    os.makedirs(dist_dir, exist_ok=True)
+
+    manifest = {}
+    built_files = {}
+    for bundle_name, sources in BUNDLES.items():
+        parts = []
+        for source in sources:
+            source_path = os.path.join(static_dir, source)
+            with open(source_path, 'r', encoding='utf-8') as handle:
+                content = handle.read()
+            if bundle_name.endswith('.css'):
+                content = _rewrite_css(content, source_path, static_dir, dist_dir, built_files)
+                if not source.endswith('.min.css'):
+                    content = minify_css(content)
+            elif not source.endswith('.min.js'):
+                content = minify_js(content)
+            parts.append(content)
+
+        # Separate scripts with ';' so a file missing its trailing semicolon cannot merge into the next
+        separator = ';\n' if bundle_name.endswith('.js') else '\n'
+        data = separator.join(parts).encode('utf-8')
+
+        stem, ext = os.path.splitext(bundle_name)
+        built_name = f'{stem}.{_fingerprint(data)}{ext}'
+        built_path = os.path.join(dist_dir, built_name)
+        with open(built_path, 'wb') as handle:
+            handle.write(data)
+        _write_precompressed(built_path, data)
+        manifest[bundle_name] = built_name
+
+    # Fonts referenced from CSS get precompressed too (woff2 is already compressed)
+    for built_name in built_files.values():
+        if not built_name.endswith('.woff2'):
+            with open(os.path.join(dist_dir, built_name), 'rb') as handle:
+                _write_precompressed(os.path.join(dist_dir, built_name), handle.read())
+
+    with open(os.path.join(dist_dir, MANIFEST_NAME), 'w', encoding='utf-8') as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+
+    _manifest_cache.clear()
+    return manifest
+
+
+def load_manifest(static_dir):
+    """Read static/dist/manifest.json, cached by modification time"""
+    path = os.path.join(static_dir, DIST_DIR, MANIFEST_NAME)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+
+    cached = _manifest_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(path, 'r', encoding='utf-8') as handle:
+            manifest = json.load(handle)
+    except (OSError, ValueError):
+        manifest = {}
+    _manifest_cache[path] = (mtime, manifest)
+    return manifest
+
+
+def asset_url(name):
+    """URL of a built bundle, or None when assets have not been built"""
+    if not current_app.config.get('ASSETS_USE_MANIFEST', True):
+        return None
+    built_name = load_manifest(current_app.static_folder).get(name)
+    if not built_name:
+        return None
+    return url_for('serve_asset', filename=built_name)
+
+
+def serve_asset(filename):
+    """Serve a fingerprinted asset, preferring precompressed siblings"""
+    dist_dir = os.path.join(current_app.static_folder, DIST_DIR)
+    if filename == MANIFEST_NAME or filename.endswith(('.gz', '.br')):
+        abort(404)
+
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    available = [encoding for encoding, suffix in (('br', '.br'), ('gzip', '.gz'))
+                 if os.path.exists(os.path.join(dist_dir, filename + suffix))]
+    encoding = request.accept_encodings.best_match(available) if available else None
+
+    served_name = filename + {'br': '.br', 'gzip': '.gz'}.get(encoding, '')
+    response = send_from_directory(dist_dir, served_name, mimetype=mimetype,
+                                   conditional=True, max_age=ONE_YEAR)
+    response.headers.pop('Content-Disposition', None)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    if available:
+        response.vary.add('Accept-Encoding')
+
+    # Filenames change whenever content changes, so browsers never need to revalidate
+    response.headers['Cache-Control'] = f'public, max-age={ONE_YEAR}, immutable'
+    return response
+
+
+def init_assets(app):
+    """Register the fingerprinted asset route and template helper"""
+    app.config.setdefault('ASSETS_USE_MANIFEST', True)
+    app.add_url_rule('/assets/<path:filename>', 'serve_asset', serve_asset)
+    app.add_template_global(asset_url, 'asset_url')
@@ -0,0 +1,118 @@
+"""
+Append-only audit trail of admin actions, buffered in memory and written in batches
+"""
+import atexit
+import json
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+
+from flask import has_request_context, request, session
+from sqlalchemy import insert
+
+from app.background import PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+# Past this many buffered entries the recording request flushes them itself
+MAX_PENDING = 1000
+
+
+class AuditTrail:
+    """Queue of audit entries awaiting a batched INSERT into audit_log"""
+
+    def __init__(self, max_pending=MAX_PENDING):
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending = deque()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def record(self, action, summary, target_type=None, target_id=None, details=None, actor_id=None):
+        """Queue an entry; actor and IP default to the current request's user and client"""
+        entry = {
+            'actor_id': actor_id,
+            'action': action,
+            'target_type': target_type,
+            'target_id': target_id,
+            'summary': summary[:255],
+            'details': json.dumps(details, default=str) if details else None,
+            'ip_address': None,
+            'created_at': datetime.utcnow(),
+        }
+        if has_request_context():
+            if entry['actor_id'] is None:
+                entry['actor_id'] = session.get('user_id')
+            entry['ip_address'] = request.remote_addr
+        with self._lock:
+            self._pending.append(entry)
+            backlog = len(self._pending)
+        if backlog >= self.max_pending:
+            self.flush()
+
+    def flush(self):
+        """Insert every queued entry in one executemany; returns how many were written"""
+        from app.models import db, AuditLog
+
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+        if not batch:
+            return 0
+        try:
+            db.session.execute(insert(AuditLog), batch)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            # Keep the entries, in order, ahead of anything recorded meanwhile
+            with self._lock:
+                self._pending.extendleft(reversed(batch))
+            raise
+        return len(batch)
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+
+
+audit_trail = AuditTrail()
+
+
+def audit(action, summary, **fields):
+    """Record an admin action on the process-wide trail"""
+    audit_trail.record(action, summary, **fields)
+
+
+def recent_activity(page=1, per_page=20, actor_id=None):
+    """Newest-first page of audit entries with the actor's username
+
+    Queued entries are flushed first so the page is complete; only readers
+    of the log pay for that write.
+    """
+    from app.models import db, AuditLog, User
+
+    if len(audit_trail):
+        audit_trail.flush()
+    query = AuditLog.query.with_entities(
+        AuditLog.id, AuditLog.actor_id, AuditLog.action, AuditLog.summary, AuditLog.target_type,
+        AuditLog.target_id, AuditLog.ip_address, AuditLog.created_at, User.username
+    ).outerjoin(User, User.id == AuditLog.actor_id)
+    if actor_id is not None:
+        query = query.filter(AuditLog.actor_id == actor_id)
+    return query.order_by(AuditLog.created_at.desc(), AuditLog.id.desc()).paginate(
+        page=page, per_page=per_page, error_out=False
+    )
+
+
+def init_audit(app):
+    """Flush the audit queue every AUDIT_FLUSH_INTERVAL seconds and at exit in the server process"""
+    app.config.setdefault('AUDIT_FLUSH_INTERVAL', 5)
+    app.config.setdefault('AUDIT_FLUSH_ENABLED', app.config['BACKGROUND_SERVICES'])
+
+    if app.config['AUDIT_FLUSH_ENABLED']:
+        flusher = PeriodicTask(app, 'audit-flush', app.config['AUDIT_FLUSH_INTERVAL'], audit_trail.flush)
+        app.extensions['audit_flusher'] = flusher
+        flusher.start()
+        atexit.register(flusher.run_once)
@@ -0,0 +1,45 @@
+"""
+In-process periodic background tasks
+"""
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """Run func() inside an app context every `interval` seconds on a daemon thread"""
+
+    def __init__(self, app, name, interval, func):
+        self.app = app
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_once(self):
+        """Run the task now; errors are logged, never raised into the loop"""
+        try:
+            with self.app.app_context():
+                return self.func()
+        except Exception as e:
+            logger.exception("Periodic task %s failed: %s", self.name, e)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.run_once()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name=f'periodic-{self.name}', daemon=True)
+        self._thread.start()
+        logger.info("Periodic task started", extra={'task': self.name, 'interval_seconds': self.interval})
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,213 @@
+"""
+Online SQLite backups into compressed, timestamped snapshots
+"""
+import gzip
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from app.background import PeriodicTask
+from app.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PREFIX = 'job_board-'
+SNAPSHOT_SUFFIX = '.db.gz'
+STATUS_FILE = 'last_backup.json'
+
+BACKUPS = registry.counter('jobboard_backups_total', 'Database backups by outcome', ('outcome',))
+
+
+def database_path():
+    """Path of the app's SQLite database file"""
+    from app.models import db
+
+    url = db.engine.url
+    if url.get_backend_name() != 'sqlite' or url.database in (None, '', ':memory:'):
+        raise ValueError('Online backups need a file-backed SQLite database')
+    return url.database
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+def copy_database(source_path, dest_path, pages_per_step=1024, sleep=0.05, max_restarts=3):
+    """Copy a live database with SQLite's online backup API; returns (pages, steps, restarts)
+
+    Each step holds a read lock for pages_per_step pages only, and the source
+    is left unlocked for `sleep` seconds between steps so writers carry on.
+    A write from another connection mid-copy makes SQLite restart the copy,
+    so the result is always a consistent snapshot. After max_restarts the
+    stepped copy is abandoned for a single-step one, which holds the read
+    lock until done but cannot be restarted.
+    """
+    progress = {'pages': 0, 'steps': 0, 'restarts': 0, 'remaining': None}
+
+    def on_step(status, remaining, total):
+        if progress['remaining'] is not None and (remaining > progress['remaining'] or total != progress['pages']):
+            progress['restarts'] += 1
+            logger.info("Backup restarted by a concurrent write",
+                        extra={'restarts': progress['restarts'], 'steps': progress['steps']})
+            if progress['restarts'] > max_restarts:
+                raise _TooManyRestarts()
+        progress['pages'] = total
+        progress['remaining'] = remaining
+        progress['steps'] += 1
+
+    source = sqlite3.connect(source_path, timeout=30)
+    dest = sqlite3.connect(dest_path)
+    try:
+        try:
+            source.backup(dest, pages=pages_per_step, progress=on_step, sleep=sleep)
+        except _TooManyRestarts:
+            logger.warning("Backup kept restarting, copying in a single step",
+                           extra={'restarts': max_restarts, 'steps': progress['steps']})
+            progress['restarts'] -= 1
+            source.backup(dest)
+            progress['pages'] = source.execute('PRAGMA page_count').fetchone()[0]
+            progress['steps'] += 1
+        result = dest.execute('PRAGMA quick_check').fetchone()[0]
+        if result != 'ok':
+            raise RuntimeError(f'Backup copy failed its integrity check: {result}')
+    finally:
+        dest.close()
+        source.close()
+    return progress['pages'], progress['steps'], progress['restarts']
+
+
+def _compress(source_path, dest_path):
+    with open(source_path, 'rb') as raw, gzip.open(dest_path, 'wb', compresslevel=6) as packed:
+        shutil.copyfileobj(raw, packed, 1024 * 1024)
+
+
+def list_snapshots(backup_dir=None):
+    """[(file name, bytes)] of the snapshots in backup_dir, newest first"""
+    backup_dir = backup_dir or current_app.config['BACKUP_DIR']
+    if not os.path.isdir(backup_dir):
+        return []
+    names = sorted((name for name in os.listdir(backup_dir)
+                    if name.startswith(SNAPSHOT_PREFIX) and name.endswith(SNAPSHOT_SUFFIX)), reverse=True)
+    return [(name, os.path.getsize(os.path.join(backup_dir, name))) for name in names]
+
+
+def prune_snapshots(backup_dir, retain):
+    """Delete all but the newest `retain` snapshots; returns the removed file names"""
+    removed = [name for name, _size in list_snapshots(backup_dir)[max(retain, 1):]]
+    for name in removed:
+        os.remove(os.path.join(backup_dir, name))
+    return removed
+
+
+def last_backup(backup_dir=None):
+    """Details of the last successful backup, or None"""
+    backup_dir = backup_dir or current_app.config['BACKUP_DIR']
+    try:
+        with open(os.path.join(backup_dir, STATUS_FILE)) as handle:
+            status = json.load(handle)
+        status['finished_at'] = datetime.fromisoformat(status['finished_at'])
+        return status
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _write_status(backup_dir, status):
+    # Write then rename, so another worker reading it never sees half a file
+    path = os.path.join(backup_dir, STATUS_FILE)
+    with open(f'{path}.{os.getpid()}.tmp', 'w') as handle:
+        json.dump(dict(status, finished_at=status['finished_at'].isoformat()), handle)
+    os.replace(f'{path}.{os.getpid()}.tmp', path)
+
+
+def create_snapshot(backup_dir=None, retain=None):
+    """Back the database up into backup_dir as a gzipped, timestamped snapshot and apply retention
+
+    Returns the recorded status: file, bytes, pages, steps, restarts, seconds and finished_at.
+    """
+    config = current_app.config
+    backup_dir = backup_dir or config['BACKUP_DIR']
+    retain = retain or config['BACKUP_RETAIN']
+    os.makedirs(backup_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    name = f'{SNAPSHOT_PREFIX}{datetime.utcnow():%Y%m%dT%H%M%S}Z{SNAPSHOT_SUFFIX}'
+    final_path = os.path.join(backup_dir, name)
+    copy_path = os.path.join(backup_dir, f'.{name}.{os.getpid()}.db')
+    packed_path = f'{final_path}.{os.getpid()}.part'
+    try:
+        pages, steps, restarts = copy_database(database_path(), copy_path,
+                                               pages_per_step=config['BACKUP_PAGES_PER_STEP'],
+                                               sleep=config['BACKUP_STEP_SLEEP'],
+                                               max_restarts=config['BACKUP_MAX_RESTARTS'])
+        _compress(copy_path, packed_path)
+        os.replace(packed_path, final_path)
+    except Exception:
+        BACKUPS.inc(outcome='failed')
+        raise
+    finally:
+        for path in (copy_path, packed_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    status = {
+        'file': name,
+        'bytes': os.path.getsize(final_path),
+        'pages': pages,
+        'steps': steps,
+        'restarts': restarts,
+        'seconds': round(time.perf_counter() - started, 3),
+        'finished_at': datetime.utcnow(),
+    }
+    _write_status(backup_dir, status)
+    removed = prune_snapshots(backup_dir, retain)
+    BACKUPS.inc(outcome='succeeded')
+    logger.info("Database backed up", extra={
+        'file': name, 'bytes': status['bytes'], 'pages': pages, 'steps': steps, 'restarts': restarts,
+        'seconds': status['seconds'], 'pruned': len(removed)
+    })
+    return status
+
+
+def backup_if_due():
+    """Take a snapshot when the last one is older than BACKUP_INTERVAL; returns its status or None
+
+    The schedule is read from the status file, so restarts don't trigger
+    extra backups and every worker sees the same last run.
+    """
+    status = last_backup()
+    interval = timedelta(seconds=current_app.config['BACKUP_INTERVAL'])
+    if status is not None and datetime.utcnow() - status['finished_at'] < interval:
+        return None
+    return create_snapshot()
+
+
+def last_backup_label():
+    """Text for the admin system health panel"""
+    status = last_backup()
+    if status is None:
+        return 'Never' if current_app.config['BACKUP_ENABLED'] else 'Not configured'
+    return f"{status['finished_at']:%Y-%m-%d %H:%M} UTC ({status['bytes'] / (1024 * 1024):.1f} MB)"
+
+
+def init_backups(app):
+    """Back the database up every BACKUP_INTERVAL seconds from the server process"""
+    app.config.setdefault('BACKUP_ENABLED', app.config['BACKGROUND_SERVICES'])
+    app.config.setdefault('BACKUP_DIR', os.path.join(app.instance_path, 'backups'))
+    app.config.setdefault('BACKUP_INTERVAL', 24 * 3600)
+    app.config.setdefault('BACKUP_RETAIN', 7)
+    app.config.setdefault('BACKUP_PAGES_PER_STEP', 1024)
+    app.config.setdefault('BACKUP_STEP_SLEEP', 0.05)
+    app.config.setdefault('BACKUP_MAX_RESTARTS', 3)
+
+    if app.config['BACKUP_ENABLED']:
+        # Check often, back up only when due, so a restart doesn't push the next backup back a full interval
+        check_every = min(app.config['BACKUP_INTERVAL'], 3600)
+        task = PeriodicTask(app, 'database-backup', check_every, backup_if_due)
+        app.extensions['database_backup'] = task
+        task.start()
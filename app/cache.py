@@ -0,0 +1,258 @@
+"""
+Query-result cache for model helpers with tag-based invalidation
+"""
+import functools
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from app.metrics import record_cache_lookup
+from app.signals import jobs_posted, jobs_deactivated, application_status_changed, application_submitted
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 300
+DEFAULT_MAX_ENTRIES = 10000
+
+_MISSING = object()
+
+
+class CacheBackend:
+    """Protocol for cache stores; a shared backend (Redis, memcached, ...) implements these three methods
+
+    Values are opaque and must survive pickling. Stores may evict anything
+    at any time; the cache treats a missing tag version as stale.
+    """
+
+    def get(self, key):
+        """Return the stored value or None"""
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+
+class LRUBackend(CacheBackend):
+    """In-process store evicting the least recently used entry past max_entries, and expired ones on read"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (expires_at or None, value)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteBackend(CacheBackend):
+    """Store in a local SQLite file, shared by every worker on the host"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('CREATE TABLE IF NOT EXISTS cache_entries ('
+                     'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)')
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None, check_same_thread=False)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._connect().execute(
+            'SELECT value FROM cache_entries WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)',
+            (key, time.time())
+        ).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def set(self, key, value, ttl=None):
+        self._connect().execute(
+            'INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)',
+            (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), time.time() + ttl if ttl else None)
+        )
+
+    def delete(self, key):
+        self._connect().execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+
+    def purge_expired(self):
+        return self._connect().execute('DELETE FROM cache_entries WHERE expires_at <= ?', (time.time(),)).rowcount
+
+
+class QueryCache:
+    """Cached results stored with a snapshot of their tags' versions
+
+    Invalidating a tag gives it a new random version, so every entry carrying
+    it misses on the next read without the cache having to know which keys
+    those are; this works the same on a shared backend, where keys can't be
+    enumerated. A tag whose version was evicted also makes its entries miss.
+    """
+
+    def __init__(self, backend=None, default_ttl=DEFAULT_TTL):
+        self.backend = backend or LRUBackend()
+        self.default_ttl = default_ttl
+        self.enabled = True
+        self._local = threading.local()
+
+    def _tag_versions(self, tags):
+        """Current version of each tag, giving never-seen (or evicted) tags a fresh one"""
+        versions = {}
+        for tag in tags:
+            version = self.backend.get(f'tag:{tag}')
+            if version is None:
+                version = self.invalidate(tag)
+            versions[tag] = version
+        return versions
+
+    def get(self, key):
+        """Return the cached value, or _MISSING when absent, expired or invalidated"""
+        entry = self.backend.get(f'entry:{key}')
+        if entry is None:
+            return _MISSING
+        versions, value = entry
+        for tag, version in versions.items():
+            if self.backend.get(f'tag:{tag}') != version:
+                return _MISSING
+        return value
+
+    def set(self, key, value, tags=(), ttl=None, versions=None):
+        """Store value; `versions` are tag versions read before the value was computed"""
+        known = versions or {}
+        # Prefer the earlier snapshot, so a write racing the query still invalidates the entry
+        versions = self._tag_versions([tag for tag in tags if tag not in known])
+        versions.update(known)
+        self.backend.set(f'entry:{key}', (versions, value), ttl or self.default_ttl)
+
+    def invalidate(self, *tags):
+        """Make every entry carrying any of these tags stale; returns the last new version"""
+        version = None
+        for tag in tags:
+            version = uuid.uuid4().hex
+            self.backend.set(f'tag:{tag}', version)
+        return version
+
+    def skip(self):
+        """Keep the result of the cached call in progress out of the cache, e.g. a fallback after a failed query"""
+        self._local.skip = True
+
+    def cached(self, name, key, tags, ttl=None):
+        """Decorator caching func(*args) under name + key(*args)
+
+        tags(result, *args, **kwargs) returns the tags for the entry; tags known
+        from the arguments alone (e.g. employer:42) are snapshotted before
+        the query runs, tags derived from the result after. A call that
+        invokes skip() is returned without being stored.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                cache_key = f'{name}:{key(*args, **kwargs)!r}'
+                value = self.get(cache_key)
+                record_cache_lookup(f'query:{name}', value is not _MISSING)
+                if value is not _MISSING:
+                    return value
+
+                versions = self._tag_versions(tags(None, *args, **kwargs))
+                self._local.skip = False
+                value = func(*args, **kwargs)
+                if self._local.skip:
+                    self._local.skip = False
+                    return value
+                self.set(cache_key, value, tags(value, *args, **kwargs), ttl=ttl, versions=versions)
+                return value
+            wrapper.uncached = func
+            return wrapper
+        return decorator
+
+
+# Process-wide cache for model helpers; init_cache picks the backend
+query_cache = QueryCache()
+
+
+def _on_jobs_posted(sender, jobs=(), **extra):
+    tags = {f'employer:{job.employer_id}' for job in jobs} | {f'job:{job.id}' for job in jobs}
+    query_cache.invalidate(*tags, 'overview')
+
+
+def _on_jobs_deactivated(sender, job_ids=(), **extra):
+    query_cache.invalidate(*[f'job:{job_id}' for job_id in job_ids], 'overview')
+
+
+def _on_application_status_changed(sender, employer_id=None, job_ids=(), seeker_ids=(), **extra):
+    query_cache.invalidate(f'employer:{employer_id}', *[f'seeker:{seeker_id}' for seeker_id in seeker_ids])
+
+
+def _on_application_submitted(sender, job_id=None, seeker_id=None, **extra):
+    from app.models import db, JobPosting
+
+    # The apply statement doesn't return the employer, so look it up (by primary key) only here
+    employer_id = db.session.query(JobPosting.employer_id).filter(JobPosting.id == job_id).scalar()
+    query_cache.invalidate(f'employer:{employer_id}', f'job:{job_id}', f'seeker:{seeker_id}', 'overview')
+
+
+def init_cache(app):
+    """Choose the cache backend and subscribe to the write signals"""
+    app.config.setdefault('QUERY_CACHE_ENABLED', True)
+    app.config.setdefault('QUERY_CACHE_BACKEND', 'memory')
+    app.config.setdefault('QUERY_CACHE_TTL', DEFAULT_TTL)
+    app.config.setdefault('QUERY_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)
+
+    backend = app.config['QUERY_CACHE_BACKEND']
+    if isinstance(backend, CacheBackend):
+        query_cache.backend = backend
+    elif backend == 'memory':
+        query_cache.backend = LRUBackend(app.config['QUERY_CACHE_MAX_ENTRIES'])
+    elif backend.startswith('sqlite:///'):
+        path = backend[len('sqlite:///'):] or os.path.join(app.instance_path, 'query_cache.db')
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        query_cache.backend = SQLiteBackend(path)
+    else:
+        raise ValueError(f'Unsupported QUERY_CACHE_BACKEND: {backend}')
+    query_cache.default_ttl = app.config['QUERY_CACHE_TTL']
+    query_cache.enabled = app.config['QUERY_CACHE_ENABLED']
+
+    jobs_posted.connect(_on_jobs_posted, weak=False)
+    jobs_deactivated.connect(_on_jobs_deactivated, weak=False)
+    application_status_changed.connect(_on_application_status_changed, weak=False)
+    application_submitted.connect(_on_application_submitted, weak=False)
@@ -0,0 +1,273 @@
+"""
+Flask CLI commands for maintenance tasks (run with `flask --app run <command>`)
+"""
+import click
+from flask import current_app
+from flask.cli import AppGroup, with_appcontext
+
+assets_cli = AppGroup('assets', help='Static asset pipeline commands.')
+recommendations_cli = AppGroup('recommendations', help='Seeker job recommendation commands.')
+jobs_cli = AppGroup('jobs', help='Job posting lifecycle commands.')
+templates_cli = AppGroup('templates', help='Jinja template commands.')
+analytics_cli = AppGroup('analytics', help='Admin analytics rollup commands.')
+backup_cli = AppGroup('backup', help='Database backup commands.')
+alerts_cli = AppGroup('alerts', help='Saved-search alert commands.')
+tasks_cli = AppGroup('tasks', help='Background task queue commands.')
+
+
+@assets_cli.command('build')
+@click.option('--no-fetch', is_flag=True, help='Use already vendored files instead of downloading missing ones.')
+def build_assets_command(no_fetch):
+    """Vendor, bundle, fingerprint and precompress static assets"""
+    from app.assets import build_assets
+    manifest = build_assets(current_app.static_folder, fetch=not no_fetch)
+    for name, built_name in sorted(manifest.items()):
+        click.echo(f'{name} -> dist/{built_name}')
+
+
+@templates_cli.command('compile')
+def compile_templates_command():
+    """Compile every template into the bytecode cache and report the time per template"""
+    from app.template_cache import precompile_templates
+    if current_app.jinja_env.bytecode_cache is None:
+        raise click.ClickException('TEMPLATE_BYTECODE_CACHE is disabled; nothing would be stored.')
+    report = precompile_templates(current_app)
+    for name, seconds in report:
+        click.echo(f'{seconds * 1000:8.2f} ms  {name}')
+    click.echo(f'Compiled {len(report)} templates into {current_app.config["TEMPLATE_CACHE_DIR"]} '
+               f'in {sum(seconds for _name, seconds in report) * 1000:.1f} ms.')
+
+
+@analytics_cli.command('rollup')
+@click.option('--since', default=None, help='Recount every day from this date (YYYY-MM-DD) instead of only new days.')
+def rollup_analytics_command(since):
+    """Roll completed days up into daily_stats"""
+    from datetime import date, datetime, timedelta
+    from app.analytics import refresh_rollups, rollup_days
+    if since:
+        first_day = date.fromisoformat(since)
+        last_day = datetime.utcnow().date() - timedelta(days=1)
+        rows = rollup_days(first_day, last_day)
+        click.echo(f'Recounted {first_day} to {last_day}: {rows} rollup rows.')
+    else:
+        click.echo(f'Rolled up {refresh_rollups()} days.')
+
+
+@backup_cli.command('create')
+@click.option('--dir', 'backup_dir', default=None, type=click.Path(file_okay=False), help='Snapshot directory (default BACKUP_DIR).')
+@click.option('--retain', default=None, type=int, help='Snapshots to keep (default BACKUP_RETAIN).')
+def create_backup_command(backup_dir, retain):
+    """Take a compressed online snapshot of the database without stopping the app"""
+    from app.backup import create_snapshot
+    status = create_snapshot(backup_dir=backup_dir, retain=retain)
+    click.echo(f"Wrote {status['file']} ({status['bytes']} bytes, {status['pages']} pages "
+               f"in {status['steps']} steps, {status['seconds']} s).")
+
+
+@backup_cli.command('list')
+@click.option('--dir', 'backup_dir', default=None, type=click.Path(file_okay=False), help='Snapshot directory (default BACKUP_DIR).')
+def list_backups_command(backup_dir):
+    """List snapshots, newest first"""
+    from app.backup import list_snapshots
+    snapshots = list_snapshots(backup_dir)
+    for name, size in snapshots:
+        click.echo(f'{size:12d}  {name}')
+    if not snapshots:
+        click.echo('No snapshots.')
+
+
+@alerts_cli.command('send')
+def send_alerts_command():
+    """Send every seeker a digest of postings matching their saved searches"""
+    from app.alerts import send_digests
+    click.echo(f'Sent {send_digests()} alert digests.')
+
+
+@tasks_cli.command('work')
+@click.option('--threads', default=None, type=int, help='Worker threads (default TASK_WORKER_THREADS, at least 1).')
+def work_tasks_command(threads):
+    """Run queued tasks and the periodic scheduler in the foreground until interrupted"""
+    import time
+    from app.background import PeriodicTask
+    from app.tasks import TaskWorker, scheduler_tick
+
+    app = current_app._get_current_object()
+    worker = TaskWorker(app, threads or max(app.config['TASK_WORKER_THREADS'], 1), app.config['TASK_POLL_INTERVAL'])
+    scheduler = PeriodicTask(app, 'task-scheduler', app.config['TASK_SCHEDULER_INTERVAL'], scheduler_tick)
+    worker.start()
+    scheduler.start()
+    click.echo(f'Running {worker.threads} task worker threads as {worker.worker_id}; Ctrl+C to stop.')
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        scheduler.stop()
+        worker.stop(timeout=30)
+
+
+@tasks_cli.command('stats')
+def task_stats_command():
+    """Count queued, running, done and failed tasks"""
+    from app.tasks import queue_stats
+    stats = queue_stats()
+    for status in ('queued', 'running', 'done', 'failed'):
+        click.echo(f'{status:8s} {stats.get(status, 0)}')
+
+
+@recommendations_cli.command('rebuild')
+@click.option('--batch-size', default=500, show_default=True, help='Seekers scored and stored per transaction.')
+def rebuild_recommendations_command(batch_size):
+    """Refit job vectors and precompute top-N recommendations for every seeker"""
+    from app.recommend import rebuild_recommendations
+    processed = rebuild_recommendations(batch_size=batch_size)
+    click.echo(f'Recommendations rebuilt for {processed} seekers.')
+
+
+@jobs_cli.command('expire')
+def expire_jobs_command():
+    """Deactivate active postings that are past their expiry date"""
+    from app.lifecycle import expire_postings
+    click.echo(f'Expired {expire_postings()} postings.')
+
+
+@jobs_cli.command('archive')
+@click.option('--older-than-days', default=None, type=int, help='Archive postings that ended this many days ago (default JOB_ARCHIVE_AFTER_DAYS).')
+def archive_jobs_command(older_than_days):
+    """Move old inactive postings and their applications to the archive tables"""
+    from app.lifecycle import archive_postings
+    if older_than_days is None:
+        older_than_days = current_app.config['JOB_ARCHIVE_AFTER_DAYS']
+    click.echo(f'Archived {archive_postings(older_than_days)} postings.')
+
+
+@jobs_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--employer', required=True, help='Username or email of the employer the postings belong to.')
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'ndjson']), default=None, help='Defaults to the file extension.')
+@click.option('--chunk-size', default=500, show_default=True, help='Rows inserted per transaction.')
+def import_jobs_command(path, employer, fmt, chunk_size):
+    """Stream a CSV or NDJSON file of postings into the database"""
+    from app.job_import import import_jobs, detect_format
+    from app.models import User
+
+    user = User.get_user_by_credentials(employer)
+    if user is None or user.role != 'employer':
+        raise click.ClickException(f'No employer account "{employer}".')
+
+    with open(path, 'rb') as handle:
+        report = import_jobs(handle, fmt or detect_format(path), user.id, chunk_size=chunk_size)
+    for line, message in report.errors:
+        click.echo(f'line {line}: {message}', err=True)
+    if report.failed > len(report.errors):
+        click.echo(f'... and {report.failed - len(report.errors)} more errors', err=True)
+    click.echo(f'Imported {report.imported} postings, {report.failed} rows failed.')
+
+
+@click.command('score-applications')
+@click.option('--batch-size', default=500, show_default=True, help='Applications scored per vectorized batch.')
+@with_appcontext
+def score_applications_command(batch_size):
+    """Rescore job fit for applications whose job text, bio or cover letter changed"""
+    from app.fit_scores import refresh_fit_scores
+    updated = refresh_fit_scores(batch_size=batch_size)
+    click.echo(f'Fit scores refreshed for {updated} applications.')
+
+
+@click.command('dedup-jobs')
+@click.option('--threshold', default=0.8, show_default=True, help='Estimated Jaccard similarity that counts as a duplicate.')
+@click.option('--deactivate', is_flag=True, help='Keep the newest posting of each cluster active and deactivate the rest.')
+@with_appcontext
+def dedup_jobs_command(threshold, deactivate):
+    """Cluster near-duplicate active postings per employer using MinHash/LSH"""
+    from sqlalchemy import update
+    from app.dedup import duplicate_clusters, index_missing
+    from app.models import db, JobPosting
+    from app.signals import jobs_deactivated
+
+    indexed = index_missing()
+    if indexed:
+        click.echo(f'Computed signatures for {indexed} postings.')
+
+    clusters = duplicate_clusters(threshold=threshold)
+    for cluster in clusters:
+        click.echo(f'Duplicates: keep {cluster[0]}, others {", ".join(map(str, cluster[1:]))}')
+    click.echo(f'Found {len(clusters)} duplicate clusters covering {sum(len(c) - 1 for c in clusters)} extra postings.')
+
+    if deactivate and clusters:
+        job_ids = [job_id for cluster in clusters for job_id in cluster[1:]]
+        db.session.execute(update(JobPosting).where(JobPosting.id.in_(job_ids)).values(is_active=False))
+        db.session.commit()
+        jobs_deactivated.send(current_app._get_current_object(), job_ids=job_ids)
+        click.echo(f'Deactivated {len(job_ids)} duplicate postings.')
+
+
+def _backfill(model, source, targets, derive, batch_size, label):
+    """Recompute derived columns from a source column in keyset-paginated batches"""
+    from sqlalchemy import update
+    from app.models import db
+
+    last_id = 0
+    updated = 0
+    while True:
+        # Keyset pagination keeps each batch an index range scan on the primary key
+        rows = db.session.query(model.id, getattr(model, source)).filter(
+            model.id > last_id,
+            getattr(model, source).isnot(None)
+        ).order_by(model.id).limit(batch_size).all()
+        if not rows:
+            break
+
+        params = []
+        for row in rows:
+            params.append(dict(zip(targets, derive(row[1])), id=row.id))
+        db.session.execute(update(model), params)
+        db.session.commit()
+
+        last_id = rows[-1].id
+        updated += len(params)
+        click.echo(f'Processed {updated} {label} (last id {last_id})')
+    return updated
+
+
+@click.command('backfill-salaries')
+@click.option('--batch-size', default=500, show_default=True, help='Rows parsed and updated per transaction.')
+@with_appcontext
+def backfill_salaries_command(batch_size):
+    """Parse salary_range into the structured salary columns for existing postings"""
+    from app.models import JobPosting, salary_fields
+
+    updated = _backfill(
+        JobPosting, 'salary_range',
+        ('salary_min', 'salary_max', 'salary_currency', 'salary_period'),
+        salary_fields, batch_size, 'postings'
+    )
+    click.echo(f'Salary backfill complete: {updated} postings processed.')
+
+
+@click.command('backfill-locations')
+@click.option('--batch-size', default=500, show_default=True, help='Rows resolved and updated per transaction.')
+@with_appcontext
+def backfill_locations_command(batch_size):
+    """Resolve location into canonical places for existing postings and users"""
+    from app.models import JobPosting, User, location_fields
+
+    targets = ('location_place_id', 'location_lat', 'location_lon', 'location_geohash')
+    for model, label in ((JobPosting, 'postings'), (User, 'users')):
+        updated = _backfill(model, 'location', targets, location_fields, batch_size, label)
+        click.echo(f'Location backfill complete: {updated} {label} processed.')
+
+
+def register_commands(app):
+    """Attach CLI commands to the app"""
+    app.cli.add_command(assets_cli)
+    app.cli.add_command(recommendations_cli)
+    app.cli.add_command(jobs_cli)
+    app.cli.add_command(templates_cli)
+    app.cli.add_command(analytics_cli)
+    app.cli.add_command(backup_cli)
+    app.cli.add_command(alerts_cli)
+    app.cli.add_command(tasks_cli)
+    app.cli.add_command(backfill_salaries_command)
+    app.cli.add_command(backfill_locations_command)
+    app.cli.add_command(score_applications_command)
+    app.cli.add_command(dedup_jobs_command)
@@ -0,0 +1,140 @@
+"""
+Dynamic response compression (gzip/brotli) negotiated via Accept-Encoding
+"""
+import gzip
+import hashlib
+import zlib
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available
+    brotli = None
+
+DEFAULT_MIMETYPES = (
+    'text/html',
+    'text/css',
+    'text/plain',
+    'text/xml',
+    'application/json',
+    'application/javascript',
+    'text/javascript',
+    'image/svg+xml',
+)
+
+# Size of the chunks yielded when streaming a compressed body
+STREAM_CHUNK_SIZE = 16 * 1024
+
+
+def _supported_encodings():
+    """Encodings we can produce, in order of preference"""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def _gzip_stream(chunks, level):
+    """Incrementally gzip an iterable of byte chunks"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _brotli_stream(chunks, quality):
+    """Incrementally brotli-compress an iterable of byte chunks"""
+    compressor = brotli.Compressor(quality=quality)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        data = compressor.process(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def _split(data, size=STREAM_CHUNK_SIZE):
+    """Yield fixed-size slices of a buffered body"""
+    for offset in range(0, len(data), size):
+        yield data[offset:offset + size]
+
+
+def compress_bytes(data, encoding, level):
+    """Compress a whole body in one go"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=min(level, 11))
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _should_compress(response, config):
+    """Check status, content type and existing encoding before doing any work"""
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    if response.direct_passthrough or 'Content-Encoding' in response.headers:
+        return False
+    if 'no-transform' in response.headers.get('Cache-Control', ''):
+        return False
+    return response.mimetype in config['COMPRESS_MIMETYPES']
+
+
+def compress_response(response):
+    """after_request hook: add ETag/304 handling, then compress the body"""
+    config = current_app.config
+
+    if not config['COMPRESS_ENABLED'] or not _should_compress(response, config):
+        return response
+
+    # Representation varies by encoding even when we end up not compressing
+    response.vary.add('Accept-Encoding')
+
+    encoding = request.accept_encodings.best_match(_supported_encodings())
+    level = config['COMPRESS_BR_LEVEL'] if encoding == 'br' else config['COMPRESS_LEVEL']
+
+    if response.is_streamed:
+        # Unknown length: compress chunk by chunk as the generator produces them
+        if encoding is None:
+            return response
+        body = response.response
+        response.response = _brotli_stream(body, level) if encoding == 'br' else _gzip_stream(body, level)
+        response.headers['Content-Encoding'] = encoding
+        response.headers.pop('Content-Length', None)
+        return response
+
+    data = response.get_data()
+
+    # ETag is computed over the identity body and marked weak, so it matches for
+    # every encoding and a revalidation can 304 before we spend CPU compressing
+    if response.status_code == 200 and request.method in ('GET', 'HEAD') and not response.headers.get('ETag'):
+        response.set_etag(hashlib.sha1(data).hexdigest(), weak=True)
+    if response.headers.get('ETag'):
+        response.make_conditional(request)
+        if response.status_code == 304:
+            return response
+
+    if encoding is None or len(data) < config['COMPRESS_MIN_SIZE']:
+        return response
+
+    if len(data) >= config['COMPRESS_STREAM_THRESHOLD']:
+        # Large bodies go out as a chunked stream so the first bytes leave early
+        chunks = _split(data)
+        response.response = _brotli_stream(chunks, level) if encoding == 'br' else _gzip_stream(chunks, level)
+        response.headers.pop('Content-Length', None)
+    else:
+        response.set_data(compress_bytes(data, encoding, level))
+
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_compression(app):
+    """Register the compression after_request hook"""
+    app.config.setdefault('COMPRESS_ENABLED', True)
+    app.config.setdefault('COMPRESS_MIMETYPES', DEFAULT_MIMETYPES)
+    app.config.setdefault('COMPRESS_LEVEL', 6)
+    app.config.setdefault('COMPRESS_BR_LEVEL', 4)
+    app.config.setdefault('COMPRESS_MIN_SIZE', 500)
+    app.config.setdefault('COMPRESS_STREAM_THRESHOLD', 256 * 1024)
+    app.after_request(compress_response)
@@ -0,0 +1,190 @@
+"""
+Near-duplicate job posting detection with MinHash signatures and LSH bands
+"""
+import logging
+import random
+import zlib
+from collections import defaultdict
+
+from app.search_index import normalize
+
+logger = logging.getLogger(__name__)
+
+# 16 bands of 4 rows: postings with Jaccard similarity around 0.5 or more
+# share at least one band bucket with high probability
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+
+# Estimated Jaccard similarity at which two postings count as duplicates
+DUPLICATE_THRESHOLD = 0.8
+
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Fixed seed so signatures stored in the database stay comparable across processes
+_random = random.Random(20240601)
+_PERMUTATIONS = [(_random.randrange(1, _MERSENNE_PRIME), _random.randrange(0, _MERSENNE_PRIME))
+                 for _ in range(NUM_PERMUTATIONS)]
+
+
+def shingles(title, description):
+    """Hashed word 3-grams of a posting's normalized title and description"""
+    words = normalize(f'{title or ""} {description or ""}').split()
+    if len(words) < SHINGLE_SIZE:
+        grams = words
+    else:
+        grams = [' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+    return {zlib.crc32(gram.encode('utf-8')) for gram in grams}
+
+
+def minhash(title, description):
+    """MinHash signature (list of NUM_PERMUTATIONS ints) of a posting"""
+    hashes = shingles(title, description)
+    if not hashes:
+        return [_MAX_HASH] * NUM_PERMUTATIONS
+    return [min(((a * value + b) % _MERSENNE_PRIME) & _MAX_HASH for value in hashes)
+            for a, b in _PERMUTATIONS]
+
+
+def band_keys(signature):
+    """One bucket key per LSH band"""
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = zlib.crc32(','.join(map(str, rows)).encode('ascii'))
+        keys.append(f'{band}-{digest:08x}')
+    return keys
+
+
+def similarity(left, right):
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for a, b in zip(left, right) if a == b) / NUM_PERMUTATIONS
+
+
+def encode_signature(signature):
+    return ','.join(map(str, signature))
+
+
+def decode_signature(text):
+    return [int(value) for value in text.split(',')]
+
+
+def index_job(job, signature=None):
+    """Store a posting's signature and band buckets (caller commits)"""
+    from app.models import db, JobMinHash, JobLshBand
+
+    if signature is None:
+        signature = minhash(job.title, job.description)
+    db.session.add(JobMinHash(job_id=job.id, signature=encode_signature(signature)))
+    db.session.add_all([
+        JobLshBand(job_id=job.id, employer_id=job.employer_id, bucket=key)
+        for key in band_keys(signature)
+    ])
+
+
+def find_duplicates(employer_id, signature, threshold=DUPLICATE_THRESHOLD, exclude_job_id=None):
+    """[(JobPosting, similarity)] of the employer's active postings that look like a signature
+
+    Candidates are the postings sharing any band bucket (an indexed lookup),
+    which are then verified against their stored signatures.
+    """
+    from app.models import db, JobPosting, JobMinHash, JobLshBand
+
+    candidates = db.session.query(JobPosting, JobMinHash.signature).join(
+        JobMinHash, JobMinHash.job_id == JobPosting.id
+    ).filter(
+        JobPosting.id.in_(
+            db.session.query(JobLshBand.job_id).filter(
+                JobLshBand.employer_id == employer_id,
+                JobLshBand.bucket.in_(band_keys(signature))
+            )
+        ),
+        JobPosting.is_active == True
+    ).all()
+
+    matches = []
+    for job, stored in candidates:
+        if job.id == exclude_job_id:
+            continue
+        score = similarity(signature, decode_signature(stored))
+        if score >= threshold:
+            matches.append((job, score))
+    matches.sort(key=lambda match: match[1], reverse=True)
+    return matches
+
+
+def index_missing(batch_size=500):
+    """Compute signatures for postings that have none yet; returns how many"""
+    from app.models import db, JobPosting, JobMinHash
+
+    last_id = 0
+    indexed = 0
+    while True:
+        jobs = JobPosting.query.outerjoin(
+            JobMinHash, JobMinHash.job_id == JobPosting.id
+        ).filter(
+            JobPosting.id > last_id, JobMinHash.job_id.is_(None)
+        ).order_by(JobPosting.id).limit(batch_size).all()
+        if not jobs:
+            break
+        for job in jobs:
+            index_job(job)
+        db.session.commit()
+        last_id = jobs[-1].id
+        indexed += len(jobs)
+    return indexed
+
+
+def duplicate_clusters(threshold=DUPLICATE_THRESHOLD):
+    """Groups of active job ids (newest first) that are near-duplicates within one employer
+
+    Streams band rows ordered by bucket so only one bucket's members and the
+    signatures seen so far are held in memory, and unions verified pairs.
+    """
+    from app.models import db, JobPosting, JobMinHash, JobLshBand
+
+    parent = {}
+
+    def find(job_id):
+        while parent.setdefault(job_id, job_id) != job_id:
+            parent[job_id] = parent[parent[job_id]]
+            job_id = parent[job_id]
+        return job_id
+
+    signatures = {}
+
+    def signature_of(job_id):
+        if job_id not in signatures:
+            signatures[job_id] = decode_signature(db.session.get(JobMinHash, job_id).signature)
+        return signatures[job_id]
+
+    rows = db.session.query(JobLshBand.employer_id, JobLshBand.bucket, JobLshBand.job_id).join(
+        JobPosting, JobPosting.id == JobLshBand.job_id
+    ).filter(JobPosting.is_active == True).order_by(
+        JobLshBand.employer_id, JobLshBand.bucket, JobLshBand.job_id
+    ).yield_per(1000)
+
+    current_key = None
+    members = []
+
+    def flush():
+        for i, left in enumerate(members):
+            for right in members[i + 1:]:
+                if find(left) != find(right) and similarity(signature_of(left), signature_of(right)) >= threshold:
+                    parent[find(left)] = find(right)
+
+    for employer_id, bucket, job_id in rows:
+        if (employer_id, bucket) != current_key:
+            flush()
+            current_key = (employer_id, bucket)
+            members = []
+        members.append(job_id)
+    flush()
+
+    clusters = defaultdict(list)
+    for job_id in parent:
+        clusters[find(job_id)].append(job_id)
+    return [sorted(group, reverse=True) for group in clusters.values() if len(group) > 1]
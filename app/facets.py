@@ -0,0 +1,237 @@
+"""
+Incrementally maintained facet counts for the job listings filters
+"""
+import logging
+import threading
+from collections import Counter
+
+from app.geo import gazetteer
+from app.signals import jobs_posted, jobs_deactivated
+
+logger = logging.getLogger(__name__)
+
+FACETS = ('job_type', 'location', 'salary')
+
+NOT_SPECIFIED = 'not-specified'
+
+OTHER_CURRENCY = 'other-currency'
+
+# Salary buckets and filters compare amounts in this currency; postings with
+# no currency symbol are taken to be quoted in it (SALARY_CURRENCY overrides)
+DEFAULT_SALARY_CURRENCY = 'USD'
+
+# Annual salary buckets as (lower bound, key, label), checked from the top down
+SALARY_BUCKETS = (
+    (150000, '150k-plus', '150k+'),
+    (100000, '100k-150k', '100k - 150k'),
+    (50000, '50k-100k', '50k - 100k'),
+    (0, 'under-50k', 'Under 50k'),
+)
+
+
+def normalize_location(location):
+    """Collapse spelling variants ("Lagos", "lagos ", "Lagos, NG") to one facet key
+
+    Places known to the gazetteer facet on their canonical place id; anything
+    else falls back to the case-folded city part of the text.
+    """
+    if not location or not location.strip():
+        return NOT_SPECIFIED, 'Not specified'
+    place = gazetteer().resolve(location)
+    if place is not None:
+        return place.place_id, place.name
+    city = location.split(',')[0]
+    city = ' '.join(city.split())
+    if not city:
+        return NOT_SPECIFIED, 'Not specified'
+    return city.casefold(), city.title()
+
+
+def salary_bucket(salary_min, salary_max=None, currency=None, board_currency=DEFAULT_SALARY_CURRENCY):
+    """Bucket a posting by its annualized minimum salary, or its maximum for "up to" ranges
+
+    Amounts are annualized when parsed, so hourly and monthly rates share the
+    annual buckets; amounts in another currency than the board's get their
+    own bucket rather than being compared against its bounds.
+    """
+    amount = salary_min if salary_min is not None else salary_max
+    if amount is None:
+        return NOT_SPECIFIED
+    if currency is not None and currency != board_currency:
+        return OTHER_CURRENCY
+    for lower_bound, key, _label in SALARY_BUCKETS:
+        if amount >= lower_bound:
+            return key
+    return NOT_SPECIFIED
+
+
+def salary_bucket_bounds(key):
+    """(lower, upper) salary_min bounds for a bucket key; upper is exclusive or None"""
+    upper = None
+    for lower_bound, bucket_key, _label in SALARY_BUCKETS:
+        if bucket_key == key:
+            return lower_bound, upper
+        upper = lower_bound
+    return None
+
+
+def in_board_currency(board_currency):
+    """SQL condition for postings quoted in the board's currency (or with no currency given)"""
+    from app.models import db, JobPosting
+
+    return db.or_(JobPosting.salary_currency.is_(None), JobPosting.salary_currency == board_currency)
+
+
+def salary_bucket_condition(key, board_currency=DEFAULT_SALARY_CURRENCY):
+    """SQL condition selecting the postings salary_bucket() puts in bucket `key`"""
+    from app.models import db, JobPosting
+
+    amount = db.func.coalesce(JobPosting.salary_min, JobPosting.salary_max)
+    if key == OTHER_CURRENCY:
+        return db.and_(amount.isnot(None), db.not_(in_board_currency(board_currency)))
+    bounds = salary_bucket_bounds(key)
+    if bounds is None:
+        return amount.is_(None)
+    if bounds[1] is None:
+        return db.and_(in_board_currency(board_currency), amount >= bounds[0])
+    return db.and_(in_board_currency(board_currency), amount >= bounds[0], amount < bounds[1])
+
+
+def salary_at_least(amount, board_currency=DEFAULT_SALARY_CURRENCY):
+    """SQL condition for postings that can pay `amount` or more; "80k+" ranges have no maximum"""
+    from app.models import db, JobPosting
+
+    return db.and_(in_board_currency(board_currency), db.or_(
+        JobPosting.salary_max >= amount,
+        db.and_(JobPosting.salary_max.is_(None), JobPosting.salary_min >= amount)))
+
+
+def salary_at_most(amount, board_currency=DEFAULT_SALARY_CURRENCY):
+    """SQL condition for postings that start at `amount` or less; "up to 50k" ranges have no minimum"""
+    from app.models import db, JobPosting
+
+    return db.and_(in_board_currency(board_currency), db.or_(
+        JobPosting.salary_min <= amount,
+        db.and_(JobPosting.salary_min.is_(None), JobPosting.salary_max <= amount)))
+
+
+SALARY_LABELS = {key: label for _bound, key, label in SALARY_BUCKETS}
+SALARY_LABELS[NOT_SPECIFIED] = 'Not specified'
+SALARY_LABELS[OTHER_CURRENCY] = 'Other currencies'
+
+
+class FacetIndex:
+    """Per-job facet values plus running counts over all active postings"""
+
+    def __init__(self, currency=DEFAULT_SALARY_CURRENCY):
+        self.currency = currency
+        self._lock = threading.Lock()
+        self._job_facets = {}                         # job_id -> {facet: value}
+        self._counts = {facet: Counter() for facet in FACETS}
+        self._labels = {facet: {} for facet in FACETS}
+
+    def __len__(self):
+        return len(self._job_facets)
+
+    def _values_for(self, job_type, location, salary_min, salary_max, salary_currency):
+        location_key, location_label = normalize_location(location)
+        job_type = (job_type or 'full-time').lower()
+        salary_key = salary_bucket(salary_min, salary_max, salary_currency, self.currency)
+        values = {'job_type': job_type, 'location': location_key, 'salary': salary_key}
+        labels = {
+            'job_type': job_type.replace('-', ' ').title(),
+            'location': location_label,
+            'salary': SALARY_LABELS[salary_key],
+        }
+        return values, labels
+
+    def _remove_locked(self, job_id):
+        old = self._job_facets.pop(job_id, None)
+        if old is None:
+            return
+        for facet, value in old.items():
+            counter = self._counts[facet]
+            counter[value] -= 1
+            if counter[value] <= 0:
+                del counter[value]
+
+    def add_job(self, job_id, job_type=None, location=None, salary_min=None, salary_max=None, salary_currency=None):
+        """Count one active posting (re-adding replaces its previous values)"""
+        values, labels = self._values_for(job_type, location, salary_min, salary_max, salary_currency)
+        with self._lock:
+            self._remove_locked(job_id)
+            self._job_facets[job_id] = values
+            for facet, value in values.items():
+                self._counts[facet][value] += 1
+                self._labels[facet].setdefault(value, labels[facet])
+
+    def remove_job(self, job_id):
+        """Stop counting a posting that is no longer active"""
+        with self._lock:
+            self._remove_locked(job_id)
+
+    def rebuild(self, rows):
+        """Replace the index from (id, job_type, location, salary_min, salary_max, salary_currency) rows"""
+        fresh = FacetIndex(self.currency)
+        for job_id, job_type, location, salary_min, salary_max, salary_currency in rows:
+            fresh.add_job(job_id, job_type, location, salary_min, salary_max, salary_currency)
+        with self._lock:
+            self._job_facets, self._counts, self._labels = fresh._job_facets, fresh._counts, fresh._labels
+
+    def counts(self, job_ids=None):
+        """Facet counts over all active postings, or only over the given ids
+
+        Returns {facet: [{'value', 'label', 'count'}, ...]} sorted by count.
+        """
+        with self._lock:
+            if job_ids is None:
+                counters = {facet: Counter(counter) for facet, counter in self._counts.items()}
+            else:
+                counters = {facet: Counter() for facet in FACETS}
+                for job_id in job_ids:
+                    values = self._job_facets.get(job_id)
+                    if values is None:
+                        continue
+                    for facet, value in values.items():
+                        counters[facet][value] += 1
+            labels = {facet: dict(facet_labels) for facet, facet_labels in self._labels.items()}
+
+        return {
+            facet: [{'value': value, 'label': labels[facet].get(value, value), 'count': count}
+                    for value, count in counter.most_common()]
+            for facet, counter in counters.items()
+        }
+
+
+# Process-wide facet index, rebuilt on startup and kept current through signals
+facet_index = FacetIndex()
+
+
+def _on_jobs_posted(sender, jobs=(), **extra):
+    for job in jobs:
+        if job.is_active:
+            facet_index.add_job(job.id, job.job_type, job.location, job.salary_min, job.salary_max,
+                                job.salary_currency)
+
+
+def _on_jobs_deactivated(sender, job_ids=(), **extra):
+    for job_id in job_ids:
+        facet_index.remove_job(job_id)
+
+
+def init_facets(app):
+    """Build facet counts from active postings and subscribe to updates"""
+    from app.models import JobPosting, db
+
+    app.config.setdefault('SALARY_CURRENCY', DEFAULT_SALARY_CURRENCY)
+    facet_index.currency = app.config['SALARY_CURRENCY']
+    with app.app_context():
+        rows = db.session.query(
+            JobPosting.id, JobPosting.job_type, JobPosting.location, JobPosting.salary_min, JobPosting.salary_max,
+            JobPosting.salary_currency
+        ).filter(JobPosting.is_active == True).all()
+        facet_index.rebuild(rows)
+    logger.info("Facet index built", extra={'jobs': len(rows)})
+
+    jobs_posted.connect(_on_jobs_posted, weak=False)
+    jobs_deactivated.connect(_on_jobs_deactivated, weak=False)
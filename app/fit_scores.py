@@ -0,0 +1,191 @@
+"""
+Job-fit scores ranking each posting's applicants, cached per application
+"""
+import hashlib
+import logging
+from datetime import datetime
+
+from sqlalchemy import or_
+
+try:
+    import numpy
+    from scipy import sparse
+except ImportError:  # NumPy/SciPy are optional; scores fall back to per-pair dot products
+    numpy = None
+    sparse = None
+
+from app.cache import query_cache
+from app.recommend import recommender, tokenize, job_tokens
+from app.signals import application_submitted
+from app.tasks import task, enqueue
+
+logger = logging.getLogger(__name__)
+
+# Applications scored per vectorized batch
+BATCH_SIZE = 500
+
+
+def input_hash(title, description, bio, cover_letter, model_version=''):
+    """Fingerprint of everything a fit score depends on, including the IDF weights' fingerprint"""
+    digest = hashlib.sha1()
+    for part in (title, description, bio, cover_letter, model_version):
+        digest.update((part or '').encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def _cosine_rows(left, right):
+    """Row-wise cosine of two equally long lists of normalized {term: weight} vectors"""
+    if sparse is None:
+        scores = []
+        for a, b in zip(left, right):
+            if len(a) > len(b):
+                a, b = b, a
+            scores.append(sum(weight * b.get(term, 0.0) for term, weight in a.items()))
+        return scores
+
+    columns = {}
+
+    def to_matrix(vectors):
+        data, indices, indptr = [], [], [0]
+        for vector in vectors:
+            for term, weight in vector.items():
+                indices.append(columns.setdefault(term, len(columns)))
+                data.append(weight)
+            indptr.append(len(indices))
+        return data, indices, indptr
+
+    left_parts = to_matrix(left)
+    right_parts = to_matrix(right)
+    shape = (len(left), max(len(columns), 1))
+    products = sparse.csr_matrix(left_parts, shape=shape).multiply(sparse.csr_matrix(right_parts, shape=shape))
+    return numpy.asarray(products.sum(axis=1)).ravel().tolist()
+
+
+def score_batch(rows, model=None):
+    """Fit scores for (job_id, title, description, bio, cover_letter) rows
+
+    Each job's vector is built once per batch; applicants are vectorized from
+    their bio and cover letter with the recommender's IDF weights (or model's).
+    """
+    model = model or recommender.model
+    job_vectors = {}
+    left, right = [], []
+    for job_id, title, description, bio, cover_letter in rows:
+        if job_id not in job_vectors:
+            job_vectors[job_id] = model.vector(job_tokens(title, description, None))
+        left.append(job_vectors[job_id])
+        right.append(model.vector(tokenize(bio) + tokenize(cover_letter)))
+    return _cosine_rows(left, right)
+
+
+def _score_query():
+    from app.models import db, Application, ApplicationFitScore, JobPosting, User
+
+    return db.session.query(
+        Application.id, Application.job_id, JobPosting.title, JobPosting.description,
+        User.bio, Application.cover_letter, ApplicationFitScore.input_hash
+    ).join(
+        JobPosting, Application.job_id == JobPosting.id
+    ).join(
+        User, Application.seeker_id == User.id
+    ).outerjoin(
+        ApplicationFitScore, ApplicationFitScore.application_id == Application.id
+    )
+
+
+def _rescore(query, model_version, batch_size):
+    """Score the query's rows whose input hash changed; returns [(application_id, job_id)] rescored"""
+    from app.models import db, ApplicationFitScore
+
+    stale = []
+    for application_id, app_job_id, title, description, bio, cover_letter, stored_hash in query:
+        current_hash = input_hash(title, description, bio, cover_letter, model_version)
+        if current_hash != stored_hash:
+            stale.append((application_id, current_hash, (app_job_id, title, description, bio, cover_letter)))
+
+    now = datetime.utcnow()
+    for start in range(0, len(stale), batch_size):
+        batch = stale[start:start + batch_size]
+        scores = score_batch([inputs for _id, _hash, inputs in batch])
+        db.session.query(ApplicationFitScore).filter(
+            ApplicationFitScore.application_id.in_([application_id for application_id, _hash, _inputs in batch])
+        ).delete(synchronize_session=False)
+        db.session.add_all([
+            ApplicationFitScore(
+                application_id=application_id,
+                job_id=inputs[0],
+                score=round(float(score), 6),
+                input_hash=current_hash,
+                model_version=model_version,
+                computed_at=now
+            )
+            for (application_id, current_hash, inputs), score in zip(batch, scores)
+        ])
+        db.session.commit()
+    return [(application_id, inputs[0]) for application_id, _hash, inputs in stale]
+
+
+def refresh_fit_scores(employer_id=None, job_id=None, seeker_id=None, application_id=None, batch_size=BATCH_SIZE):
+    """Score applications whose inputs changed since they were last scored; returns how many
+
+    Scores depend on the recommender's IDF weights, so when a partial refresh
+    scores a posting's applicant under a different fit than its other
+    applicants, the rest of that posting is rescored too and its ranking
+    stays comparable.
+    """
+    from app.models import db, Application, ApplicationFitScore, JobPosting
+
+    model_version = recommender.model.fingerprint
+    query = _score_query()
+    if employer_id is not None:
+        query = query.filter(JobPosting.employer_id == employer_id)
+    if job_id is not None:
+        query = query.filter(Application.job_id == job_id)
+    if seeker_id is not None:
+        query = query.filter(Application.seeker_id == seeker_id)
+    if application_id is not None:
+        query = query.filter(Application.id == application_id)
+    rescored = _rescore(query, model_version, batch_size)
+
+    # Refreshes by seeker or application cover only part of each posting they touch
+    touched_jobs = {app_job_id for _application_id, app_job_id in rescored}
+    if touched_jobs and (seeker_id is not None or application_id is not None):
+        mixed_jobs = [row[0] for row in db.session.query(ApplicationFitScore.job_id).filter(
+            ApplicationFitScore.job_id.in_(touched_jobs),
+            or_(ApplicationFitScore.model_version != model_version, ApplicationFitScore.model_version.is_(None))
+        ).distinct()]
+        if mixed_jobs:
+            rescored += _rescore(_score_query().filter(Application.job_id.in_(mixed_jobs)), model_version, batch_size)
+
+    if rescored:
+        query_cache.invalidate(*{f'job:{app_job_id}' for _application_id, app_job_id in rescored})
+        logger.info("Fit scores refreshed", extra={'applications': len(rescored), 'employer_id': employer_id})
+    return len(rescored)
+
+
+@task('fit_scores.refresh_application')
+def refresh_application_fit_score(application_id):
+    """Queued after an application so the employer's fit-sorted view finds the score already computed"""
+    return refresh_fit_scores(application_id=application_id)
+
+
+@task('fit_scores.refresh_seeker')
+def refresh_seeker_fit_scores(seeker_id):
+    """Queued after a seeker edits their bio, which every one of their scores depends on"""
+    return refresh_fit_scores(seeker_id=seeker_id)
+
+
+def _on_application_submitted(sender, application_id=None, **extra):
+    try:
+        # Score only the new applicant, off the request path
+        enqueue('fit_scores.refresh_application', application_id=application_id)
+    except Exception as e:
+        from app.models import db
+        db.session.rollback()
+        logger.exception("Queueing fit scoring for application %s failed: %s", application_id, e)
+
+
+def init_fit_scores(app):
+    """Score each new application in a queued task"""
+    application_submitted.connect(_on_application_submitted, weak=False)
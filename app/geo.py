@@ -0,0 +1,218 @@
+"""
+Offline location normalization and geohash-based radius search
+"""
+import csv
+import math
+import os
+import re
+from collections import namedtuple
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional; distances fall back to a Python loop
+    numpy = None
+
+Place = namedtuple('Place', ['place_id', 'name', 'country', 'lat', 'lon'])
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), 'data', 'gazetteer.csv')
+
+# Postings that are explicitly remote resolve to this pseudo-place (no coordinates)
+REMOTE = Place('remote', 'Remote', None, None, None)
+_REMOTE_WORDS = {'remote', 'anywhere', 'work from home', 'wfh', 'remote first', 'fully remote', 'worldwide'}
+
+_COUNTRY_HINTS = {
+    'ng': 'NG', 'nigeria': 'NG', 'naija': 'NG',
+    'gh': 'GH', 'ghana': 'GH',
+    'ke': 'KE', 'kenya': 'KE',
+    'za': 'ZA', 'south africa': 'ZA', 'rsa': 'ZA',
+    'eg': 'EG', 'egypt': 'EG',
+    'rw': 'RW', 'rwanda': 'RW',
+    'ug': 'UG', 'uganda': 'UG',
+    'tz': 'TZ', 'tanzania': 'TZ',
+    'et': 'ET', 'ethiopia': 'ET',
+    'ma': 'MA', 'morocco': 'MA',
+    'sn': 'SN', 'senegal': 'SN',
+    'ci': 'CI', 'ivory coast': 'CI', "cote d'ivoire": 'CI',
+    'cm': 'CM', 'cameroon': 'CM',
+    'uk': 'GB', 'gb': 'GB', 'united kingdom': 'GB', 'england': 'GB', 'scotland': 'GB',
+    'ie': 'IE', 'ireland': 'IE',
+    'de': 'DE', 'germany': 'DE',
+    'fr': 'FR', 'france': 'FR',
+    'nl': 'NL', 'netherlands': 'NL',
+    'es': 'ES', 'spain': 'ES',
+    'pt': 'PT', 'portugal': 'PT',
+    'se': 'SE', 'sweden': 'SE',
+    'pl': 'PL', 'poland': 'PL',
+    'us': 'US', 'usa': 'US', 'united states': 'US',
+    'ca': 'CA', 'canada': 'CA',
+    'ae': 'AE', 'uae': 'AE', 'united arab emirates': 'AE',
+    'in': 'IN', 'india': 'IN',
+    'sg': 'SG', 'singapore': 'SG',
+    'au': 'AU', 'australia': 'AU',
+    'jp': 'JP', 'japan': 'JP',
+    'br': 'BR', 'brazil': 'BR',
+}
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s,']+")
+
+EARTH_RADIUS_KM = 6371.0088
+
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+KM_PER_DEGREE = 111.32
+
+# Stored geohash length; ~1.2 x 0.6 km cells are plenty for city-level places
+GEOHASH_PRECISION = 6
+
+
+def _normalize(text):
+    return ' '.join(_PUNCTUATION_RE.sub(' ', text.casefold()).replace("'", '').split())
+
+
+class Gazetteer:
+    """Bundled offline place list with an alias lookup table"""
+
+    def __init__(self, path=GAZETTEER_PATH):
+        self.places = {}
+        self._aliases = {}
+        with open(path, newline='', encoding='utf-8') as handle:
+            for row in csv.DictReader(handle):
+                place = Place(row['place_id'], row['name'], row['country'], float(row['lat']), float(row['lon']))
+                self.places[place.place_id] = place
+                names = [row['name']] + [alias for alias in (row['aliases'] or '').split('|') if alias]
+                for name in names:
+                    self._aliases.setdefault(_normalize(name), []).append(place)
+        self.places[REMOTE.place_id] = REMOTE
+
+    def get(self, place_id):
+        return self.places.get(place_id)
+
+    def resolve(self, text):
+        """Map free text like "lagos ", "Lagos, NG" or "Remote" to a Place (or None)"""
+        if not text or not text.strip():
+            return None
+        normalized = _normalize(text)
+        if not normalized:
+            return None
+        if normalized in _REMOTE_WORDS or normalized.startswith('remote'):
+            return REMOTE
+
+        parts = [part.strip() for part in normalized.split(',') if part.strip()]
+        country = None
+        for part in parts[1:]:
+            country = _COUNTRY_HINTS.get(part, country)
+
+        # Whole string first ("new york city"), then each comma-separated component
+        for candidate in [normalized.replace(',', ' ').strip()] + parts:
+            candidate = ' '.join(candidate.split())
+            places = self._aliases.get(candidate)
+            if not places:
+                continue
+            if country:
+                for place in places:
+                    if place.country == country:
+                        return place
+            return places[0]
+        return None
+
+
+_gazetteer = None
+
+
+def gazetteer():
+    """Lazily loaded process-wide gazetteer"""
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = Gazetteer()
+    return _gazetteer
+
+
+def geohash_encode(lat, lon, precision=GEOHASH_PRECISION):
+    """Standard base32 geohash of a coordinate"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        interval = lon_range if even else lat_range
+        value = lon if even else lat
+        mid = (interval[0] + interval[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            interval[0] = mid
+        else:
+            bits <<= 1
+            interval[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def location_fields(location):
+    """(place_id, lat, lon, geohash) for a free-text location, all None if unresolved"""
+    place = gazetteer().resolve(location)
+    if place is None:
+        return None, None, None, None
+    if place.lat is None:
+        return place.place_id, None, None, None
+    return place.place_id, place.lat, place.lon, geohash_encode(place.lat, place.lon)
+
+
+def _cell_size_degrees(precision):
+    """(lat, lon) size in degrees of a geohash cell; longitude takes the odd bit"""
+    bits = 5 * precision
+    lat_bits = bits // 2
+    lon_bits = bits - lat_bits
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def covering_prefixes(lat, lon, radius_km):
+    """Geohash prefixes whose cells together cover a circle around a point
+
+    Picks the longest prefix whose cells are at least the radius across in
+    both directions, so the centre cell plus its eight neighbours always
+    contain the whole circle.
+    """
+    km_per_lon_degree = max(KM_PER_DEGREE * math.cos(math.radians(lat)), 1e-6)
+    precision = 1
+    for length in range(GEOHASH_PRECISION, 0, -1):
+        lat_deg, lon_deg = _cell_size_degrees(length)
+        if lat_deg * KM_PER_DEGREE >= radius_km and lon_deg * km_per_lon_degree >= radius_km:
+            precision = length
+            break
+
+    lat_deg, lon_deg = _cell_size_degrees(precision)
+    prefixes = set()
+    for d_lat in (-lat_deg, 0.0, lat_deg):
+        for d_lon in (-lon_deg, 0.0, lon_deg):
+            point_lat = max(min(lat + d_lat, 89.9999), -89.9999)
+            point_lon = ((lon + d_lon + 180.0) % 360.0) - 180.0
+            prefixes.add(geohash_encode(point_lat, point_lon, precision))
+    return sorted(prefixes)
+
+
+def haversine_km(lat, lon, lats, lons):
+    """Great-circle distances from one point to many, vectorized when NumPy is present"""
+    if numpy is not None:
+        lat1 = numpy.radians(lat)
+        lat2 = numpy.radians(numpy.asarray(lats, dtype=float))
+        d_lat = lat2 - lat1
+        d_lon = numpy.radians(numpy.asarray(lons, dtype=float) - lon)
+        a = numpy.sin(d_lat / 2) ** 2 + numpy.cos(lat1) * numpy.cos(lat2) * numpy.sin(d_lon / 2) ** 2
+        return (2 * EARTH_RADIUS_KM * numpy.arcsin(numpy.sqrt(a))).tolist()
+
+    distances = []
+    lat1 = math.radians(lat)
+    for other_lat, other_lon in zip(lats, lons):
+        lat2 = math.radians(other_lat)
+        d_lat = lat2 - lat1
+        d_lon = math.radians(other_lon - lon)
+        a = math.sin(d_lat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(d_lon / 2) ** 2
+        distances.append(2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a)))
+    return distances
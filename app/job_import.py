@@ -0,0 +1,197 @@
+"""
+Job posting validation and streaming bulk import from CSV or NDJSON
+"""
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import insert
+
+from app.dedup import minhash, band_keys, encode_signature
+from app.lifecycle import default_expiry
+from app.signals import jobs_posted
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPES = ('full-time', 'part-time', 'contract', 'internship')
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+
+# Rows inserted per transaction
+CHUNK_SIZE = 500
+
+# Only the first errors are kept for the report; the rest are just counted
+MAX_REPORTED_ERRORS = 100
+
+
+TEXT_FIELDS = ('title', 'description', 'company_name', 'location', 'salary_range', 'job_type')
+
+
+def _text(value):
+    """A field value as stripped text; numbers (e.g. a JSON salary of 50000) are written out, None if not text"""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        value = str(value)
+    if not isinstance(value, str):
+        return None
+    return value.strip()
+
+
+def validate_job(data):
+    """Validate posting fields the way post_job does; returns (fields, None) or (None, error)"""
+    values = {}
+    for name in TEXT_FIELDS:
+        values[name] = _text(data.get(name))
+        if values[name] is None:
+            return None, f'{name.replace("_", " ").capitalize()} must be text.'
+
+    title = values['title']
+    description = values['description']
+    company_name = values['company_name']
+    location = values['location']
+    salary_range = values['salary_range']
+    job_type = values['job_type'].lower() or 'full-time'
+
+    if not title:
+        return None, 'Job title is required.'
+    if not description:
+        return None, 'Job description is required.'
+    if len(title) > 200:
+        return None, 'Job title must be 200 characters or less.'
+    if len(company_name) > 100:
+        return None, 'Company name must be 100 characters or less.'
+    if len(location) > 100:
+        return None, 'Location must be 100 characters or less.'
+    if len(salary_range) > 50:
+        return None, 'Salary range must be 50 characters or less.'
+    if job_type not in JOB_TYPES:
+        return None, f'Job type must be one of: {", ".join(JOB_TYPES)}.'
+
+    return {
+        'title': title,
+        'description': description,
+        'company_name': company_name or None,
+        'location': location or None,
+        'salary_range': salary_range or None,
+        'job_type': job_type,
+    }, None
+
+
+class ImportReport:
+    """Outcome of an import: counts plus the first MAX_REPORTED_ERRORS row errors"""
+
+    def __init__(self):
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, line, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+def read_rows(stream, fmt):
+    """Yield (line number, dict) from a binary or text stream without reading it all"""
+    if isinstance(stream, (io.TextIOBase, io.StringIO)):
+        text = stream
+    else:
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+    if fmt == 'csv':
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+    else:
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield line_number, None
+                continue
+            yield line_number, row if isinstance(row, dict) else None
+
+
+def _insert_chunk(rows, employer_id):
+    """Insert validated rows with one multi-row INSERT ... RETURNING and index them for dedup"""
+    from app.models import db, JobPosting, JobMinHash, JobLshBand, salary_fields, location_fields
+
+    now = datetime.utcnow()
+    expires_at = default_expiry()
+    values = []
+    for fields in rows:
+        salary_min, salary_max, salary_currency, salary_period = salary_fields(fields['salary_range'])
+        place_id, lat, lon, geohash = location_fields(fields['location'])
+        values.append(dict(
+            fields, employer_id=employer_id, posted_date=now, is_active=True, expires_at=expires_at,
+            salary_min=salary_min, salary_max=salary_max, salary_currency=salary_currency, salary_period=salary_period,
+            location_place_id=place_id, location_lat=lat, location_lon=lon, location_geohash=geohash
+        ))
+
+    # Bulk executemany bypasses the ORM validators, so derived columns are filled in above
+    job_ids = db.session.execute(
+        insert(JobPosting).returning(JobPosting.id, sort_by_parameter_order=True), values
+    ).scalars().all()
+
+    signatures, bands = [], []
+    for job_id, fields in zip(job_ids, rows):
+        signature = minhash(fields['title'], fields['description'])
+        signatures.append({'job_id': job_id, 'signature': encode_signature(signature)})
+        bands += [{'job_id': job_id, 'employer_id': employer_id, 'bucket': key} for key in band_keys(signature)]
+    db.session.execute(insert(JobMinHash), signatures)
+    db.session.execute(insert(JobLshBand), bands)
+    db.session.commit()
+
+    # One signal per chunk, so follow-up work (alerts, recommendations) is queued per chunk too
+    jobs_posted.send(current_app._get_current_object(), jobs=JobPosting.query.filter(JobPosting.id.in_(job_ids)).all())
+    return len(job_ids)
+
+
+def import_jobs(stream, fmt, employer_id, chunk_size=CHUNK_SIZE):
+    """Stream-parse an upload and insert valid rows in chunked transactions; returns an ImportReport"""
+    from app.models import db
+
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f'Unsupported import format: {fmt}')
+
+    report = ImportReport()
+    pending = []
+    try:
+        for line, row in read_rows(stream, fmt):
+            if row is None:
+                report.add_error(line, 'Row is not a JSON object.')
+                continue
+            fields, error = validate_job(row)
+            if error:
+                report.add_error(line, error)
+                continue
+            pending.append(fields)
+            if len(pending) >= chunk_size:
+                report.imported += _insert_chunk(pending, employer_id)
+                pending = []
+        if pending:
+            report.imported += _insert_chunk(pending, employer_id)
+    except (UnicodeDecodeError, csv.Error) as e:
+        db.session.rollback()
+        report.add_error(None, f'Could not read the file: {e}')
+
+    logger.info("Jobs imported", extra={'employer_id': employer_id, 'imported': report.imported, 'failed': report.failed})
+    return report
+
+
+def detect_format(filename, default='csv'):
+    """Import format from a file name (.csv, .ndjson/.jsonl)"""
+    name = (filename or '').lower()
+    if name.endswith(('.ndjson', '.jsonl', '.json')):
+        return 'ndjson'
+    if name.endswith('.csv'):
+        return 'csv'
+    return default
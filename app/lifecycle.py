@@ -0,0 +1,251 @@
+"""
+Job posting lifecycle: expiry sweeps, archival and bulk close/reopen/delete
+"""
+import logging
+from datetime import datetime, timedelta
+
+from flask import current_app, has_app_context
+from sqlalchemy import delete, insert, select, update
+
+from app.background import PeriodicTask
+from app.metrics import JOB_LIFECYCLE
+from app.signals import jobs_posted, jobs_deactivated
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_DAYS = 30
+
+# Postings touched per transaction by the sweeper, the archiver and bulk actions
+BATCH_SIZE = 500
+
+# Dependent rows deleted per transaction when postings are deleted
+DELETE_BATCH_SIZE = 5000
+
+BULK_ACTIONS = ('close', 'reopen', 'delete')
+
+
+def job_ttl():
+    """How long a posting stays listed, from JOB_TTL_DAYS"""
+    days = current_app.config.get('JOB_TTL_DAYS', DEFAULT_TTL_DAYS) if has_app_context() else DEFAULT_TTL_DAYS
+    return timedelta(days=days)
+
+
+def default_expiry():
+    """Column default for JobPosting.expires_at"""
+    return datetime.utcnow() + job_ttl()
+
+
+def expire_postings(now=None, batch_size=BATCH_SIZE):
+    """Deactivate every active posting past its expiry date; returns how many
+
+    Postings from before expiry dates existed expire JOB_TTL_DAYS after posting.
+    """
+    from app.models import db, JobPosting
+
+    now = now or datetime.utcnow()
+    expired = db.or_(
+        JobPosting.expires_at <= now,
+        db.and_(JobPosting.expires_at.is_(None), JobPosting.posted_date <= now - job_ttl())
+    )
+    total = 0
+    while True:
+        job_ids = [row.id for row in db.session.query(JobPosting.id).filter(
+            JobPosting.is_active == True, expired
+        ).limit(batch_size)]
+        if not job_ids:
+            break
+        db.session.execute(
+            update(JobPosting).where(JobPosting.id.in_(job_ids)).values(is_active=False),
+            execution_options={'synchronize_session': False}
+        )
+        db.session.commit()
+        jobs_deactivated.send(current_app._get_current_object(), job_ids=job_ids)
+        total += len(job_ids)
+
+    if total:
+        JOB_LIFECYCLE.inc(total, action='expire')
+        logger.info("Expired job postings", extra={'jobs': total})
+    return total
+
+
+def _copy_rows(source, archive, condition):
+    """INSERT INTO archive SELECT <source columns> FROM source WHERE condition"""
+    names = [column.name for column in source.__table__.columns]
+    return insert(archive.__table__).from_select(
+        names, select(*[source.__table__.c[name] for name in names]).where(condition)
+    )
+
+
+def _job_children():
+    """Models holding rows that belong to a posting, deleted before the posting itself"""
+    from app.models import ApplicationFitScore, JobMinHash, JobLshBand, SavedSearchMatch, Application
+    return (ApplicationFitScore, JobMinHash, JobLshBand, SavedSearchMatch, Application)
+
+
+def archive_postings(older_than_days=90, now=None, batch_size=BATCH_SIZE):
+    """Move inactive postings that ended over `older_than_days` ago, and their applications, to the archive tables"""
+    from app.models import db, JobPosting, Application, JobPostingArchive, ApplicationArchive
+
+    cutoff = (now or datetime.utcnow()) - timedelta(days=older_than_days)
+    ended = db.func.coalesce(JobPosting.expires_at, JobPosting.posted_date)
+    total = 0
+    while True:
+        job_ids = [row.id for row in db.session.query(JobPosting.id).filter(
+            JobPosting.is_active == False, ended <= cutoff
+        ).order_by(JobPosting.id).limit(batch_size)]
+        if not job_ids:
+            break
+
+        db.session.execute(_copy_rows(JobPosting, JobPostingArchive, JobPosting.id.in_(job_ids)))
+        db.session.execute(_copy_rows(Application, ApplicationArchive, Application.job_id.in_(job_ids)))
+        for model in _job_children():
+            db.session.query(model).filter(model.job_id.in_(job_ids)).delete(synchronize_session=False)
+        db.session.query(JobPosting).filter(JobPosting.id.in_(job_ids)).delete(synchronize_session=False)
+        db.session.commit()
+        # Already unlisted, but cached dashboards may still show them
+        jobs_deactivated.send(current_app._get_current_object(), job_ids=job_ids)
+        total += len(job_ids)
+
+    if total:
+        JOB_LIFECYCLE.inc(total, action='archive')
+        logger.info("Archived job postings", extra={'jobs': total, 'older_than_days': older_than_days})
+    return total
+
+
+def _chunks(ids, size):
+    ids = list(dict.fromkeys(ids))
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def _owned(condition, employer_id):
+    """Restrict a statement to one employer's postings when employer_id is given"""
+    from app.models import JobPosting
+    if employer_id is None:
+        return condition
+    return condition & (JobPosting.employer_id == employer_id)
+
+
+def close_jobs(job_ids, employer_id=None, batch_size=BATCH_SIZE):
+    """Deactivate postings with set-based UPDATEs; returns the ids that were closed
+
+    With employer_id, ownership is enforced in the WHERE clause, so ids that
+    belong to someone else are silently skipped.
+    """
+    from app.models import db, JobPosting
+
+    closed = []
+    for chunk in _chunks(job_ids, batch_size):
+        result = db.session.execute(
+            update(JobPosting)
+            .where(_owned(JobPosting.id.in_(chunk) & (JobPosting.is_active == True), employer_id))
+            .values(is_active=False)
+            .returning(JobPosting.id),
+            execution_options={'synchronize_session': False}
+        )
+        ids = [row.id for row in result]
+        db.session.commit()
+        if ids:
+            jobs_deactivated.send(current_app._get_current_object(), job_ids=ids)
+        closed += ids
+
+    if closed:
+        JOB_LIFECYCLE.inc(len(closed), action='close')
+    return closed
+
+
+def reopen_jobs(job_ids, employer_id=None, batch_size=BATCH_SIZE):
+    """Reactivate closed postings with a fresh expiry date; returns the ids reopened"""
+    from app.models import db, JobPosting
+
+    reopened = []
+    for chunk in _chunks(job_ids, batch_size):
+        result = db.session.execute(
+            update(JobPosting)
+            .where(_owned(JobPosting.id.in_(chunk) & (JobPosting.is_active == False), employer_id))
+            .values(is_active=True, expires_at=default_expiry())
+            .returning(JobPosting.id),
+            execution_options={'synchronize_session': False}
+        )
+        ids = [row.id for row in result]
+        db.session.commit()
+        # Indexes take whole postings, so only the reopened chunk is loaded
+        if ids:
+            jobs_posted.send(current_app._get_current_object(), jobs=JobPosting.query.filter(JobPosting.id.in_(ids)).all())
+        reopened += ids
+
+    if reopened:
+        JOB_LIFECYCLE.inc(len(reopened), action='reopen')
+    return reopened
+
+
+def delete_jobs(job_ids, employer_id=None, batch_size=BATCH_SIZE):
+    """Delete postings and everything hanging off them without loading it; returns the ids deleted
+
+    Postings are hidden first, then applications and side-table rows are
+    deleted DELETE_BATCH_SIZE rows per transaction, so a posting with many
+    thousands of applicants never holds a long write lock or loads rows.
+    """
+    from app.models import db, JobPosting
+
+    deleted = []
+    for chunk in _chunks(job_ids, batch_size):
+        ids = [row.id for row in db.session.execute(
+            select(JobPosting.id).where(_owned(JobPosting.id.in_(chunk), employer_id))
+        )]
+        if not ids:
+            continue
+        db.session.execute(
+            update(JobPosting).where(JobPosting.id.in_(ids)).values(is_active=False),
+            execution_options={'synchronize_session': False}
+        )
+        db.session.commit()
+        jobs_deactivated.send(current_app._get_current_object(), job_ids=ids)
+
+        for model in _job_children():
+            key = model.__mapper__.primary_key[0]
+            while True:
+                batch = select(key).where(model.job_id.in_(ids)).limit(DELETE_BATCH_SIZE)
+                result = db.session.execute(
+                    delete(model).where(key.in_(batch)),
+                    execution_options={'synchronize_session': False}
+                )
+                db.session.commit()
+                if result.rowcount < DELETE_BATCH_SIZE:
+                    break
+
+        db.session.execute(
+            delete(JobPosting).where(JobPosting.id.in_(ids)),
+            execution_options={'synchronize_session': False}
+        )
+        db.session.commit()
+        deleted += ids
+
+    if deleted:
+        JOB_LIFECYCLE.inc(len(deleted), action='delete')
+    return deleted
+
+
+def bulk_job_action(action, job_ids, employer_id=None):
+    """Dispatch one of BULK_ACTIONS; returns the ids affected"""
+    handlers = {'close': close_jobs, 'reopen': reopen_jobs, 'delete': delete_jobs}
+    return handlers[action](job_ids, employer_id=employer_id)
+
+
+def sweep():
+    """One sweeper pass: expire due postings, then archive long-inactive ones"""
+    expired = expire_postings()
+    archived = archive_postings(current_app.config['JOB_ARCHIVE_AFTER_DAYS'])
+    return expired, archived
+
+
+def init_lifecycle(app):
+    """Start the expiry/archive sweeper in the server process unless JOB_SWEEPER_ENABLED is off"""
+    app.config.setdefault('JOB_TTL_DAYS', DEFAULT_TTL_DAYS)
+    app.config.setdefault('JOB_ARCHIVE_AFTER_DAYS', 90)
+    app.config.setdefault('JOB_SWEEP_INTERVAL', 3600)
+    app.config.setdefault('JOB_SWEEPER_ENABLED', app.config['BACKGROUND_SERVICES'])
+
+    if app.config['JOB_SWEEPER_ENABLED']:
+        app.extensions['job_sweeper'] = PeriodicTask(app, 'job-sweeper', app.config['JOB_SWEEP_INTERVAL'], sweep)
+        app.extensions['job_sweeper'].start()
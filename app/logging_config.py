@@ -0,0 +1,195 @@
+"""
+Structured, non-blocking logging for the Job Board application
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import uuid
+from datetime import datetime, timezone
+
+from flask import g, has_request_context, request
+
+# Listener shared by every app created in this process
+_listener = None
+_listener_lock = threading.Lock()
+
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+# Attributes present on every LogRecord; anything else is treated as structured context
+_RESERVED_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'request_id'}
+
+
+class RequestIdFilter(logging.Filter):
+    """Attach the current request id to every record (runs on the request thread)"""
+
+    def filter(self, record):
+        if has_request_context():
+            record.request_id = g.get('request_id', '-')
+        else:
+            record.request_id = '-'
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Let through only one in every N records for noisy loggers
+
+    Warnings and errors are never sampled. Rates are keyed by logger name and
+    apply to child loggers as well, e.g. {'app.routes': 10} keeps 1 in 10.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = dict(rates or {})
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def _rate_for(self, name):
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition('.')[0]
+        return 1
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+
+        rate = self._rate_for(record.name)
+        if rate <= 1:
+            return True
+
+        # Count per message template so that one chatty call site cannot starve another
+        key = (record.name, record.msg)
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+        if count % rate:
+            return False
+        record.sample_rate = rate
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line"""
+
+    def format(self, record):
+        payload = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'request_id': getattr(record, 'request_id', '-'),
+            'message': record.getMessage(),
+        }
+
+        # Extra structured fields passed through logger.info(..., extra={...})
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith('_'):
+                payload[key] = value
+
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload['exc_info'] = record.exc_text
+
+        return json.dumps(payload, default=str)
+
+
+def _stop_listener():
+    """Flush queued records and stop the background listener"""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def configure_logging(app):
+    """Route application logging through a queue drained by a background thread"""
+    global _listener
+
+    app.config.setdefault('LOG_LEVEL', 'INFO')
+    app.config.setdefault('LOG_LEVELS', {})
+    app.config.setdefault('LOG_SAMPLING', {})
+    app.config.setdefault('LOG_FORMAT', 'json')
+    app.config.setdefault('LOG_QUEUE_SIZE', 10000)
+
+    if app.config['LOG_FORMAT'] == 'json':
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter('%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s')
+
+    output_handler = logging.StreamHandler(sys.stderr)
+    output_handler.setFormatter(formatter)
+
+    # Bounded queue: if stdout/stderr stalls we drop records instead of blocking requests
+    log_queue = queue.Queue(maxsize=app.config['LOG_QUEUE_SIZE'])
+    queue_handler = _DroppingQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+    queue_handler.addFilter(SamplingFilter(app.config['LOG_SAMPLING']))
+
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+        _listener = logging.handlers.QueueListener(log_queue, output_handler, respect_handler_level=True)
+        _listener.start()
+
+    app_logger = logging.getLogger('app')
+    for handler in list(app_logger.handlers):
+        app_logger.removeHandler(handler)
+    app_logger.addHandler(queue_handler)
+    app_logger.setLevel(app.config['LOG_LEVEL'])
+    app_logger.propagate = False
+
+    # Per-module overrides, e.g. {'app.routes': 'DEBUG', 'app.models': 'WARNING'}
+    for name, level in app.config['LOG_LEVELS'].items():
+        logging.getLogger(name).setLevel(level)
+
+    @app.before_request
+    def assign_request_id():
+        """Reuse an upstream request id when present, otherwise mint one"""
+        incoming = request.headers.get('X-Request-ID', '')
+        g.request_id = incoming[:64] if incoming else uuid.uuid4().hex
+
+    @app.after_request
+    def echo_request_id(response):
+        """Return the request id so clients and proxies can correlate logs"""
+        request_id = g.get('request_id')
+        if request_id:
+            response.headers['X-Request-ID'] = request_id
+        return response
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks the caller when the queue is full"""
+
+    dropped = 0
+
+    def prepare(self, record):
+        """Copy the record with its message rendered and any traceback kept apart in exc_text
+
+        The stdlib version folds the traceback into msg, which would leave
+        JsonFormatter nothing to put in its exc_info field.
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            # Tracebacks hold frames, so only their text crosses the queue
+            record.exc_text = record.exc_text or _TRACEBACK_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _DroppingQueueHandler.dropped += 1
+
+
+atexit.register(_stop_listener)
@@ -0,0 +1,375 @@
+"""
+In-process metrics registry with Prometheus text exposition
+"""
+import bisect
+import hmac
+import os
+import threading
+import time
+
+from flask import Response, abort, g, request
+from sqlalchemy import event, text
+
+# Scrapes without METRICS_TOKEN are answered only from these addresses
+LOCAL_ADDRESSES = ('127.0.0.1', '::1')
+
+# Default latency buckets in seconds (Prometheus client defaults)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+
+def _format_labels(labelnames, labelvalues, extra=None):
+    """Render a label set as {a="x",b="y"}"""
+    pairs = list(zip(labelnames, labelvalues))
+    if extra:
+        pairs.extend(extra)
+    if not pairs:
+        return ''
+    escaped = []
+    for name, value in pairs:
+        value = str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        escaped.append(f'{name}="{value}"')
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_value(value):
+    """Render a sample value the way Prometheus expects"""
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base class for labelled metrics"""
+
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} expects labels {self.labelnames}, got {tuple(labels)}')
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def label_sets(self):
+        """Return every label combination that has been observed"""
+        with self._lock:
+            return [dict(zip(self.labelnames, key)) for key in self._values]
+
+    def samples(self):
+        """Yield (suffix, labelvalues, extra_labels, value) tuples"""
+        with self._lock:
+            items = list(self._values.items())
+        for labelvalues, value in items:
+            yield '', labelvalues, None, value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        for suffix, labelvalues, extra, value in self.samples():
+            labels = _format_labels(self.labelnames, labelvalues, extra)
+            lines.append(f'{self.name}{suffix}{labels} {_format_value(value)}')
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def total(self):
+        """Sum across every label combination"""
+        with self._lock:
+            return sum(self._values.values())
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, or be read from a callback at scrape time"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), callback=None):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels):
+        if self.callback is not None:
+            return self.callback()
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        if self.callback is not None:
+            try:
+                value = self.callback()
+            except Exception:
+                return
+            if value is not None:
+                yield '', (), None, value
+            return
+        yield from super().samples()
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed bucket boundaries"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def quantile(self, q, **labels):
+        """Estimate a quantile from bucket counts (upper bound of the bucket)"""
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            if not state or not state[2]:
+                return None
+            target = q * state[2]
+            running = 0
+            for bound, count in zip(self.buckets + (float('inf'),), state[0]):
+                running += count
+                if running >= target:
+                    return bound
+        return None
+
+    def samples(self):
+        with self._lock:
+            items = [(key, (list(state[0]), state[1], state[2])) for key, state in self._values.items()]
+        for labelvalues, (counts, total, count) in items:
+            running = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                running += bucket_count
+                yield '_bucket', labelvalues, [('le', _format_value(float(bound)))], running
+            yield '_sum', labelvalues, None, total
+            yield '_count', labelvalues, None, count
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together on /metrics"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=(), callback=None):
+        gauge = self._register(Gauge(name, documentation, labelnames, callback))
+        if callback is not None:
+            gauge.callback = callback
+        return gauge
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def render(self):
+        """Render every metric in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+
+# Process-wide registry used by the app and by subsystems that report into it
+registry = MetricsRegistry()
+
+REQUEST_LATENCY = registry.histogram(
+    'jobboard_request_duration_seconds', 'Request latency by endpoint', ('endpoint', 'method'))
+REQUESTS_TOTAL = registry.counter(
+    'jobboard_requests_total', 'Requests served by endpoint and status', ('endpoint', 'method', 'status'))
+IN_FLIGHT = registry.gauge(
+    'jobboard_requests_in_flight', 'Requests currently being processed')
+SQL_STATEMENTS = registry.counter(
+    'jobboard_sql_statements_total', 'SQL statements executed by verb', ('verb',))
+SQL_DURATION = registry.histogram(
+    'jobboard_sql_duration_seconds', 'SQL statement execution time', ('verb',),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+POOL_CHECKOUTS = registry.counter(
+    'jobboard_db_pool_checkouts_total', 'Connections checked out of the pool')
+CACHE_REQUESTS = registry.counter(
+    'jobboard_cache_requests_total', 'Cache lookups by cache and result', ('cache', 'result'))
+JOB_LIFECYCLE = registry.counter(
+    'jobboard_job_lifecycle_total', 'Postings expired, archived, closed, reopened or deleted', ('action',))
+
+
+def record_cache_lookup(cache_name, hit):
+    """Count a cache hit or miss for the hit-ratio metrics"""
+    CACHE_REQUESTS.inc(cache=cache_name, result='hit' if hit else 'miss')
+
+
+def cache_hit_ratios():
+    """Return {cache_name: hit_ratio} for every cache that has been queried"""
+    totals = {}
+    for _suffix, (cache_name, result), _extra, value in CACHE_REQUESTS.samples():
+        hits, lookups = totals.get(cache_name, (0, 0))
+        totals[cache_name] = (hits + (value if result == 'hit' else 0), lookups + value)
+    return {name: (hits / lookups if lookups else 0.0) for name, (hits, lookups) in totals.items()}
+
+
+def _instrument_engine(engine):
+    """Attach SQL timing and pool listeners to an engine (idempotent)"""
+    if getattr(engine, '_jobboard_instrumented', False):
+        return
+    engine._jobboard_instrumented = True
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('_query_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('_query_start')
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else 'OTHER'
+        SQL_STATEMENTS.inc(verb=verb)
+        SQL_DURATION.observe(elapsed, verb=verb)
+
+    @event.listens_for(engine, 'checkout')
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        POOL_CHECKOUTS.inc()
+
+    pool = engine.pool
+    registry.gauge('jobboard_db_pool_checked_out', 'Connections currently checked out',
+                   callback=lambda: pool.checkedout() if hasattr(pool, 'checkedout') else None)
+    registry.gauge('jobboard_db_pool_overflow', 'Connections open beyond the pool size',
+                   callback=lambda: max(pool.overflow(), 0) if hasattr(pool, 'overflow') else None)
+    registry.gauge('jobboard_db_pool_size', 'Configured connection pool size',
+                   callback=lambda: pool.size() if hasattr(pool, 'size') else None)
+
+
+def database_status(db):
+    """Ping the database and report 'Connected' or 'Unavailable'"""
+    try:
+        db.session.execute(text('SELECT 1'))
+        return 'Connected'
+    except Exception:
+        db.session.rollback()
+        return 'Unavailable'
+
+
+def health_snapshot(db):
+    """Summarise the registry for the admin system health panel"""
+    latencies = [REQUEST_LATENCY.quantile(0.95, **labels) for labels in REQUEST_LATENCY.label_sets()]
+    latencies = [value for value in latencies if value is not None]
+    p95 = max(latencies) if latencies else None
+
+    checked_out = registry.get('jobboard_db_pool_checked_out')
+    overflow = registry.get('jobboard_db_pool_overflow')
+    ratios = cache_hit_ratios()
+
+    return {
+        'database_status': database_status(db),
+        'in_flight_requests': max(IN_FLIGHT.value() - 1, 0),  # exclude the request asking
+        'requests_served': REQUESTS_TOTAL.total(),
+        'worst_p95_latency_ms': round(p95 * 1000, 1) if p95 not in (None, float('inf')) else None,
+        'sql_statements': SQL_STATEMENTS.total(),
+        'pool_checked_out': checked_out.value() if checked_out else None,
+        'pool_overflow': overflow.value() if overflow else None,
+        'cache_hit_ratio': round(sum(ratios.values()) / len(ratios), 3) if ratios else None,
+    }
+
+
+def scrape_allowed(token, authorization, remote_addr):
+    """Whether a /metrics request may read the registry
+
+    With a token configured the request must send it as a bearer token;
+    without one only local scrapers (e.g. a sidecar) are answered.
+    """
+    if token:
+        scheme, _, supplied = (authorization or '').partition(' ')
+        return scheme.lower() == 'bearer' and hmac.compare_digest(supplied.strip().encode(), token.encode())
+    return remote_addr in LOCAL_ADDRESSES
+
+
+def init_metrics(app, db):
+    """Install request instrumentation and the /metrics endpoint"""
+    app.config.setdefault('METRICS_ENABLED', True)
+    app.config.setdefault('METRICS_TOKEN', os.environ.get('METRICS_TOKEN') or None)
+    if not app.config['METRICS_ENABLED']:
+        return
+
+    with app.app_context():
+        _instrument_engine(db.engine)
+
+    @app.before_request
+    def start_request_timer():
+        g._metrics_start = time.perf_counter()
+        g._metrics_in_flight = True
+        IN_FLIGHT.inc()
+
+    @app.after_request
+    def observe_request(response):
+        start = g.pop('_metrics_start', None)
+        if start is not None:
+            endpoint = request.endpoint or 'unmatched'
+            REQUEST_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint, method=request.method)
+            REQUESTS_TOTAL.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+        return response
+
+    @app.teardown_request
+    def finish_request(exc=None):
+        if g.pop('_metrics_in_flight', False):
+            IN_FLIGHT.dec()
+
+    def metrics_view():
+        """Expose the registry in Prometheus text format to authorized scrapers"""
+        token = app.config['METRICS_TOKEN']
+        if not scrape_allowed(token, request.headers.get('Authorization'), request.remote_addr):
+            if token:
+                return Response('Unauthorized\n', 401, {'WWW-Authenticate': 'Bearer'}, mimetype='text/plain')
+            abort(404)
+        return Response(registry.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
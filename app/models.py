@@ -2,7 +2,43 @@ from app import db
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 import json
+import logging
 from datetime import datetime, timedelta
+from app.lifecycle import default_expiry
+from app.cache import query_cache
+
+logger = logging.getLogger(__name__)
+
+
+def salary_fields(salary_range):
+    """Structured (min, max, currency, period) for a free-text salary range"""
+    from app.salary import parse_salary
+    parsed = parse_salary(salary_range)
+    if parsed is None:
+        return None, None, None, None
+    return parsed.min, parsed.max, parsed.currency, parsed.period
+
+
+def _job_tags(rows):
+    return [f'job:{row["job_id"]}' for row in rows or ()]
+
+
+def _applied_jobs_tags(result, user):
+    return [f'seeker:{user.id}'] + _job_tags(result)
+
+
+def _posted_jobs_tags(result, user):
+    return [f'employer:{user.id}'] + [f'job:{row["id"]}' for row in result or ()]
+
+
+def _recent_applications_tags(result, user, sort='recent', job_id=None, limit=20):
+    return [f'employer:{user.id}'] + _job_tags(result) + [f'seeker:{row["seeker_id"]}' for row in result or ()]
+
+
+def location_fields(location):
+    """Canonical (place_id, lat, lon, geohash) for a free-text location"""
+    from app.geo import location_fields as resolve_location
+    return resolve_location(location)
 
 
 class User(db.Model):
@@ -15,8 +51,9 @@ class User(db.Model):
     password = db.Column(db.String(200), nullable=False)
     role = db.Column(db.String(20), nullable=False, default='seeker')  # 'seeker', 'employer', 'admin'
     full_name = db.Column(db.String(100))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    last_login = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    last_login = db.Column(db.DateTime)  # UTC; rows from before app.activity hold server local time
+    last_seen = db.Column(db.DateTime)  # written behind by app.activity
     is_active = db.Column(db.Boolean, default=True)
     
     # Admin-specific fields
@@ -28,6 +65,12 @@ class User(db.Model):
     location = db.Column(db.String(100), nullable=True)
     bio = db.Column(db.Text, nullable=True)
     
+    # Canonical place resolved from location against the bundled gazetteer
+    location_place_id = db.Column(db.String(40), nullable=True, index=True)
+    location_lat = db.Column(db.Float, nullable=True)
+    location_lon = db.Column(db.Float, nullable=True)
+    location_geohash = db.Column(db.String(12), nullable=True, index=True)
+    
     # Relationships
     job_postings = db.relationship('JobPosting', backref='employer', lazy=True, foreign_keys='JobPosting.employer_id')
     applications = db.relationship('Application', backref='seeker', lazy=True, foreign_keys='Application.seeker_id')
@@ -59,7 +102,13 @@ class User(db.Model):
     def set_password(self, password):
         """Set new password (hashed)"""
         self.password = generate_password_hash(password)
-    
+
+    @db.validates('location')
+    def _resolve_location(self, key, value):
+        """Keep the canonical place columns in step with the free-text location"""
+        self.location_place_id, self.location_lat, self.location_lon, self.location_geohash = location_fields(value)
+        return value
+
     def get_profile_data(self):
         """Get user profile data for display"""
         return {
@@ -104,11 +153,13 @@ class User(db.Model):
             
             # Commit changes
             db.session.commit()
+            # Names and bios appear in other users' cached dashboards
+            query_cache.invalidate(f'seeker:{self.id}', f'employer:{self.id}', 'overview')
             return True
             
         except Exception as e:
             db.session.rollback()
-            print(f"Error updating profile: {e}")
+            logger.exception("Error updating profile: %s", e)
             return False
     
     def get_profile_completion_percentage(self):
@@ -139,6 +190,7 @@ class User(db.Model):
     def __repr__(self):
         return f'<User {self.username}>'
     
+    @query_cache.cached('applied_jobs', key=lambda self: self.id, tags=_applied_jobs_tags)
     def get_applied_jobs(self):
         """Get all jobs this seeker has applied for with real database data"""
         if self.role != 'seeker':
@@ -188,9 +240,11 @@ class User(db.Model):
             return applied_jobs
             
         except Exception as e:
-            print(f"Error fetching applied jobs: {e}")
+            logger.exception("Error fetching applied jobs: %s", e)
+            query_cache.skip()  # don't cache the fallback as a real result
             return []
     
+    @query_cache.cached('posted_jobs', key=lambda self: self.id, tags=_posted_jobs_tags)
     def get_posted_jobs(self):
         """Get all jobs posted by this employer with real database data"""
         if self.role != 'employer':
@@ -241,11 +295,19 @@ class User(db.Model):
             return posted_jobs
             
         except Exception as e:
-            print(f"Error fetching posted jobs: {e}")
+            logger.exception("Error fetching posted jobs: %s", e)
+            query_cache.skip()  # don't cache the fallback as a real result
             return []
     
-    def get_recent_applications(self):
-        """Get recent applications for this employer's jobs with real database data"""
+    @query_cache.cached('recent_applications', tags=_recent_applications_tags,
+                        key=lambda self, sort='recent', job_id=None, limit=20: (self.id, sort, job_id, limit))
+    def get_recent_applications(self, sort='recent', job_id=None, limit=20):
+        """Get recent applications for this employer's jobs with real database data
+        
+        sort='fit' ranks applicants by their stored job-fit score instead of
+        date. Scores are computed by queued tasks when someone applies or edits
+        their bio; applications not scored yet sort last.
+        """
         if self.role != 'employer':
             return []
         
@@ -253,96 +315,99 @@ class User(db.Model):
             # Query applications for employer's jobs with seeker details
             from sqlalchemy import desc
             
-            applications = db.session.query(
+            query = db.session.query(
                 Application.id.label('application_id'),
                 Application.application_date,
                 Application.status,
                 Application.cover_letter,
+                Application.job_id,
+                Application.seeker_id,
                 JobPosting.title.label('job_title'),
                 User.username.label('applicant_name'),
-                User.email.label('applicant_email')
+                User.email.label('applicant_email'),
+                ApplicationFitScore.score.label('fit_score')
             ).join(
                 JobPosting, Application.job_id == JobPosting.id
             ).join(
                 User, Application.seeker_id == User.id
+            ).outerjoin(
+                ApplicationFitScore, ApplicationFitScore.application_id == Application.id
             ).filter(
                 JobPosting.employer_id == self.id
-            ).order_by(
-                desc(Application.application_date)
-            ).limit(20).all()  # Limit to recent 20 applications
+            )
+            if job_id is not None:
+                query = query.filter(Application.job_id == job_id)
+            
+            if sort == 'fit':
+                query = query.order_by(desc(ApplicationFitScore.score), desc(Application.application_date))
+            else:
+                query = query.order_by(desc(Application.application_date))
+            applications = query.limit(limit).all()
             
             # Convert to list of dictionaries for template use
             recent_applications = []
             for app in applications:
                 recent_applications.append({
                     'application_id': app.application_id,
+                    'job_id': app.job_id,
+                    'seeker_id': app.seeker_id,
                     'applicant_name': app.applicant_name,
                     'applicant_email': app.applicant_email,
                     'job_title': app.job_title,
                     'application_date': app.application_date,
                     'status': app.status,
-                    'cover_letter': app.cover_letter
+                    'cover_letter': app.cover_letter,
+                    'fit_score': app.fit_score
                 })
             
             return recent_applications
             
         except Exception as e:
-            print(f"Error fetching recent applications: {e}")
+            logger.exception("Error fetching recent applications: %s", e)
+            query_cache.skip()  # don't cache the fallback as a real result
             return []
     
     @staticmethod
+    @query_cache.cached('system_overview', key=lambda: (), tags=lambda result: ['overview'], ttl=60)
     def get_system_overview():
         """Get system overview statistics for admin dashboard with real database data"""
         try:
             from sqlalchemy import func, and_, extract
             from datetime import datetime, timedelta
             
-            # Calculate date ranges
-            now = datetime.now()
-            start_of_month = datetime(now.year, now.month, 1)
-            start_of_today = datetime(now.year, now.month, now.day)
+            from app.analytics import live_counts, period_totals
+            
+            # Calculate date ranges (UTC days, matching the stored timestamps)
+            today = datetime.utcnow().date()
+            start_of_today = datetime(today.year, today.month, today.day)
             
-            # Total counts
-            total_users = db.session.query(func.count(User.id)).scalar() or 0
+            # Total counts, with users split by role in one grouped query
+            users_by_role = dict(db.session.query(User.role, func.count(User.id)).group_by(User.role).all())
+            total_users = sum(users_by_role.values())
             total_jobs = db.session.query(func.count(JobPosting.id)).filter(
                 JobPosting.is_active == True
             ).scalar() or 0
             total_applications = db.session.query(func.count(Application.id)).scalar() or 0
             
             # User role counts
-            total_employers = db.session.query(func.count(User.id)).filter(
-                User.role == 'employer'
-            ).scalar() or 0
+            total_employers = users_by_role.get('employer', 0)
             
             active_employers = db.session.query(func.count(User.id)).filter(
                 and_(User.role == 'employer', User.is_active == True)
             ).scalar() or 0
             
-            # Monthly counts
-            new_users_this_month = db.session.query(func.count(User.id)).filter(
-                User.created_at >= start_of_month
-            ).scalar() or 0
-            
-            new_jobs_this_month = db.session.query(func.count(JobPosting.id)).filter(
-                JobPosting.posted_date >= start_of_month
-            ).scalar() or 0
-            
-            new_applications_this_month = db.session.query(func.count(Application.id)).filter(
-                Application.application_date >= start_of_month
-            ).scalar() or 0
+            # Daily counts are live; earlier days of the month are summed from the daily rollups
+            today_counts = {metric: sum(counts.values()) for metric, counts in live_counts(start_of_today).items()}
+            month_totals = period_totals(today.replace(day=1), today - timedelta(days=1))
+            month_counts = {metric: sum(counts.values()) + today_counts[metric] for metric, counts in month_totals.items()}
             
-            # Daily counts
-            applications_today = db.session.query(func.count(Application.id)).filter(
-                Application.application_date >= start_of_today
-            ).scalar() or 0
+            new_users_this_month = month_counts['signups']
+            new_jobs_this_month = month_counts['postings']
+            new_applications_this_month = month_counts['applications']
             
-            jobs_posted_today = db.session.query(func.count(JobPosting.id)).filter(
-                JobPosting.posted_date >= start_of_today
-            ).scalar() or 0
-            
-            new_users_today = db.session.query(func.count(User.id)).filter(
-                User.created_at >= start_of_today
-            ).scalar() or 0
+            applications_today = today_counts['applications']
+            jobs_posted_today = today_counts['postings']
+            new_users_today = today_counts['signups']
             
             # Recent users
             recent_users_query = db.session.query(User).order_by(
@@ -387,6 +452,8 @@ class User(db.Model):
                 'total_applications': total_applications,
                 'total_employers': total_employers,
                 'active_employers': active_employers,
+                'seekers_count': users_by_role.get('seeker', 0),
+                'employers_count': total_employers,
                 'new_users_this_month': new_users_this_month,
                 'new_jobs_this_month': new_jobs_this_month,
                 'new_applications_this_month': new_applications_this_month,
@@ -398,7 +465,8 @@ class User(db.Model):
             }
             
         except Exception as e:
-            print(f"Error fetching system overview: {e}")
+            logger.exception("Error fetching system overview: %s", e)
+            query_cache.skip()  # don't cache the fallback as a real result
             # Return default values if query fails
             return {
                 'total_users': 0,
@@ -406,6 +474,8 @@ class User(db.Model):
                 'total_applications': 0,
                 'total_employers': 0,
                 'active_employers': 0,
+                'seekers_count': 0,
+                'employers_count': 0,
                 'new_users_this_month': 0,
                 'new_jobs_this_month': 0,
                 'new_applications_this_month': 0,
@@ -416,6 +486,43 @@ class User(db.Model):
                 'recent_jobs': []
             }
 
+    @staticmethod
+    def create_admin(username, email, password, permissions, full_name=None, created_by=None):
+        """Create an administrator with the given permissions; returns the new user or None"""
+        try:
+            admin = User(username=username, email=email, password=password, role='admin',
+                         full_name=full_name, created_by=created_by)
+            admin.set_permissions(permissions)
+            db.session.add(admin)
+            db.session.commit()
+            query_cache.invalidate('overview')
+            return admin
+        except Exception as e:
+            db.session.rollback()
+            logger.exception("Error creating admin: %s", e)
+            return None
+
+    @staticmethod
+    def get_recent_admin_activities(limit=5):
+        """Latest audit log entries as dicts for the admin dashboard"""
+        from app.audit import recent_activity
+        
+        try:
+            return [{
+                'username': entry.username or 'System',
+                'action': entry.summary,
+                'date': entry.created_at
+            } for entry in recent_activity(per_page=limit).items]
+        except Exception as e:
+            logger.exception("Error fetching admin activities: %s", e)
+            return []
+
+    @staticmethod
+    def get_admin_count():
+        """Get the number of administrator accounts"""
+        from sqlalchemy import func
+        return db.session.query(func.count(User.id)).filter(User.role == 'admin').scalar() or 0
+
     def set_permissions(self, permissions_dict):
         """Set user permissions from dictionary"""
         import json
@@ -471,13 +578,66 @@ class JobPosting(db.Model):
     job_type = db.Column(db.String(20), default='full-time', nullable=True)  # Changed for SQLite
     posted_date = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
     is_active = db.Column(db.Boolean, default=True, nullable=False, index=True)
+    expires_at = db.Column(db.DateTime, default=default_expiry, nullable=True)
+    
+    # Structured salary parsed from salary_range (amounts are annualized)
+    salary_min = db.Column(db.Integer, nullable=True)
+    salary_max = db.Column(db.Integer, nullable=True)
+    salary_currency = db.Column(db.String(3), nullable=True)
+    salary_period = db.Column(db.String(10), nullable=True)
+    
+    # Canonical place resolved from location; the geohash backs radius searches
+    location_place_id = db.Column(db.String(40), nullable=True, index=True)
+    location_lat = db.Column(db.Float, nullable=True)
+    location_lon = db.Column(db.Float, nullable=True)
+    location_geohash = db.Column(db.String(12), nullable=True)
     
     # Relationships
     applications = db.relationship('Application', backref='job_posting', lazy=True, cascade='all, delete-orphan')
     
+    # Active listings filtered or sorted by pay are served from these indexes
+    __table_args__ = (
+        db.Index('ix_job_postings_active_salary_max', 'is_active', 'salary_max'),
+        db.Index('ix_job_postings_active_salary_min', 'is_active', 'salary_min'),
+        db.Index('ix_job_postings_active_geohash', 'is_active', 'location_geohash'),
+        db.Index('ix_job_postings_active_expires_at', 'is_active', 'expires_at'),
+    )
+    
     def __repr__(self):
         return f'<JobPosting {self.title}>'
     
+    @db.validates('salary_range')
+    def _parse_salary_range(self, key, value):
+        """Keep the structured salary columns in step with the free-text range"""
+        self.salary_min, self.salary_max, self.salary_currency, self.salary_period = salary_fields(value)
+        return value
+    
+    @db.validates('location')
+    def _resolve_location(self, key, value):
+        """Keep the canonical place columns in step with the free-text location"""
+        self.location_place_id, self.location_lat, self.location_lon, self.location_geohash = location_fields(value)
+        return value
+    
+    @staticmethod
+    def distances_within(lat, lon, radius_km):
+        """{job_id: km} for active postings within radius_km of a point
+        
+        Candidates come from index range scans over the geohash cells covering
+        the circle; exact great-circle distances then trim the corners.
+        """
+        from app.geo import covering_prefixes, haversine_km
+        cells = [
+            db.and_(JobPosting.location_geohash >= prefix, JobPosting.location_geohash < prefix + '{')
+            for prefix in covering_prefixes(lat, lon, radius_km)
+        ]
+        rows = db.session.query(
+            JobPosting.id, JobPosting.location_lat, JobPosting.location_lon
+        ).filter(JobPosting.is_active == True, db.or_(*cells)).all()
+        if not rows:
+            return {}
+        distances = haversine_km(lat, lon, [row.location_lat for row in rows], [row.location_lon for row in rows])
+        return {row.id: distance for row, distance in zip(rows, distances) if distance <= radius_km}
+    
     @staticmethod
     def search_jobs(keyword):
         """Search for jobs by keyword in title or description"""
@@ -503,7 +663,7 @@ class JobPosting(db.Model):
             return jobs
             
         except Exception as e:
-            print(f"Search error: {e}")
+            logger.exception("Search error: %s", e)
             return []
 
 class Application(db.Model):
@@ -523,16 +683,221 @@ class Application(db.Model):
     def __repr__(self):
         return f'<Application Job:{self.job_id} Seeker:{self.seeker_id}>'
 
+
+class JobPostingArchive(db.Model):
+    """Cold storage for old inactive job postings (same columns as job_postings)"""
+    __tablename__ = 'job_postings_archive'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text, nullable=False)
+    employer_id = db.Column(db.Integer, nullable=False, index=True)
+    company_name = db.Column(db.String(100), nullable=True)
+    location = db.Column(db.String(100), nullable=True)
+    salary_range = db.Column(db.String(50), nullable=True)
+    job_type = db.Column(db.String(20), nullable=True)
+    posted_date = db.Column(db.DateTime, nullable=False)
+    is_active = db.Column(db.Boolean, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=True)
+    salary_min = db.Column(db.Integer, nullable=True)
+    salary_max = db.Column(db.Integer, nullable=True)
+    salary_currency = db.Column(db.String(3), nullable=True)
+    salary_period = db.Column(db.String(10), nullable=True)
+    location_place_id = db.Column(db.String(40), nullable=True)
+    location_lat = db.Column(db.Float, nullable=True)
+    location_lon = db.Column(db.Float, nullable=True)
+    location_geohash = db.Column(db.String(12), nullable=True)
+    archived_at = db.Column(db.DateTime, nullable=False, server_default=db.func.current_timestamp())
+    
+    def __repr__(self):
+        return f'<JobPostingArchive {self.title}>'
+
+
+class ApplicationArchive(db.Model):
+    """Cold storage for applications to archived job postings"""
+    __tablename__ = 'applications_archive'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    job_id = db.Column(db.Integer, nullable=False, index=True)
+    seeker_id = db.Column(db.Integer, nullable=False, index=True)
+    cover_letter = db.Column(db.Text, nullable=True)
+    application_date = db.Column(db.DateTime, nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    archived_at = db.Column(db.DateTime, nullable=False, server_default=db.func.current_timestamp())
+    
+    def __repr__(self):
+        return f'<ApplicationArchive Job:{self.job_id} Seeker:{self.seeker_id}>'
+
+
+class ApplicationFitScore(db.Model):
+    """Cached job-fit score of one application, keyed by a hash of its inputs"""
+    __tablename__ = 'application_fit_scores'
+    
+    application_id = db.Column(db.Integer, db.ForeignKey('applications.id', ondelete='CASCADE'), primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job_postings.id', ondelete='CASCADE'), nullable=False)
+    score = db.Column(db.Float, nullable=False)
+    input_hash = db.Column(db.String(40), nullable=False)  # sha1 of job text, bio, cover letter and model
+    model_version = db.Column(db.String(16))  # fingerprint of the TF-IDF fit the score was computed with
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Ranking one posting's applicants reads this index in score order
+    __table_args__ = (db.Index('ix_application_fit_scores_job_score', 'job_id', 'score'),)
+    
+    def __repr__(self):
+        return f'<ApplicationFitScore Application:{self.application_id} {self.score:.3f}>'
+
+
+class JobMinHash(db.Model):
+    """MinHash signature of a posting's title and description"""
+    __tablename__ = 'job_minhashes'
+    
+    job_id = db.Column(db.Integer, db.ForeignKey('job_postings.id', ondelete='CASCADE'), primary_key=True)
+    signature = db.Column(db.Text, nullable=False)  # comma-separated permutation minimums
+    
+    def __repr__(self):
+        return f'<JobMinHash Job:{self.job_id}>'
+
+
+class JobLshBand(db.Model):
+    """One LSH band bucket of a posting, scoped to its employer"""
+    __tablename__ = 'job_lsh_bands'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job_postings.id', ondelete='CASCADE'), nullable=False, index=True)
+    employer_id = db.Column(db.Integer, nullable=False)
+    bucket = db.Column(db.String(20), nullable=False)  # "<band>-<crc32 of the band's rows>"
+    
+    # Duplicate candidates are the employer's postings sharing any bucket
+    __table_args__ = (db.Index('ix_job_lsh_bands_employer_bucket', 'employer_id', 'bucket'),)
+    
+    def __repr__(self):
+        return f'<JobLshBand Job:{self.job_id} {self.bucket}>'
+
+
+class SeekerRecommendation(db.Model):
+    """Precomputed top-N job recommendations for one seeker"""
+    __tablename__ = 'seeker_recommendations'
+    
+    seeker_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    items = db.Column(db.Text, nullable=False, default='[]')  # JSON [[job_id, score], ...], best first
+    profile = db.Column(db.Text, nullable=True)  # JSON {term: weight} the list was scored against
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f'<SeekerRecommendation Seeker:{self.seeker_id}>'
+
+class DailyStat(db.Model):
+    """Per-day activity count for the admin analytics (UTC days), filled in by app.analytics"""
+    __tablename__ = 'daily_stats'
+    
+    day = db.Column(db.Date, primary_key=True)
+    metric = db.Column(db.String(20), primary_key=True)      # 'signups', 'postings', 'applications'
+    dimension = db.Column(db.String(20), primary_key=True, default='')  # role / application status / ''
+    count = db.Column(db.Integer, nullable=False, default=0)
+    
+    __table_args__ = (db.Index('ix_daily_stats_metric_day', 'metric', 'day'),)
+    
+    def __repr__(self):
+        return f'<DailyStat {self.day} {self.metric}:{self.dimension}={self.count}>'
+
+class AuditLog(db.Model):
+    """Append-only trail of admin and user-management actions, written in batches by app.audit"""
+    __tablename__ = 'audit_log'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    actor_id = db.Column(db.Integer, nullable=True)  # user who acted; kept if that user is deleted
+    action = db.Column(db.String(50), nullable=False)
+    target_type = db.Column(db.String(20), nullable=True)
+    target_id = db.Column(db.Integer, nullable=True)
+    summary = db.Column(db.String(255), nullable=False)
+    details = db.Column(db.Text, nullable=True)  # JSON
+    ip_address = db.Column(db.String(45), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    
+    __table_args__ = (db.Index('ix_audit_log_actor_created_at', 'actor_id', 'created_at'),)
+    
+    def __repr__(self):
+        return f'<AuditLog {self.action} by {self.actor_id}>'
+
+
+@db.event.listens_for(AuditLog, 'before_update')
+@db.event.listens_for(AuditLog, 'before_delete')
+def _audit_log_is_append_only(mapper, connection, target):
+    raise ValueError('Audit log entries cannot be changed or deleted')
+
+class SavedSearch(db.Model):
+    """A seeker's stored job search, matched against new postings by app.alerts"""
+    __tablename__ = 'saved_searches'
+
+    id = db.Column(db.Integer, primary_key=True)
+    seeker_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    name = db.Column(db.String(100), nullable=False)
+    keywords = db.Column(db.String(200), nullable=True)
+    location = db.Column(db.String(100), nullable=True)
+    job_type = db.Column(db.String(20), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f'<SavedSearch {self.name} Seeker:{self.seeker_id}>'
+
+class SavedSearchMatch(db.Model):
+    """A new posting matching a saved search; notified_at stays empty until it goes out in a digest"""
+    __tablename__ = 'saved_search_matches'
+
+    id = db.Column(db.Integer, primary_key=True)
+    saved_search_id = db.Column(db.Integer, db.ForeignKey('saved_searches.id', ondelete='CASCADE'), nullable=False)
+    job_id = db.Column(db.Integer, db.ForeignKey('job_postings.id', ondelete='CASCADE'), nullable=False, index=True)
+    matched_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    notified_at = db.Column(db.DateTime, nullable=True, index=True)
+
+    __table_args__ = (db.UniqueConstraint('saved_search_id', 'job_id', name='unique_saved_search_job'),)
+
+    def __repr__(self):
+        return f'<SavedSearchMatch Search:{self.saved_search_id} Job:{self.job_id}>'
+
+class QueuedTask(db.Model):
+    """Deferred unit of work in the persistent task queue run by app.tasks workers"""
+    __tablename__ = 'task_queue'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.Text, nullable=False, default='{}')  # JSON keyword arguments
+    status = db.Column(db.String(10), nullable=False, default='queued')  # 'queued', 'running', 'done', 'failed'
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=3)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = db.Column(db.String(100), nullable=True)
+    locked_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    # Workers claim the oldest due task with one indexed lookup
+    __table_args__ = (db.Index('ix_task_queue_status_run_at', 'status', 'run_at'),)
+
+    def __repr__(self):
+        return f'<QueuedTask {self.name} {self.status}>'
+
+class TaskSchedule(db.Model):
+    """Next due time of a periodic task, shared by every process running the scheduler"""
+    __tablename__ = 'task_schedules'
+
+    name = db.Column(db.String(100), primary_key=True)
+    next_run_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f'<TaskSchedule {self.name} at {self.next_run_at}>'
+
 # Helper function to create all tables
 def create_tables(app):
     """Create all database tables"""
     with app.app_context():
         db.create_all()
-        print("All database tables created successfully!")
+        logger.info("All database tables created successfully!")
 
 # Helper function to drop all tables (for development/testing)
 def drop_tables(app):
     """Drop all database tables"""
     with app.app_context():
         db.drop_all()
-        print("All database tables dropped!")
\ No newline at end of file
+        logger.info("All database tables dropped!")
\ No newline at end of file
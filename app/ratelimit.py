@@ -0,0 +1,262 @@
+"""
+Token-bucket rate limiting per client, user and endpoint
+"""
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from flask import request, session
+
+from app.background import PeriodicTask
+from app.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMITED = registry.counter(
+    'jobboard_rate_limited_total', 'Requests rejected with 429 by the rate limiter', ('endpoint', 'scope'))
+
+# endpoint -> [(scope, rate[, methods])]; scope is 'ip', 'user' (falls back to ip) or
+# 'endpoint' (one bucket shared by everyone); methods restricts a rule, e.g. to form posts
+DEFAULT_RATE_LIMITS = {
+    'main.login': [('ip', '10/minute', 'POST')],
+    'main.register': [('ip', '5/minute', 'POST')],
+    'main.search': [('ip', '30/minute'), ('endpoint', '300/minute')],
+    'main.search_suggest': [('ip', '120/minute')],
+    'main.apply_job': [('user', '20/minute')],
+}
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+# Buckets kept by the in-memory store before the least recently used are dropped
+MEMORY_STORE_MAX_KEYS = 100000
+
+Limit = namedtuple('Limit', 'scope capacity refill_per_second methods')
+
+
+def parse_rate(rate):
+    """'10/minute' -> (capacity 10, refill rate in tokens per second)"""
+    count, _, period = rate.partition('/')
+    count = int(count)
+    seconds = PERIODS[period.strip().rstrip('s')]
+    if count <= 0:
+        raise ValueError(f'Rate must be positive: {rate}')
+    return count, count / seconds
+
+
+def refill(tokens, updated, capacity, refill_per_second, now, cost=1):
+    """Token-bucket step: returns (allowed, tokens left, seconds until `cost` tokens are available)"""
+    if tokens is None:
+        tokens = capacity
+    else:
+        tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+    if tokens >= cost:
+        return True, tokens - cost, 0.0
+    return False, tokens, (cost - tokens) / refill_per_second
+
+
+def take_all(states, buckets, now):
+    """Check every (key, capacity, refill_per_second) bucket, spending tokens only if all of them allow it
+
+    states maps key -> (tokens, updated) for the buckets seen before. Returns
+    (index of the first bucket that rejects or None, seconds to wait, new
+    states to store); nothing is stored on a rejection.
+    """
+    updates = {}
+    for index, (key, capacity, refill_per_second) in enumerate(buckets):
+        tokens, updated = updates.get(key) or states.get(key) or (None, now)
+        allowed, tokens, retry_after = refill(tokens, updated, capacity, refill_per_second, now)
+        if not allowed:
+            return index, retry_after, {}
+        updates[key] = (tokens, now)
+    return None, 0.0, updates
+
+
+class MemoryStore:
+    """Buckets in a bounded LRU dict; limits are per process"""
+
+    def __init__(self, max_keys=MEMORY_STORE_MAX_KEYS):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()   # key -> (tokens, updated)
+
+    def take_many(self, buckets, now=None):
+        """Spend a token from each (key, capacity, refill_per_second) bucket, or from none; see take_all"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            rejected, retry_after, updates = take_all(
+                {key: self._buckets[key] for key, _capacity, _rate in buckets if key in self._buckets}, buckets, now)
+            for key, state in updates.items():
+                self._buckets[key] = state
+                self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return rejected, retry_after
+
+    def take(self, key, capacity, refill_per_second, now=None):
+        rejected, retry_after = self.take_many([(key, capacity, refill_per_second)], now)
+        return rejected is None, retry_after
+
+
+class SQLiteStore:
+    """Buckets in a small SQLite file shared by every worker on the host"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS rate_limit_buckets ('
+                'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)'
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit mode so BEGIN IMMEDIATE below controls the transaction
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None, check_same_thread=False)
+            self._local.conn = conn
+        return conn
+
+    def take_many(self, buckets, now=None):
+        """Spend a token from each (key, capacity, refill_per_second) bucket, or from none; see take_all"""
+        # Wall-clock time, since workers don't share a monotonic clock
+        now = time.time() if now is None else now
+        keys = [key for key, _capacity, _rate in buckets]
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = conn.execute(
+                f'SELECT key, tokens, updated FROM rate_limit_buckets WHERE key IN ({", ".join("?" * len(keys))})',
+                keys
+            ).fetchall()
+            rejected, retry_after, updates = take_all({key: (tokens, updated) for key, tokens, updated in rows},
+                                                      buckets, now)
+            conn.executemany(
+                'INSERT INTO rate_limit_buckets (key, tokens, updated) VALUES (?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated',
+                [(key, tokens, updated) for key, (tokens, updated) in updates.items()]
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return rejected, retry_after
+
+    def take(self, key, capacity, refill_per_second, now=None):
+        rejected, retry_after = self.take_many([(key, capacity, refill_per_second)], now)
+        return rejected is None, retry_after
+
+    def purge(self, older_than_seconds=86400, now=None):
+        """Drop buckets idle long enough to be full again"""
+        now = time.time() if now is None else now
+        conn = self._connect()
+        removed = conn.execute('DELETE FROM rate_limit_buckets WHERE updated < ?',
+                               (now - older_than_seconds,)).rowcount
+        if removed:
+            logger.info("Idle rate limit buckets purged", extra={'buckets': removed})
+        return removed
+
+
+class RateLimiter:
+    """Checks the configured limits for a request's endpoint against a bucket store"""
+
+    def __init__(self, store, limits):
+        self.store = store
+        self.limits = {
+            endpoint: [self._limit(*rule) for rule in rules]
+            for endpoint, rules in limits.items()
+        }
+
+    @staticmethod
+    def _limit(scope, rate, methods=None):
+        if scope not in ('ip', 'user', 'endpoint'):
+            raise ValueError(f'Unknown rate limit scope: {scope}')
+        if isinstance(methods, str):
+            methods = (methods,)
+        return Limit(scope, *parse_rate(rate), methods=frozenset(m.upper() for m in methods) if methods else None)
+
+    def _bucket_key(self, endpoint, limit, client_ip, user_id):
+        if limit.scope == 'endpoint':
+            return f'{endpoint}|endpoint'
+        if limit.scope == 'user' and user_id is not None:
+            return f'{endpoint}|user:{user_id}'
+        return f'{endpoint}|ip:{client_ip}'
+
+    def check(self, endpoint, client_ip, user_id=None, method='GET'):
+        """Return (None, 0) when allowed, else (exceeded scope, seconds to wait)
+
+        All of the endpoint's buckets are checked together, so a request
+        rejected by one rule spends no tokens from the others.
+        """
+        limits = [limit for limit in self.limits.get(endpoint, ())
+                  if not limit.methods or method in limit.methods]
+        if not limits:
+            return None, 0
+        rejected, retry_after = self.store.take_many([
+            (self._bucket_key(endpoint, limit, client_ip, user_id), limit.capacity, limit.refill_per_second)
+            for limit in limits
+        ])
+        if rejected is None:
+            return None, 0
+        return limits[rejected].scope, retry_after
+
+
+def _make_store(app):
+    storage = app.config['RATELIMIT_STORAGE']
+    if storage == 'memory':
+        return MemoryStore()
+    if storage.startswith('sqlite:///'):
+        path = storage[len('sqlite:///'):] or os.path.join(app.instance_path, 'ratelimit.db')
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        return SQLiteStore(path)
+    raise ValueError(f'Unsupported RATELIMIT_STORAGE: {storage}')
+
+
+def init_rate_limiting(app):
+    """Shed over-limit requests with 429 before they reach a view (off under TESTING)
+
+    A shared SQLite store is purged of idle buckets every
+    RATELIMIT_PURGE_INTERVAL seconds by the server process.
+    """
+    app.config.setdefault('RATELIMIT_ENABLED', not app.testing)
+    app.config.setdefault('RATELIMIT_STORAGE', 'memory')
+    app.config.setdefault('RATE_LIMITS', DEFAULT_RATE_LIMITS)
+    app.config.setdefault('RATELIMIT_PURGE_INTERVAL', 3600)
+    app.config.setdefault('RATELIMIT_PURGE_AFTER', 86400)
+    if not app.config['RATELIMIT_ENABLED']:
+        return
+
+    limiter = RateLimiter(_make_store(app), app.config['RATE_LIMITS'])
+    app.extensions['rate_limiter'] = limiter
+
+    if app.config['BACKGROUND_SERVICES'] and hasattr(limiter.store, 'purge'):
+        purger = PeriodicTask(app, 'ratelimit-purge', app.config['RATELIMIT_PURGE_INTERVAL'],
+                              lambda: limiter.store.purge(app.config['RATELIMIT_PURGE_AFTER']))
+        app.extensions['ratelimit_purger'] = purger
+        purger.start()
+
+    @app.before_request
+    def enforce_rate_limits():
+        endpoint = request.endpoint
+        if endpoint not in limiter.limits:
+            return None
+        try:
+            scope, retry_after = limiter.check(endpoint, request.remote_addr, session.get('user_id'), request.method)
+        except Exception as e:
+            # A locked or broken shared store must not take the site down: fail open
+            logger.warning("Rate limit check failed: %s", e)
+            return None
+        if scope is None:
+            return None
+
+        RATE_LIMITED.inc(endpoint=endpoint, scope=scope)
+        logger.info("Rate limited", extra={'endpoint': endpoint, 'scope': scope})
+        response = app.response_class('Too many requests. Please slow down and try again shortly.\n',
+                                      status=429, mimetype='text/plain')
+        response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+        return response
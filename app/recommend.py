@@ -0,0 +1,453 @@
+"""
+Content-based job recommendations for seekers from TF-IDF vectors
+"""
+import hashlib
+import heapq
+import json
+import logging
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from sqlalchemy import exists
+
+try:
+    import numpy
+    from scipy import sparse
+except ImportError:  # NumPy/SciPy are optional; scoring falls back to an inverted index
+    numpy = None
+    sparse = None
+
+from app.signals import jobs_posted, jobs_deactivated
+from app.tasks import task, enqueue
+
+logger = logging.getLogger(__name__)
+
+# Recommendations stored per seeker
+TOP_N = 10
+
+# Seeker profile vectors keep only their heaviest terms
+PROFILE_TERMS = 64
+
+STOP_WORDS = frozenset("""
+a about above after all also an and any are as at be been but by can could do does for from has have
+how if in into is it its may more most must no not of on or our out over per so such than that the
+their them then there these they this those to under up us was we were what when where which while
+who will with within without would you your
+""".split())
+
+_TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*')
+
+
+def tokenize(text):
+    """Lowercased word tokens with stop words and single letters removed"""
+    if not text:
+        return []
+    return [token for token in _TOKEN_RE.findall(text.casefold())
+            if len(token) > 1 and token not in STOP_WORDS]
+
+
+def job_tokens(title, description, location, place_id=None):
+    """Tokens describing a posting; the title counts twice"""
+    tokens = tokenize(title) * 2 + tokenize(description) + tokenize(location)
+    if place_id:
+        tokens.append(f'place:{place_id}')
+    return tokens
+
+
+def seeker_tokens(bio, location, place_id=None, history=()):
+    """Tokens describing a seeker from their profile and (title, description) of jobs applied to"""
+    tokens = tokenize(bio) + tokenize(location)
+    if place_id:
+        tokens.append(f'place:{place_id}')
+    for title, description in history:
+        tokens += tokenize(title) * 2 + tokenize(description)
+    return tokens
+
+
+class TfidfModel:
+    """Inverse document frequencies fitted over the active postings
+
+    fingerprint identifies the fitted weights, so scores computed with
+    different fits can be told apart.
+    """
+
+    def __init__(self):
+        self.idf = {}
+        self._unseen_idf = 1.0
+        self.fingerprint = ''
+
+    def fit(self, documents):
+        document_frequency = Counter()
+        count = 0
+        for tokens in documents:
+            document_frequency.update(set(tokens))
+            count += 1
+        self.idf = {term: math.log((1 + count) / (1 + df)) + 1 for term, df in document_frequency.items()}
+        # Terms first seen after fitting (folded-in postings) weigh as if they were rarest
+        self._unseen_idf = math.log(1 + count) + 1
+        self.fingerprint = hashlib.sha1(
+            json.dumps([count, sorted(document_frequency.items())]).encode('utf-8')
+        ).hexdigest()[:16]
+
+    def vector(self, tokens, max_terms=None):
+        """L2-normalized {term: weight} with sublinear term frequency"""
+        weights = {
+            term: (1 + math.log(count)) * self.idf.get(term, self._unseen_idf)
+            for term, count in Counter(tokens).items()
+        }
+        if max_terms and len(weights) > max_terms:
+            weights = dict(heapq.nlargest(max_terms, weights.items(), key=lambda item: item[1]))
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        if not norm:
+            return {}
+        return {term: weight / norm for term, weight in weights.items()}
+
+
+def _dot(left, right):
+    if len(left) > len(right):
+        left, right = right, left
+    return sum(weight * right.get(term, 0.0) for term, weight in left.items())
+
+
+class Recommender:
+    """Job vectors plus an inverted index of stored seeker profiles
+
+    Batch scoring multiplies a block of seeker vectors against the job-term
+    matrix (a SciPy sparse product when available). New postings are folded
+    in with the fitted IDF weights and matched against stored profiles, so
+    only seekers whose lists the posting beats are rewritten.
+    """
+
+    def __init__(self, top_n=TOP_N):
+        self.top_n = top_n
+        self.model = TfidfModel()
+        self._lock = threading.Lock()
+        self._job_vectors = {}                         # job_id -> {term: weight}
+        self._matrix = None                            # cached (job_ids, term_columns, csr)
+        self._profiles = {}                            # seeker_id -> {term: weight}
+        self._profile_postings = defaultdict(dict)     # term -> {seeker_id: weight}
+        self._floors = {}                              # seeker_id -> lowest stored score
+
+    def __len__(self):
+        return len(self._job_vectors)
+
+    def fit(self, rows):
+        """Refit IDF and job vectors from (id, title, description, location, place_id) rows"""
+        rows = list(rows)
+        documents = [job_tokens(title, description, location, place_id)
+                     for _id, title, description, location, place_id in rows]
+        model = TfidfModel()
+        model.fit(documents)
+        vectors = {row[0]: model.vector(tokens) for row, tokens in zip(rows, documents)}
+        with self._lock:
+            self.model = model
+            self._job_vectors = vectors
+            self._matrix = None
+
+    def add_job(self, job_id, title, description, location, place_id=None):
+        """Fold one posting in without refitting; returns its vector"""
+        vector = self.model.vector(job_tokens(title, description, location, place_id))
+        with self._lock:
+            self._job_vectors[job_id] = vector
+            self._matrix = None
+        return vector
+
+    def remove_job(self, job_id):
+        with self._lock:
+            if self._job_vectors.pop(job_id, None) is not None:
+                self._matrix = None
+
+    def profile_vector(self, tokens):
+        return self.model.vector(tokens, max_terms=PROFILE_TERMS)
+
+    def set_profile(self, seeker_id, vector, floor):
+        """Remember a seeker's profile and the score a new posting must beat"""
+        with self._lock:
+            for term in self._profiles.pop(seeker_id, {}):
+                self._profile_postings[term].pop(seeker_id, None)
+            self._profiles[seeker_id] = vector
+            self._floors[seeker_id] = floor
+            for term, weight in vector.items():
+                self._profile_postings[term][seeker_id] = weight
+
+    def match_job(self, vector):
+        """[(seeker_id, score)] for stored profiles whose lists this posting improves"""
+        scores = defaultdict(float)
+        with self._lock:
+            for term, weight in vector.items():
+                for seeker_id, profile_weight in self._profile_postings.get(term, {}).items():
+                    scores[seeker_id] += weight * profile_weight
+            floors = dict(self._floors)
+        return [(seeker_id, score) for seeker_id, score in scores.items() if score > floors.get(seeker_id, 0.0)]
+
+    def _job_matrix(self):
+        with self._lock:
+            if self._matrix is None:
+                job_ids = list(self._job_vectors)
+                columns = {}
+                data, indices, indptr = [], [], [0]
+                for job_id in job_ids:
+                    for term, weight in self._job_vectors[job_id].items():
+                        indices.append(columns.setdefault(term, len(columns)))
+                        data.append(weight)
+                    indptr.append(len(indices))
+                matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(job_ids), max(len(columns), 1)))
+                self._matrix = (job_ids, columns, matrix)
+            return self._matrix
+
+    def score(self, profiles, exclude=None):
+        """Top-N (job_id, score) lists for a batch of {seeker_id: vector} profiles"""
+        exclude = exclude or {}
+        if sparse is not None:
+            return self._score_sparse(profiles, exclude)
+
+        with self._lock:
+            postings = defaultdict(dict)
+            for job_id, vector in self._job_vectors.items():
+                for term, weight in vector.items():
+                    postings[term][job_id] = weight
+        results = {}
+        for seeker_id, vector in profiles.items():
+            scores = defaultdict(float)
+            for term, weight in vector.items():
+                for job_id, job_weight in postings.get(term, {}).items():
+                    scores[job_id] += weight * job_weight
+            skip = exclude.get(seeker_id, ())
+            results[seeker_id] = heapq.nlargest(
+                self.top_n, ((job_id, score) for job_id, score in scores.items() if job_id not in skip),
+                key=lambda item: item[1]
+            )
+        return results
+
+    def _score_sparse(self, profiles, exclude):
+        job_ids, columns, matrix = self._job_matrix()
+        seeker_ids = list(profiles)
+        data, indices, indptr = [], [], [0]
+        for seeker_id in seeker_ids:
+            for term, weight in profiles[seeker_id].items():
+                column = columns.get(term)
+                if column is not None:
+                    indices.append(column)
+                    data.append(weight)
+            indptr.append(len(indices))
+        queries = sparse.csr_matrix((data, indices, indptr), shape=(len(seeker_ids), matrix.shape[1]))
+        similarities = (queries @ matrix.T).tocsr()
+
+        results = {}
+        for row, seeker_id in enumerate(seeker_ids):
+            start, end = similarities.indptr[row], similarities.indptr[row + 1]
+            row_jobs = similarities.indices[start:end]
+            row_scores = similarities.data[start:end]
+            skip = exclude.get(seeker_id, ())
+            # Over-select so excluded (already applied) jobs can be dropped afterwards
+            keep = min(len(row_scores), self.top_n + len(skip))
+            if keep < len(row_scores):
+                top = numpy.argpartition(-row_scores, keep - 1)[:keep]
+            else:
+                top = numpy.arange(len(row_scores))
+            ranked = sorted(((job_ids[row_jobs[i]], float(row_scores[i])) for i in top),
+                            key=lambda item: item[1], reverse=True)
+            results[seeker_id] = [item for item in ranked if item[0] not in skip][:self.top_n]
+        return results
+
+
+# Process-wide recommender, fitted on startup and kept current through signals
+recommender = Recommender()
+
+
+def _floor(items):
+    return items[-1][1] if len(items) >= recommender.top_n else 0.0
+
+
+def _seeker_profiles(seekers):
+    """({seeker_id: vector}, {seeker_id: applied job ids}) for (id, bio, location, place_id) rows"""
+    from app.models import db, Application, JobPosting
+
+    seeker_ids = [seeker.id for seeker in seekers]
+    history = defaultdict(list)
+    applied = defaultdict(set)
+    if seeker_ids:
+        rows = db.session.query(
+            Application.seeker_id, JobPosting.id, JobPosting.title, JobPosting.description
+        ).join(JobPosting, Application.job_id == JobPosting.id).filter(
+            Application.seeker_id.in_(seeker_ids)
+        ).all()
+        for seeker_id, job_id, title, description in rows:
+            history[seeker_id].append((title, description))
+            applied[seeker_id].add(job_id)
+
+    profiles = {
+        seeker.id: recommender.profile_vector(
+            seeker_tokens(seeker.bio, seeker.location, seeker.location_place_id, history[seeker.id])
+        )
+        for seeker in seekers
+    }
+    return profiles, applied
+
+
+def _store(profiles, results):
+    """Replace stored recommendation rows for a batch of seekers"""
+    from app.models import db, SeekerRecommendation
+
+    now = datetime.utcnow()
+    db.session.query(SeekerRecommendation).filter(
+        SeekerRecommendation.seeker_id.in_(list(profiles))
+    ).delete(synchronize_session=False)
+    db.session.add_all([
+        SeekerRecommendation(
+            seeker_id=seeker_id,
+            items=json.dumps([[job_id, round(score, 6)] for job_id, score in results.get(seeker_id, [])]),
+            profile=json.dumps(vector),
+            computed_at=now
+        )
+        for seeker_id, vector in profiles.items()
+    ])
+    db.session.commit()
+    for seeker_id, vector in profiles.items():
+        recommender.set_profile(seeker_id, vector, _floor(results.get(seeker_id, [])))
+
+
+def fit_active_jobs():
+    """Refit the recommender over all active postings"""
+    from app.models import db, JobPosting
+
+    rows = db.session.query(
+        JobPosting.id, JobPosting.title, JobPosting.description,
+        JobPosting.location, JobPosting.location_place_id
+    ).filter(JobPosting.is_active == True).all()
+    recommender.fit(rows)
+    return len(rows)
+
+
+def rebuild_recommendations(batch_size=500):
+    """Refit and precompute top-N lists for every active seeker; returns seekers processed"""
+    from app.models import db, User
+
+    fit_active_jobs()
+    last_id = 0
+    processed = 0
+    while True:
+        seekers = db.session.query(
+            User.id, User.bio, User.location, User.location_place_id
+        ).filter(
+            User.id > last_id, User.role == 'seeker', User.is_active == True
+        ).order_by(User.id).limit(batch_size).all()
+        if not seekers:
+            break
+        profiles, applied = _seeker_profiles(seekers)
+        _store(profiles, recommender.score(profiles, exclude=applied))
+        last_id = seekers[-1].id
+        processed += len(seekers)
+    return processed
+
+
+def recommended_jobs(user, limit=TOP_N):
+    """Active postings recommended for a seeker, best first
+
+    Reads the precomputed list with a primary-key lookup, skipping postings
+    that have closed or that the seeker has applied to since it was stored.
+    A seeker without one (e.g. registered since the last batch run) is
+    scored on demand and storing the list is queued, so the page never writes.
+    """
+    from app.models import db, Application, JobPosting, SeekerRecommendation
+
+    stored = db.session.get(SeekerRecommendation, user.id)
+    if stored is None:
+        profiles, applied = _seeker_profiles([user])
+        items = recommender.score(profiles, exclude=applied).get(user.id, [])
+        try:
+            enqueue('recommendations.refresh_seeker', seeker_id=user.id)
+        except Exception as e:
+            db.session.rollback()
+            logger.exception("Queueing recommendations for seeker %s failed: %s", user.id, e)
+    else:
+        items = json.loads(stored.items)
+
+    job_ids = [job_id for job_id, _score in items]
+    if not job_ids:
+        return []
+    not_applied = ~exists().where(Application.job_id == JobPosting.id, Application.seeker_id == user.id)
+    jobs = {job.id: job for job in JobPosting.query.filter(
+        JobPosting.id.in_(job_ids), JobPosting.is_active == True, not_applied
+    )}
+    return [jobs[job_id] for job_id in job_ids if job_id in jobs][:limit]
+
+
+@task('recommendations.refresh_seeker')
+def refresh_seeker_recommendations(seeker_id):
+    """Score one seeker against the current postings and store their list"""
+    from app.models import db, User
+
+    seekers = db.session.query(
+        User.id, User.bio, User.location, User.location_place_id
+    ).filter(User.id == seeker_id).all()
+    if not seekers:
+        return 0
+    profiles, applied = _seeker_profiles(seekers)
+    _store(profiles, recommender.score(profiles, exclude=applied))
+    return len(seekers)
+
+
+@task('recommendations.fold_in_jobs')
+def fold_in_jobs(job_ids):
+    """Add a batch of new postings to the stored lists they improve, in one transaction; returns seekers updated"""
+    from app.models import db, JobPosting, SeekerRecommendation
+
+    matches = defaultdict(dict)  # seeker_id -> {job_id: score}
+    for job in JobPosting.query.filter(JobPosting.id.in_(job_ids), JobPosting.is_active == True):
+        # Re-adding is cheap and covers a worker process that was fitted before the posting existed
+        vector = recommender.add_job(job.id, job.title, job.description, job.location, job.location_place_id)
+        for seeker_id, score in recommender.match_job(vector):
+            matches[seeker_id][job.id] = score
+    if not matches:
+        return 0
+
+    for stored in SeekerRecommendation.query.filter(SeekerRecommendation.seeker_id.in_(list(matches))):
+        new_items = matches[stored.seeker_id]
+        items = [item for item in json.loads(stored.items) if item[0] not in new_items]
+        items += [[job_id, round(score, 6)] for job_id, score in new_items.items()]
+        items = sorted(items, key=lambda item: item[1], reverse=True)[:recommender.top_n]
+        stored.items = json.dumps(items)
+        recommender.set_profile(stored.seeker_id, json.loads(stored.profile or '{}'), _floor(items))
+    db.session.commit()
+    return len(matches)
+
+
+def _on_jobs_posted(sender, jobs=(), **extra):
+    jobs = [job for job in jobs if job.is_active]
+    if not jobs:
+        return
+    # Vectors go in right away for on-demand scoring; updating stored lists is queued
+    for job in jobs:
+        recommender.add_job(job.id, job.title, job.description, job.location, job.location_place_id)
+    try:
+        enqueue('recommendations.fold_in_jobs', job_ids=[job.id for job in jobs])
+    except Exception as e:
+        logger.exception("Queueing recommendation updates for %s jobs failed: %s", len(jobs), e)
+
+
+def _on_jobs_deactivated(sender, job_ids=(), **extra):
+    # Stored lists are filtered to active postings when read, so only the vectors go
+    for job_id in job_ids:
+        recommender.remove_job(job_id)
+
+
+def init_recommendations(app):
+    """Fit job vectors, load stored seeker profiles and subscribe to updates"""
+    from app.models import db, SeekerRecommendation
+
+    recommender.top_n = app.config.setdefault('RECOMMENDATIONS_TOP_N', TOP_N)
+    with app.app_context():
+        jobs = fit_active_jobs()
+        stored = db.session.query(
+            SeekerRecommendation.seeker_id, SeekerRecommendation.items, SeekerRecommendation.profile
+        ).all()
+        for seeker_id, items, profile in stored:
+            recommender.set_profile(seeker_id, json.loads(profile or '{}'), _floor(json.loads(items)))
+    logger.info("Recommender fitted", extra={'jobs': jobs, 'seekers': len(stored)})
+
+    jobs_posted.connect(_on_jobs_posted, weak=False)
+    jobs_deactivated.connect(_on_jobs_deactivated, weak=False)
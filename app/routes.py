@@ -1,12 +1,42 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify, current_app
 from app.models import db, User, JobPosting, Application
+from app.metrics import health_snapshot
+from app.search_index import suggestion_index
+from app.facets import facet_index, salary_bucket_condition, salary_at_least, salary_at_most
+from app.geo import gazetteer
+from app.recommend import recommended_jobs
+from app.dedup import minhash, find_duplicates, index_job
+from app.lifecycle import default_expiry, bulk_job_action, BULK_ACTIONS
+from app.job_import import validate_job, import_jobs, detect_format
+from app.applications import (update_application_status, status_counts, apply_to_job,
+                              APPLICATION_STATUSES, APPLIED, DUPLICATE)
+from app.activity import activity_tracker
+from app.cache import query_cache
+from app.analytics import period_totals, daily_series
+from app.audit import audit, recent_activity
+from app.backup import last_backup_label
+from app.alerts import save_search, delete_search, saved_searches_for
+from app.signals import jobs_posted
+from app.tasks import enqueue
 from werkzeug.security import check_password_hash
-from datetime import datetime
+from markupsafe import Markup, escape
+from datetime import date, datetime, timedelta
 import json
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
 
 # Create a blueprint for main routes
 main = Blueprint('main', __name__)
 
+# Radius search bounds for /jobs?near=...&radius_km=...
+DEFAULT_RADIUS_KM = 50.0
+MAX_RADIUS_KM = 500.0
+
+# Longest per-day series the reports page renders
+MAX_ANALYTICS_DAYS = 366
+
 def redirect_to_user_dashboard(user_role):
     """Helper function to redirect users to appropriate dashboard based on role"""
     try:
@@ -54,11 +84,82 @@ def jobs():
     page = request.args.get('page', 1, type=int)
     per_page = 10  # Number of jobs per page
     
-    jobs = JobPosting.query.filter_by(is_active=True)\
-                          .order_by(JobPosting.posted_date.desc())\
-                          .paginate(page=page, per_page=per_page, error_out=False)
+    # Sidebar filters
+    search_term = request.args.get('search', '').strip()
+    location = request.args.get('location', '').strip()
+    job_type = request.args.get('job_type', '').strip()
+    salary = request.args.get('salary', '').strip()
+    min_salary = request.args.get('min_salary', type=int)
+    max_salary = request.args.get('max_salary', type=int)
+    sort = request.args.get('sort', 'recent')
+    near = request.args.get('near', '').strip()
+    radius_km = request.args.get('radius_km', type=float)
+    
+    query = JobPosting.query.filter_by(is_active=True)
+    if search_term:
+        like_term = f"%{search_term}%"
+        query = query.filter(db.or_(
+            JobPosting.title.like(like_term),
+            JobPosting.description.like(like_term),
+            JobPosting.company_name.like(like_term),
+            JobPosting.location.like(like_term)
+        ))
+    if location:
+        # Facet links pass canonical place ids; typed text is resolved the same way
+        place = gazetteer().get(location) or gazetteer().resolve(location)
+        if place is not None:
+            query = query.filter(JobPosting.location_place_id == place.place_id)
+        else:
+            query = query.filter(JobPosting.location.like(f"%{location}%"))
+    if job_type:
+        query = query.filter(JobPosting.job_type == job_type)
+    
+    # Salary filters use the annualized, indexed salary columns in the board's currency;
+    # open-ended ranges match on their one bound
+    board_currency = current_app.config['SALARY_CURRENCY']
+    if salary:
+        query = query.filter(salary_bucket_condition(salary, board_currency))
+    if min_salary is not None:
+        query = query.filter(salary_at_least(min_salary, board_currency))
+    if max_salary is not None:
+        query = query.filter(salary_at_most(max_salary, board_currency))
+    
+    # Radius search around a named place, or around the user's own place by default
+    center = None
+    distances = {}
+    if near:
+        place = gazetteer().resolve(near)
+        if place is not None and place.lat is not None:
+            center = (place.lat, place.lon)
+        else:
+            flash(f'Unknown location "{near}" - showing all locations.', 'warning')
+    elif radius_km:
+        user = get_current_user()
+        if user and user.location_lat is not None:
+            center = (user.location_lat, user.location_lon)
+    if center:
+        radius_km = min(max(radius_km or DEFAULT_RADIUS_KM, 1.0), MAX_RADIUS_KM)
+        distances = JobPosting.distances_within(center[0], center[1], radius_km)
+        query = query.filter(JobPosting.id.in_(list(distances)))
+    
+    # Facet counts come from memory; drill-downs only count the filtered ids
+    if search_term or location or job_type or salary or min_salary is not None or max_salary is not None or center:
+        filtered_ids = [row.id for row in query.with_entities(JobPosting.id)]
+        facets = facet_index.counts(filtered_ids)
+    else:
+        facets = facet_index.counts()
+    
+    if sort == 'salary_desc':
+        ordering = (JobPosting.salary_max.desc().nulls_last(), JobPosting.posted_date.desc())
+    elif sort == 'salary_asc':
+        ordering = (JobPosting.salary_min.asc().nulls_last(), JobPosting.posted_date.desc())
+    else:
+        ordering = (JobPosting.posted_date.desc(),)
+    
+    jobs = query.order_by(*ordering)\
+                .paginate(page=page, per_page=per_page, error_out=False)
     
-    return render_template('jobs.html', jobs=jobs)
+    return render_template('jobs.html', jobs=jobs, facets=facets, distances=distances)
 
 @main.route('/post_job', methods=['GET', 'POST'])
 def post_job():
@@ -74,41 +175,33 @@ def post_job():
         return redirect(url_for('main.jobs'))
     
     if request.method == 'POST':
-        title = request.form.get('title', '').strip()
-        description = request.form.get('description', '').strip()
-        company_name = request.form.get('company_name', '').strip()
-        location = request.form.get('location', '').strip()
-        salary_range = request.form.get('salary_range', '').strip()
-        job_type = request.form.get('job_type', 'full-time')
-        
-        # Basic validation
-        if not title:
-            flash('Job title is required.', 'error')
-            return render_template('post_job.html')
-        
-        if not description:
-            flash('Job description is required.', 'error')
+        fields, error = validate_job(request.form)
+        if error:
+            flash(error, 'error')
             return render_template('post_job.html')
+        title, description = fields['title'], fields['description']
         
-        if len(title) > 200:
-            flash('Job title must be 200 characters or less.', 'error')
-            return render_template('post_job.html')
+        # Offer to refresh a near-identical active posting instead of reposting it
+        signature = minhash(title, description)
+        if request.form.get('confirm_duplicate') != '1':
+            duplicates = find_duplicates(session['user_id'], signature)
+            if duplicates:
+                duplicate, similarity = duplicates[0]
+                flash('This looks like a posting you already have. Refresh it instead of posting a duplicate?', 'warning')
+                return render_template('post_job.html', duplicate=duplicate, similarity=similarity)
         
         try:
             # Create new job posting
-            new_job = JobPosting(
-                title=title,
-                description=description,
-                employer_id=session['user_id'],
-                company_name=company_name if company_name else None,
-                location=location if location else None,
-                salary_range=salary_range if salary_range else None,
-                job_type=job_type
-            )
+            new_job = JobPosting(employer_id=session['user_id'], **fields)
             
             db.session.add(new_job)
+            db.session.flush()
+            index_job(new_job, signature)
             db.session.commit()
             
+            # Keep in-memory indexes current without re-reading the table
+            jobs_posted.send(current_app._get_current_object(), jobs=[new_job])
+            
             flash(f'Job "{title}" posted successfully!', 'success')
             return redirect(url_for('main.jobs'))
             
@@ -119,6 +212,163 @@ def post_job():
     
     return render_template('post_job.html')
 
+@main.route('/jobs/<int:job_id>/refresh', methods=['POST'])
+def refresh_job(job_id):
+    """Bump one of the employer's postings back to the top instead of reposting it"""
+    if not is_logged_in() or session.get('user_role') != 'employer':
+        flash('Only employers can refresh job postings.', 'error')
+        return redirect(url_for('main.login'))
+    
+    job = JobPosting.query.filter_by(id=job_id, employer_id=session['user_id']).first()
+    if not job:
+        flash('Job posting not found.', 'error')
+        return redirect(url_for('main.employer_dashboard'))
+    
+    try:
+        job.posted_date = datetime.utcnow()
+        job.expires_at = default_expiry()
+        job.is_active = True
+        db.session.commit()
+        jobs_posted.send(current_app._get_current_object(), jobs=[job])
+        flash(f'Job "{job.title}" refreshed and moved to the top of the listings.', 'success')
+    except Exception as e:
+        db.session.rollback()
+        flash('An error occurred while refreshing the job. Please try again.', 'error')
+    return redirect(url_for('main.employer_dashboard'))
+
+@main.route('/jobs/import', methods=['GET', 'POST'])
+def import_jobs_upload():
+    """Bulk job import - employers upload a CSV or NDJSON file of postings"""
+    if not is_logged_in():
+        flash('Please log in to import jobs.', 'error')
+        return redirect(url_for('main.login'))
+    
+    if session.get('user_role') != 'employer':
+        flash('Only employers can import jobs.', 'error')
+        return redirect(url_for('main.jobs'))
+    
+    if request.method == 'POST':
+        upload = request.files.get('file')
+        if not upload or not upload.filename:
+            flash('Choose a CSV or NDJSON file to import.', 'error')
+            return render_template('import_jobs.html')
+        
+        try:
+            # The upload is parsed straight off the request stream, row by row
+            fmt = request.form.get('format') or detect_format(upload.filename)
+            report = import_jobs(upload.stream, fmt, session['user_id'])
+        except Exception as e:
+            db.session.rollback()
+            logger.exception("Job import failed: %s", e)
+            flash('An error occurred while importing jobs. Please check the file and try again.', 'error')
+            return render_template('import_jobs.html')
+        
+        if report.imported:
+            flash(f'Imported {report.imported} job posting(s).', 'success')
+        if report.failed:
+            flash(f'{report.failed} row(s) could not be imported.', 'warning')
+        return render_template('import_jobs.html', report=report)
+    
+    return render_template('import_jobs.html')
+
+@main.route('/applications/status', methods=['POST'])
+def update_applications_status():
+    """Bulk application status update for employers (form post or JSON API)
+    
+    Accepts status plus application_ids and/or job_ids, and an optional
+    from_status, e.g. {"job_ids": [12], "from_status": "pending", "status": "rejected"}.
+    """
+    wants_json = request.is_json
+    
+    def respond(message, category, code, updated=0):
+        if wants_json:
+            return jsonify(message=message, updated=updated), code
+        flash(message, category)
+        return redirect(request.referrer or url_for('main.employer_dashboard'))
+    
+    if not is_logged_in() or session.get('user_role') != 'employer':
+        return respond('Only employers can update application status.', 'error', 403)
+    
+    if wants_json:
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return respond('Expected a JSON object.', 'error', 400)
+        application_ids = data.get('application_ids') or []
+        job_ids = data.get('job_ids') or []
+        # A bare string would otherwise be read digit by digit ("12" -> [1, 2])
+        if not isinstance(application_ids, list) or not isinstance(job_ids, list):
+            return respond('application_ids and job_ids must be lists.', 'error', 400)
+    else:
+        data = request.form
+        application_ids = request.form.getlist('application_ids', type=int)
+        job_ids = request.form.getlist('job_ids', type=int)
+    
+    status = data.get('status', '')
+    from_status = data.get('from_status') or None
+    if status not in APPLICATION_STATUSES or (from_status and from_status not in APPLICATION_STATUSES):
+        return respond('Unknown application status.', 'error', 400)
+    try:
+        application_ids = [int(value) for value in application_ids]
+        job_ids = [int(value) for value in job_ids]
+    except (TypeError, ValueError):
+        return respond('Application and job ids must be integers.', 'error', 400)
+    if not application_ids and not job_ids:
+        return respond('Select at least one application or job.', 'warning', 400)
+    
+    try:
+        updated = update_application_status(session['user_id'], status, application_ids=application_ids,
+                                            job_ids=job_ids, from_status=from_status)
+    except Exception as e:
+        db.session.rollback()
+        logger.exception("Application status update failed: %s", e)
+        return respond('An error occurred while updating applications. Please try again.', 'error', 500)
+    
+    return respond(f'{updated} application(s) marked as {status}.', 'success', 200, updated=updated)
+
+@main.route('/jobs/bulk', methods=['POST'])
+def bulk_jobs():
+    """Close, reopen or delete several postings at once (employers: their own; admins: any)"""
+    if not is_logged_in():
+        flash('Please log in to manage job postings.', 'error')
+        return redirect(url_for('main.login'))
+    
+    role = session.get('user_role')
+    if role == 'employer':
+        employer_id = session['user_id']
+        next_url = url_for('main.employer_dashboard')
+    elif role == 'admin':
+        current_user = get_current_user()
+        if not current_user or not current_user.get_permissions().get('manage_jobs', False):
+            flash('Access denied. You do not have permission to manage jobs.', 'error')
+            return redirect(url_for('main.admin_dashboard'))
+        employer_id = None
+        next_url = url_for('main.admin_jobs')
+    else:
+        flash('Access denied.', 'error')
+        return redirect(url_for('main.home'))
+    
+    action = request.form.get('action', '')
+    job_ids = request.form.getlist('job_ids', type=int)
+    if action not in BULK_ACTIONS:
+        flash('Unknown bulk action.', 'error')
+        return redirect(next_url)
+    if not job_ids:
+        flash('Select at least one job posting.', 'warning')
+        return redirect(next_url)
+    
+    try:
+        affected = bulk_job_action(action, job_ids, employer_id=employer_id)
+        past_tense = {'close': 'closed', 'reopen': 'reopened', 'delete': 'deleted'}[action]
+        if role == 'admin' and affected:
+            audit(f'jobs_{action}', f'{past_tense.capitalize()} {len(affected)} job posting(s)',
+                  target_type='job', details={'job_ids': affected})
+        flash(f'{len(affected)} job posting(s) {past_tense}.', 'success')
+    except Exception as e:
+        db.session.rollback()
+        logger.exception("Bulk %s failed: %s", action, e)
+        flash('An error occurred while updating the job postings. Please try again.', 'error')
+    return redirect(next_url)
+
 @main.route('/apply_job/<int:job_id>', methods=['POST'])
 def apply_job(job_id):
     """Job application route - allows seekers to apply for jobs"""
@@ -132,41 +382,26 @@ def apply_job(job_id):
         flash('Only job seekers can apply for jobs. Please register as a job seeker.', 'error')
         return redirect(url_for('main.jobs'))
     
-    # Check if job exists and is active
-    job = JobPosting.query.filter_by(id=job_id, is_active=True).first()
-    if not job:
-        flash('Job not found or no longer active.', 'error')
-        return redirect(url_for('main.jobs'))
-    
-    # Check if user already applied for this job
-    existing_application = Application.query.filter_by(
-        job_id=job_id, 
-        seeker_id=session['user_id']
-    ).first()
-    
-    if existing_application:
-        flash('You have already applied for this job.', 'info')
-        return redirect(url_for('main.jobs'))
-    
     # Get cover letter from form (optional)
     cover_letter = request.form.get('cover_letter', '').strip()
+    idempotency_key = (request.headers.get('Idempotency-Key') or request.form.get('idempotency_key', '')).strip()[:64]
     
     try:
-        # Create new application
-        new_application = Application(
-            job_id=job_id,
-            seeker_id=session['user_id'],
-            cover_letter=cover_letter if cover_letter else None
-        )
-        
-        db.session.add(new_application)
-        db.session.commit()
-        
-        flash(f'Successfully applied for "{job.title}"!', 'success')
-        
+        # Active-job check, duplicate check and insert happen in one statement
+        outcome = apply_to_job(job_id, session['user_id'], cover_letter or None,
+                               idempotency_key=idempotency_key or None)
     except Exception as e:
         db.session.rollback()
+        logger.exception("Application failed: %s", e)
         flash('An error occurred while submitting your application. Please try again.', 'error')
+        return redirect(url_for('main.jobs'))
+    
+    if outcome == APPLIED:
+        flash('Your application has been submitted!', 'success')
+    elif outcome == DUPLICATE:
+        flash('You have already applied for this job.', 'info')
+    else:
+        flash('Job not found or no longer active.', 'error')
     
     return redirect(url_for('main.jobs'))
 
@@ -178,7 +413,6 @@ def login():
         password = request.form.get('password', '').strip()
         remember_me = request.form.get('remember_me') == 'on'
         
-        print(f"Login attempt - Email: {email}, Password length: {len(password) if password else 0}")
         
         # Validate input
         if not email or not password:
@@ -188,12 +422,10 @@ def login():
         try:
             # Find user by email (simplified approach)
             user = User.query.filter_by(email=email).first()
-            print(f"User found: {user is not None}")
             
             if user:
-                print(f"User role: {user.role}")
                 password_match = check_password_hash(user.password, password)
-                print(f"Password match: {password_match}")
+                logger.debug("Login attempt", extra={'user_id': user.id, 'success': password_match})
                 
                 if password_match:
                     # Store user information in session
@@ -206,13 +438,10 @@ def login():
                     if remember_me:
                         session.permanent = True
                     
-                    # Update last login (optional - only if column exists)
-                    try:
-                        user.last_login = datetime.now()
-                        db.session.commit()
-                    except Exception as e:
-                        print(f"Could not update last_login: {e}")
-                        # Continue without updating last_login
+                    # last_login is written behind in a batch, not in this request
+                    activity_tracker.login(user.id)
+                    if user.role == 'admin':
+                        audit('admin_login', 'Signed in', actor_id=user.id)
                     
                     flash(f'Welcome back, {user.username}!', 'success')
                     
@@ -230,7 +459,7 @@ def login():
                             return redirect(url_for('main.home'))
                             
                     except Exception as redirect_error:
-                        print(f"Redirection error: {redirect_error}")
+                        logger.error("Redirection error: %s", redirect_error)
                         # Handle redirection errors
                         flash('Dashboard access error. Redirecting to home page.', 'warning')
                         return redirect(url_for('main.home'))
@@ -238,14 +467,12 @@ def login():
                     flash('Invalid email or password. Please try again.', 'error')
                     return render_template('login.html')
             else:
+                logger.debug("Login attempt", extra={'user_id': None, 'success': False})
                 flash('Invalid email or password. Please try again.', 'error')
                 return render_template('login.html')
                 
         except Exception as e:
-            print(f"Login exception: {e}")
-            print(f"Exception type: {type(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Login exception")
             flash('Login error occurred. Please try again.', 'error')
             return render_template('login.html')
     
@@ -299,6 +526,7 @@ def register():
             new_user = User(username=username, email=email, password=password, role=role)
             db.session.add(new_user)
             db.session.commit()
+            query_cache.invalidate('overview')
             
             # Auto-login after successful registration
             session['user_id'] = new_user.id
@@ -330,6 +558,50 @@ def about():
     """About route - displays information about the job board"""
     return render_template('about.html')
 
+@main.route('/saved_searches', methods=['GET', 'POST'])
+def saved_searches():
+    """Seekers' saved searches - list them, or save the current /jobs filters"""
+    if not is_logged_in():
+        flash('Please log in to save searches.', 'error')
+        return redirect(url_for('main.login'))
+    
+    if session.get('user_role') != 'seeker':
+        flash('Only job seekers can save searches.', 'error')
+        return redirect(url_for('main.jobs'))
+    
+    if request.method == 'POST':
+        try:
+            search = save_search(session['user_id'], request.form.get('name'),
+                                 keywords=request.form.get('search'),
+                                 location=request.form.get('location'),
+                                 job_type=request.form.get('job_type'))
+            flash(f'Search "{search.name}" saved. New matching jobs will be emailed to you in a digest.', 'success')
+        except ValueError as e:
+            flash(str(e), 'error')
+        except Exception as e:
+            db.session.rollback()
+            flash('An error occurred while saving the search. Please try again.', 'error')
+        return redirect(url_for('main.saved_searches'))
+    
+    return render_template('saved_searches.html', searches=saved_searches_for(session['user_id']))
+
+@main.route('/saved_searches/<int:search_id>/delete', methods=['POST'])
+def delete_saved_search(search_id):
+    """Remove one of the seeker's saved searches and stop its alerts"""
+    if not is_logged_in() or session.get('user_role') != 'seeker':
+        flash('Only job seekers can manage saved searches.', 'error')
+        return redirect(url_for('main.login'))
+    
+    try:
+        if delete_search(session['user_id'], search_id):
+            flash('Saved search removed.', 'success')
+        else:
+            flash('Saved search not found.', 'error')
+    except Exception as e:
+        db.session.rollback()
+        flash('An error occurred while removing the search. Please try again.', 'error')
+    return redirect(url_for('main.saved_searches'))
+
 @main.route('/seeker_dashboard')
 def seeker_dashboard():
     """Job seeker dashboard - displays applied jobs and application status"""
@@ -360,8 +632,12 @@ def seeker_dashboard():
         accepted_count = len([app for app in applied_jobs if app.get('status') == 'accepted'])
         rejected_count = len([app for app in applied_jobs if app.get('status') == 'rejected'])
         
+        # Precomputed recommendations, read with a single primary-key lookup
+        recommendations = recommended_jobs(current_user)
+        
         return render_template('seeker_dashboard.html', 
                              applied_jobs=applied_jobs,
+                             recommendations=recommendations,
                              user=current_user,
                              total_applications=total_applications,
                              pending_count=pending_count,
@@ -395,18 +671,22 @@ def employer_dashboard():
     try:
         # Get posted jobs and applications with real data from database
         posted_jobs = current_user.get_posted_jobs()
-        recent_applications = current_user.get_recent_applications()
+        sort = request.args.get('sort', 'recent')
+        job_id = request.args.get('job_id', type=int)
+        recent_applications = current_user.get_recent_applications(sort=sort, job_id=job_id)
         
         # Calculate statistics
         total_jobs = len(posted_jobs)
         active_jobs = len([job for job in posted_jobs if job.get('is_active', True)])
         total_applications = sum(job.get('application_count', 0) for job in posted_jobs)
-        pending_applications = len([app for app in recent_applications if app.get('status') == 'pending'])
+        pending_applications = status_counts(current_user.id)['pending']
         total_views = sum(job.get('view_count', 0) for job in posted_jobs)
         
         return render_template('employer_dashboard.html',
                              posted_jobs=posted_jobs,
                              recent_applications=recent_applications,
+                             sort=sort,
+                             selected_job_id=job_id,
                              user=current_user,
                              total_jobs=total_jobs,
                              active_jobs=active_jobs,
@@ -442,15 +722,18 @@ def admin_dashboard():
         # Get system overview with real data from database
         system_stats = User.get_system_overview()
         
+        # System health comes from the same registry that backs /metrics
+        system_health = health_snapshot(db)
+        system_health.update({
+            'last_backup': last_backup_label(),
+            'active_sessions': activity_tracker.active_count()
+        })
+        
         # Get admin-specific data
         admin_data = {
             'total_admins': User.get_admin_count(),
             'recent_admin_activities': User.get_recent_admin_activities(),
-            'system_health': {
-                'database_status': 'Connected',
-                'last_backup': 'Not configured',
-                'active_sessions': len([u for u in User.get_active_users() if u.get('is_active')])
-            }
+            'system_health': system_health
         }
         
         return render_template('admin.html',
@@ -569,6 +852,8 @@ def create_admin():
             )
             
             if success:
+                audit('create_admin', f'Created admin {username}', target_type='user', target_id=success.id,
+                      details={'permissions': [name for name, granted in permissions.items() if granted]})
                 flash(f'Admin "{username}" created successfully with assigned permissions!', 'success')
                 return redirect(url_for('main.admin_dashboard'))
             else:
@@ -618,6 +903,107 @@ def manage_users():
         flash('Error loading user data. Please try again.', 'error')
         return redirect(url_for('main.admin_dashboard'))
 
+@main.route('/admin/jobs')
+def admin_jobs():
+    """Manage jobs - list postings for bulk close/reopen/delete"""
+    if not is_logged_in():
+        flash('Please log in to access job management.', 'error')
+        return redirect(url_for('main.login'))
+    
+    if session.get('user_role') != 'admin':
+        flash('Access denied. Admin privileges required.', 'error')
+        return redirect(url_for('main.home'))
+    
+    current_user = get_current_user()
+    if not current_user:
+        flash('User session expired. Please log in again.', 'error')
+        return redirect(url_for('main.login'))
+    
+    if not current_user.get_permissions().get('manage_jobs', False):
+        flash('Access denied. You do not have permission to manage jobs.', 'error')
+        return redirect(url_for('main.admin_dashboard'))
+    
+    page = request.args.get('page', 1, type=int)
+    status = request.args.get('status', '')
+    query = JobPosting.query
+    if status == 'active':
+        query = query.filter(JobPosting.is_active == True)
+    elif status == 'inactive':
+        query = query.filter(JobPosting.is_active == False)
+    jobs = query.order_by(JobPosting.posted_date.desc()).paginate(page=page, per_page=50, error_out=False)
+    
+    return render_template('admin_jobs.html', jobs=jobs, status=status, user=current_user)
+
+@main.route('/admin/analytics')
+def admin_analytics():
+    """Reports - period totals and a per-day series from the daily rollups (?format=json for the API)"""
+    if not is_logged_in():
+        flash('Please log in to view reports.', 'error')
+        return redirect(url_for('main.login'))
+    
+    if session.get('user_role') != 'admin':
+        flash('Access denied. Admin privileges required.', 'error')
+        return redirect(url_for('main.home'))
+    
+    current_user = get_current_user()
+    if not current_user:
+        flash('User session expired. Please log in again.', 'error')
+        return redirect(url_for('main.login'))
+    
+    if not current_user.get_permissions().get('view_reports', False):
+        flash('Access denied. You do not have permission to view reports.', 'error')
+        return redirect(url_for('main.admin_dashboard'))
+    
+    today = datetime.utcnow().date()
+    try:
+        end = date.fromisoformat(request.args['end']) if request.args.get('end') else today
+        start = date.fromisoformat(request.args['start']) if request.args.get('start') else end - timedelta(days=29)
+    except ValueError:
+        flash('Dates must be in YYYY-MM-DD format.', 'error')
+        return redirect(url_for('main.admin_analytics'))
+    if start > end:
+        start, end = end, start
+    # Cap the per-day series; totals are cheap sums for any range
+    series_start = max(start, end - timedelta(days=MAX_ANALYTICS_DAYS - 1))
+    
+    totals = period_totals(start, end)
+    series = daily_series(series_start, end)
+    
+    if request.args.get('format') == 'json':
+        return jsonify(
+            start=start.isoformat(), end=end.isoformat(), totals=totals,
+            series=[dict(counts, day=day.isoformat()) for day, counts in series]
+        )
+    
+    peak = max([max(counts.values()) for _day, counts in series] + [1])
+    return render_template('admin_analytics.html', start=start, end=end, totals=totals,
+                           series=series, peak=peak, user=current_user)
+
+@main.route('/admin/audit')
+def admin_audit():
+    """Audit log - paginated admin activity, optionally for one actor"""
+    if not is_logged_in():
+        flash('Please log in to view the audit log.', 'error')
+        return redirect(url_for('main.login'))
+    
+    if session.get('user_role') != 'admin':
+        flash('Access denied. Admin privileges required.', 'error')
+        return redirect(url_for('main.home'))
+    
+    current_user = get_current_user()
+    if not current_user:
+        flash('User session expired. Please log in again.', 'error')
+        return redirect(url_for('main.login'))
+    
+    if not current_user.get_permissions().get('manage_users', False):
+        flash('Access denied. You do not have permission to view the audit log.', 'error')
+        return redirect(url_for('main.admin_dashboard'))
+    
+    page = request.args.get('page', 1, type=int)
+    actor_id = request.args.get('actor', type=int)
+    entries = recent_activity(page=page, per_page=50, actor_id=actor_id)
+    return render_template('admin_audit.html', entries=entries, actor_id=actor_id, user=current_user)
+
 @main.route('/profile')
 def profile():
     """User profile view - displays current user's profile information"""
@@ -749,6 +1135,7 @@ def edit_profile():
                     return render_template('edit_profile.html', user=current_user)
             
             # Update user profile
+            old_bio = current_user.bio
             update_success = current_user.update_profile(
                 username=new_username,
                 email=new_email,
@@ -764,6 +1151,14 @@ def edit_profile():
                 if new_username != session.get('username'):
                     session['username'] = new_username
                 
+                # Applicant fit scores depend on the bio; rescore in the background
+                if current_user.role == 'seeker' and current_user.bio != old_bio:
+                    try:
+                        enqueue('fit_scores.refresh_seeker', seeker_id=current_user.id)
+                    except Exception as e:
+                        db.session.rollback()
+                        logger.exception("Queueing fit scores for seeker %s failed: %s", current_user.id, e)
+                
                 flash('Profile updated successfully!', 'success')
                 return redirect(url_for('main.profile'))
             else:
@@ -795,6 +1190,17 @@ def search():
     
     return render_template('jobs.html', jobs=jobs, search_query=query, is_search=True)
 
+@main.route('/search/suggest')
+def search_suggest():
+    """Typeahead suggestions for the job search box, served from memory"""
+    query = request.args.get('q', '').strip()
+    limit = min(max(request.args.get('limit', 8, type=int), 1), 20)
+    
+    suggestions = suggestion_index.suggest(query, limit=limit) if len(query) <= 100 else []
+    response = jsonify(query=query, suggestions=suggestions)
+    response.headers['Cache-Control'] = 'public, max-age=30'
+    return response
+
 # Utility function to check if user is logged in
 def is_logged_in():
     """Check if user is currently logged in"""
@@ -818,6 +1224,18 @@ def logged_in():
     """Template global function to check login status"""
     return is_logged_in()
 
+@main.app_template_global()
+def idempotency_key():
+    """Template global function giving each rendered form a fresh idempotency key"""
+    return uuid.uuid4().hex
+
+@main.app_template_filter('nl2br')
+def nl2br(text):
+    """Template filter that escapes text and turns newlines into <br> tags"""
+    if not text:
+        return ''
+    return Markup('<br>\n').join(escape(text).splitlines())
+
 # Error handlers
 @main.errorhandler(404)
 def not_found(error):
@@ -0,0 +1,123 @@
+"""
+Parse free-text salary ranges into structured, annualized amounts
+"""
+import re
+from collections import namedtuple
+
+SalaryInfo = namedtuple('SalaryInfo', ['min', 'max', 'currency', 'period'])
+
+# Multipliers used to annualize an amount quoted per period
+PERIOD_MULTIPLIERS = {
+    'hour': 2080,
+    'day': 260,
+    'week': 52,
+    'month': 12,
+    'year': 1,
+}
+
+_PERIOD_PATTERNS = (
+    ('hour', re.compile(r'\b(?:per\s+hour|an\s+hour|a\s+hour|hourly|hr|hour|ph)\b|/\s*h(?:ou)?r\b', re.I)),
+    ('day', re.compile(r'\b(?:per\s+day|a\s+day|daily|day)\b|/\s*day\b', re.I)),
+    ('week', re.compile(r'\b(?:per\s+week|a\s+week|weekly|wk|week|pw)\b|/\s*w(?:ee)?k\b', re.I)),
+    ('month', re.compile(r'\b(?:per\s+month|a\s+month|monthly|month|mo|pm|p\.m\.)(?:\b|$)|/\s*mo(?:nth)?\b', re.I)),
+    ('year', re.compile(r'\b(?:per\s+(?:year|annum)|a\s+year|annually|annual|yearly|year|yr|pa|p\.a\.)(?:\b|$)|/\s*y(?:ea)?r\b', re.I)),
+)
+
+_CURRENCY_SYMBOLS = {
+    '$': 'USD',
+    '₦': 'NGN',
+    '£': 'GBP',
+    '€': 'EUR',
+    '₹': 'INR',
+    '¥': 'JPY',
+}
+
+_CURRENCY_WORDS = {
+    'naira': 'NGN',
+    'ngn': 'NGN',
+    'usd': 'USD',
+    'dollar': 'USD',
+    'dollars': 'USD',
+    'gbp': 'GBP',
+    'pounds': 'GBP',
+    'eur': 'EUR',
+    'euro': 'EUR',
+    'euros': 'EUR',
+    'cad': 'CAD',
+    'aud': 'AUD',
+    'inr': 'INR',
+    'kes': 'KES',
+    'ghs': 'GHS',
+    'cedis': 'GHS',
+    'zar': 'ZAR',
+    'rand': 'ZAR',
+}
+
+_AMOUNT_RE = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*([kKmM])?(?![\w])')
+_CURRENCY_WORD_RE = re.compile(r'[a-zA-Z]+')
+_UP_TO_RE = re.compile(r'\b(?:up\s+to|max(?:imum)?|under)\b', re.I)
+_OPEN_ENDED_RE = re.compile(r'\+|\b(?:from|min(?:imum)?|at\s+least|starting)\b', re.I)
+
+_SUFFIX_MULTIPLIERS = {'k': 1000, 'm': 1000000}
+
+
+def _detect_currency(text):
+    for symbol, code in _CURRENCY_SYMBOLS.items():
+        if symbol in text:
+            return code
+    for word in _CURRENCY_WORD_RE.findall(text):
+        code = _CURRENCY_WORDS.get(word.lower())
+        if code:
+            return code
+    return None
+
+
+def _detect_period(text):
+    for period, pattern in _PERIOD_PATTERNS:
+        if pattern.search(text):
+            return period
+    return 'year'
+
+
+def parse_salary(text):
+    """Parse text like "$50k - $70k", "₦200,000/month" or "80k+"
+
+    Returns a SalaryInfo with annualized integer min/max (either may be None),
+    an ISO currency code (or None) and the quoted period, or None when the
+    text contains no amount at all (e.g. "Competitive").
+    """
+    if not text or not text.strip():
+        return None
+
+    amounts = []
+    for number, suffix in _AMOUNT_RE.findall(text):
+        try:
+            value = float(number.replace(',', ''))
+        except ValueError:
+            continue
+        amounts.append((value, (suffix or '').lower()))
+        if len(amounts) == 2:
+            break
+    if not amounts:
+        return None
+
+    # "50-70k": a suffix on the upper bound applies to a bare lower bound too
+    if len(amounts) == 2 and not amounts[0][1] and amounts[1][1]:
+        multiplier = _SUFFIX_MULTIPLIERS[amounts[1][1]]
+        if amounts[0][0] * multiplier <= amounts[1][0] * multiplier and amounts[0][0] < 1000:
+            amounts[0] = (amounts[0][0], amounts[1][1])
+
+    values = [value * _SUFFIX_MULTIPLIERS.get(suffix, 1) for value, suffix in amounts]
+    period = _detect_period(text)
+    annual = [int(round(value * PERIOD_MULTIPLIERS[period])) for value in values]
+
+    if len(annual) == 2:
+        low, high = sorted(annual)
+    elif _UP_TO_RE.search(text):
+        low, high = None, annual[0]
+    elif _OPEN_ENDED_RE.search(text):
+        low, high = annual[0], None
+    else:
+        low = high = annual[0]
+
+    return SalaryInfo(low, high, _detect_currency(text), period)
@@ -0,0 +1,35 @@
+"""
+Additive schema upgrades for existing SQLite databases
+
+db.create_all() creates missing tables but never alters existing ones, so
+columns and indexes added to models after a database was first created are
+added here. Only additive, nullable changes are supported.
+"""
+import logging
+
+from sqlalchemy import inspect, text
+
+logger = logging.getLogger(__name__)
+
+
+def upgrade_schema(db):
+    """Add model columns and indexes that are missing from existing tables"""
+    engine = db.engine
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'))
+                logger.info("Added column %s.%s", table.name, column.name)
+
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
@@ -0,0 +1,188 @@
+"""
+In-memory prefix index for typeahead suggestions over active job postings
+"""
+import bisect
+import heapq
+import logging
+import re
+import threading
+
+from app.metrics import record_cache_lookup
+from app.signals import jobs_posted, jobs_deactivated
+
+logger = logging.getLogger(__name__)
+
+# Suggestion kinds, mapped to the JobPosting attribute they come from
+SUGGESTION_FIELDS = (
+    ('title', 'title'),
+    ('company', 'company_name'),
+    ('location', 'location'),
+)
+
+# Recent lookups are memoized until a term matching their prefix changes
+MEMO_SIZE = 1024
+
+_NON_WORD_RE = re.compile(r'[^\w\s]+')
+
+
+def normalize(text):
+    """Lowercase, drop punctuation and collapse whitespace"""
+    if not text:
+        return ''
+    return ' '.join(_NON_WORD_RE.sub(' ', text.casefold()).split())
+
+
+class SuggestionIndex:
+    """Sorted array of word-start keys searched with bisect
+
+    Every term (a title, company or location) is stored once with the set of
+    active job ids that carry it; popularity is the size of that set. Each
+    term is reachable from the start of any of its words, so "dev" finds both
+    "Developer" and "Senior Developer". A lookup ranks every term in its
+    prefix range; results are memoized and only forgotten when a term
+    under that prefix is added, removed or changes popularity, so short,
+    broad prefixes are scanned once per change rather than once per keystroke.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = []          # sorted list of (search_key, term_key)
+        self._terms = {}         # term_key -> {'text', 'kind', 'jobs'}
+        self._job_terms = {}     # job_id -> [term_key, ...]
+        self._memo = {}          # (prefix, limit, kinds) -> results
+
+    def __len__(self):
+        return len(self._terms)
+
+    @staticmethod
+    def _search_keys(normalized):
+        """Suffixes of the normalized text starting at each word boundary"""
+        words = normalized.split(' ')
+        return {' '.join(words[i:]) for i in range(len(words))}
+
+    def _add_term(self, job_id, kind, text):
+        normalized = normalize(text)
+        if not normalized:
+            return None
+        term_key = (kind, normalized)
+        term = self._terms.get(term_key)
+        if term is None:
+            term = self._terms[term_key] = {'text': text.strip(), 'kind': kind, 'jobs': set()}
+            for search_key in self._search_keys(normalized):
+                bisect.insort(self._keys, (search_key, term_key))
+        if job_id not in term['jobs']:
+            term['jobs'].add(job_id)
+            self._forget(normalized)
+        return term_key
+
+    def _forget(self, normalized):
+        """Drop memoized lookups whose prefix matches one of the term's search keys"""
+        search_keys = self._search_keys(normalized)
+        stale = [memo_key for memo_key in self._memo
+                 if any(search_key.startswith(memo_key[0]) for search_key in search_keys)]
+        for memo_key in stale:
+            del self._memo[memo_key]
+
+    def _remove_term(self, job_id, term_key):
+        term = self._terms.get(term_key)
+        if term is None or job_id not in term['jobs']:
+            return
+        term['jobs'].discard(job_id)
+        self._forget(term_key[1])
+        if term['jobs']:
+            return
+        del self._terms[term_key]
+        for search_key in self._search_keys(term_key[1]):
+            entry = (search_key, term_key)
+            index = bisect.bisect_left(self._keys, entry)
+            if index < len(self._keys) and self._keys[index] == entry:
+                del self._keys[index]
+
+    def add_job(self, job_id, title=None, company_name=None, location=None):
+        """Index (or re-index) one active posting"""
+        values = {'title': title, 'company_name': company_name, 'location': location}
+        with self._lock:
+            for term_key in self._job_terms.pop(job_id, []):
+                self._remove_term(job_id, term_key)
+            term_keys = []
+            for kind, attribute in SUGGESTION_FIELDS:
+                term_key = self._add_term(job_id, kind, values[attribute])
+                if term_key:
+                    term_keys.append(term_key)
+            self._job_terms[job_id] = term_keys
+
+    def remove_job(self, job_id):
+        """Drop a posting that is no longer active"""
+        with self._lock:
+            for term_key in self._job_terms.pop(job_id, []):
+                self._remove_term(job_id, term_key)
+
+    def rebuild(self, rows):
+        """Replace the index contents from (id, title, company_name, location) rows"""
+        fresh = SuggestionIndex()
+        for job_id, title, company_name, location in rows:
+            fresh.add_job(job_id, title, company_name, location)
+        with self._lock:
+            self._keys, self._terms, self._job_terms = fresh._keys, fresh._terms, fresh._job_terms
+            self._memo.clear()
+
+    def suggest(self, prefix, limit=8, kinds=None):
+        """Return the most popular terms matching the prefix"""
+        normalized = normalize(prefix)
+        if not normalized:
+            return []
+
+        memo_key = (normalized, limit, tuple(sorted(kinds)) if kinds else None)
+        with self._lock:
+            cached = self._memo.get(memo_key)
+            record_cache_lookup('suggest', cached is not None)
+            if cached is not None:
+                return cached
+
+            # The whole range, so a popular term late in the alphabet isn't cut off
+            start = bisect.bisect_left(self._keys, (normalized,))
+            end = bisect.bisect_left(self._keys, (normalized + '\U0010ffff',), start)
+            candidates = {term_key for _search_key, term_key in self._keys[start:end]
+                          if kinds is None or term_key[0] in kinds}
+
+            best = heapq.nlargest(
+                limit, candidates,
+                key=lambda term_key: (len(self._terms[term_key]['jobs']), -len(term_key[1])))
+            results = [{'text': self._terms[term_key]['text'],
+                        'type': term_key[0],
+                        'count': len(self._terms[term_key]['jobs'])} for term_key in best]
+
+            if len(self._memo) >= MEMO_SIZE:
+                del self._memo[next(iter(self._memo))]  # oldest first
+            self._memo[memo_key] = results
+            return results
+
+
+# Process-wide index, rebuilt on startup and kept current through signals
+suggestion_index = SuggestionIndex()
+
+
+def _on_jobs_posted(sender, jobs=(), **extra):
+    for job in jobs:
+        if job.is_active:
+            suggestion_index.add_job(job.id, job.title, job.company_name, job.location)
+
+
+def _on_jobs_deactivated(sender, job_ids=(), **extra):
+    for job_id in job_ids:
+        suggestion_index.remove_job(job_id)
+
+
+def init_search_index(app):
+    """Build the suggestion index from active postings and subscribe to updates"""
+    from app.models import JobPosting, db
+
+    with app.app_context():
+        rows = db.session.query(
+            JobPosting.id, JobPosting.title, JobPosting.company_name, JobPosting.location
+        ).filter(JobPosting.is_active == True).all()
+        suggestion_index.rebuild(rows)
+    logger.info("Suggestion index built", extra={'terms': len(suggestion_index), 'jobs': len(rows)})
+
+    jobs_posted.connect(_on_jobs_posted, weak=False)
+    jobs_deactivated.connect(_on_jobs_deactivated, weak=False)
@@ -0,0 +1,21 @@
+"""
+Application signals for keeping in-memory indexes in sync with job postings
+"""
+from blinker import Namespace
+
+_signals = Namespace()
+
+# Sent after new, refreshed or reopened postings are committed, once per transaction:
+# jobs_posted.send(app, jobs=[...])
+jobs_posted = _signals.signal('jobs-posted')
+
+# Sent after postings stop being listed: jobs_deactivated.send(app, job_ids=[...])
+jobs_deactivated = _signals.signal('jobs-deactivated')
+
+# Sent after employers change application statuses in bulk:
+# application_status_changed.send(app, employer_id=..., job_ids=[...], seeker_ids=[...], status=...)
+application_status_changed = _signals.signal('application-status-changed')
+
+# Sent after a seeker's application is inserted:
+# application_submitted.send(app, job_id=..., seeker_id=..., application_id=...)
+application_submitted = _signals.signal('application-submitted')
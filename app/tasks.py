@@ -0,0 +1,308 @@
+"""
+Persistent background task queue with in-process workers, retries and a periodic scheduler
+"""
+import importlib
+import json
+import logging
+import os
+import socket
+import threading
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.background import PeriodicTask
+from app.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+TASKS_TOTAL = registry.counter(
+    'jobboard_tasks_total', 'Background tasks run by task and outcome', ('task', 'outcome'))
+
+TaskDef = namedtuple('TaskDef', ['func', 'max_attempts', 'retry_delay'])
+
+# name -> TaskDef, filled in by @task at import time
+_tasks = {}
+
+# Modules defining tasks, imported by init_tasks so every process (including
+# a dedicated `flask tasks work` one) can run every queued task
+TASK_MODULES = ('app.alerts', 'app.fit_scores', 'app.recommend')
+
+# name -> (interval seconds, task name, payload), filled in by schedule()
+_schedules = {}
+
+# Set by enqueue so idle workers in this process pick new work up without waiting for the next poll
+_wakeup = threading.Event()
+
+
+def task(name, max_attempts=3, retry_delay=30):
+    """Register func(**payload) as a queueable task; failures retry after retry_delay, doubling each time"""
+    def decorator(func):
+        _tasks[name] = TaskDef(func, max_attempts, retry_delay)
+        return func
+    return decorator
+
+
+def _run_eagerly(name, definition, payload):
+    try:
+        definition.func(**payload)
+        TASKS_TOTAL.inc(task=name, outcome='done')
+    except Exception as e:
+        from app.models import db
+        db.session.rollback()
+        TASKS_TOTAL.inc(task=name, outcome='failed')
+        if current_app.config['TASK_EAGER_PROPAGATE']:
+            raise
+        logger.exception("Task %s failed: %s", name, e)
+
+
+def enqueue(name, delay=0, **payload):
+    """Queue task `name` with JSON-serializable keyword arguments; returns the task id
+
+    Commits the current session, so call it after the request's own writes
+    are committed. Under TASK_QUEUE_EAGER the task runs inline instead and
+    None is returned; its errors are raised when TASK_EAGER_PROPAGATE is set
+    (as under TESTING) and logged otherwise.
+    """
+    from app.models import db, QueuedTask
+
+    definition = _tasks.get(name)
+    if definition is None:
+        raise ValueError(f'Unknown task: {name}')
+    if current_app.config['TASK_QUEUE_EAGER']:
+        _run_eagerly(name, definition, payload)
+        return None
+
+    now = datetime.utcnow()
+    task_id = db.session.execute(insert(QueuedTask).values(
+        name=name, payload=json.dumps(payload), status=QUEUED, attempts=0, max_attempts=definition.max_attempts,
+        run_at=now + timedelta(seconds=delay), created_at=now
+    ).returning(QueuedTask.id)).scalar()
+    db.session.commit()
+    _wakeup.set()
+    return task_id
+
+
+def claim_task(worker_id, now=None):
+    """Atomically mark the oldest due task running for this worker; returns its row or None
+
+    The pick and the status change are one UPDATE, so processes sharing the
+    table never claim the same task.
+    """
+    from app.models import db, QueuedTask
+
+    now = now or datetime.utcnow()
+    next_due = select(QueuedTask.id).where(
+        QueuedTask.status == QUEUED, QueuedTask.run_at <= now
+    ).order_by(QueuedTask.run_at, QueuedTask.id).limit(1).scalar_subquery()
+    row = db.session.execute(
+        update(QueuedTask).where(QueuedTask.id == next_due, QueuedTask.status == QUEUED)
+        .values(status=RUNNING, attempts=QueuedTask.attempts + 1, locked_by=worker_id, locked_at=now)
+        .returning(QueuedTask.id, QueuedTask.name, QueuedTask.payload, QueuedTask.attempts, QueuedTask.max_attempts),
+        execution_options={'synchronize_session': False}
+    ).first()
+    db.session.commit()
+    return row
+
+
+def _finish(task_id, **values):
+    from app.models import db, QueuedTask
+
+    db.session.execute(update(QueuedTask).where(QueuedTask.id == task_id).values(locked_by=None, **values),
+                       execution_options={'synchronize_session': False})
+    db.session.commit()
+
+
+def run_next(worker_id):
+    """Claim and run one due task; returns False when none was due"""
+    from app.models import db
+
+    row = claim_task(worker_id)
+    if row is None:
+        return False
+
+    definition = _tasks.get(row.name)
+    try:
+        if definition is None:
+            raise LookupError(f'Unknown task: {row.name}')
+        definition.func(**json.loads(row.payload))
+    except Exception as e:
+        db.session.rollback()
+        now = datetime.utcnow()
+        if definition is not None and row.attempts < row.max_attempts:
+            delay = definition.retry_delay * 2 ** (row.attempts - 1)
+            _finish(row.id, status=QUEUED, run_at=now + timedelta(seconds=delay), last_error=repr(e))
+            TASKS_TOTAL.inc(task=row.name, outcome='retried')
+            logger.warning("Task %s (%s) failed, retrying in %ss: %s", row.name, row.id, delay, e)
+        else:
+            _finish(row.id, status=FAILED, finished_at=now, last_error=repr(e))
+            TASKS_TOTAL.inc(task=row.name, outcome='failed')
+            logger.exception("Task %s (%s) failed after %s attempts: %s", row.name, row.id, row.attempts, e)
+        return True
+
+    _finish(row.id, status=DONE, finished_at=datetime.utcnow(), last_error=None)
+    TASKS_TOTAL.inc(task=row.name, outcome='done')
+    return True
+
+
+def requeue_stale(lease_seconds, now=None):
+    """Return tasks left running by a worker that died (e.g. on a restart) to the queue; returns how many
+
+    A task that has used up its attempts this way is marked failed instead.
+    """
+    from app.models import db, QueuedTask
+
+    now = now or datetime.utcnow()
+    stale = (QueuedTask.status == RUNNING) & (QueuedTask.locked_at < now - timedelta(seconds=lease_seconds))
+    options = {'synchronize_session': False}
+    failed = db.session.execute(update(QueuedTask).where(stale, QueuedTask.attempts >= QueuedTask.max_attempts).values(
+        status=FAILED, finished_at=now, locked_by=None, last_error='Worker lease expired'
+    ), execution_options=options).rowcount
+    requeued = db.session.execute(update(QueuedTask).where(stale).values(
+        status=QUEUED, run_at=now, locked_by=None
+    ), execution_options=options).rowcount
+    db.session.commit()
+    if failed or requeued:
+        logger.warning("Stale tasks recovered", extra={'requeued': requeued, 'failed': failed})
+    return requeued
+
+
+def schedule(name, interval, task_name, **payload):
+    """Enqueue task_name every `interval` seconds, once across all processes running the scheduler"""
+    _schedules[name] = (interval, task_name, payload)
+
+
+def run_due_schedules(now=None):
+    """Enqueue every schedule whose time has come; returns the names enqueued
+
+    Each due time is advanced with a conditional UPDATE, so when several
+    processes tick together only the one whose update lands enqueues.
+    A new schedule first runs one interval after it is registered.
+    """
+    from app.models import db, TaskSchedule
+
+    now = now or datetime.utcnow()
+    enqueued = []
+    for name, (interval, task_name, payload) in list(_schedules.items()):
+        next_run_at = now + timedelta(seconds=interval)
+        claimed = db.session.execute(
+            update(TaskSchedule).where(TaskSchedule.name == name, TaskSchedule.next_run_at <= now)
+            .values(next_run_at=next_run_at),
+            execution_options={'synchronize_session': False}
+        ).rowcount
+        if not claimed:
+            try:
+                db.session.execute(insert(TaskSchedule).values(name=name, next_run_at=next_run_at))
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()  # already registered and not yet due
+            continue
+        db.session.commit()
+        enqueue(task_name, **payload)
+        enqueued.append(name)
+    return enqueued
+
+
+@task('tasks.purge_finished', max_attempts=1)
+def purge_finished(older_than_days=7):
+    """Delete completed tasks finished more than older_than_days ago; failed ones are kept for inspection"""
+    from app.models import db, QueuedTask
+
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    removed = db.session.execute(delete(QueuedTask).where(
+        QueuedTask.status == DONE, QueuedTask.finished_at < cutoff
+    )).rowcount
+    db.session.commit()
+    return removed
+
+
+def queue_stats():
+    """{status: count} over the task table"""
+    from app.models import db, QueuedTask
+
+    return dict(db.session.query(QueuedTask.status, func.count()).group_by(QueuedTask.status).all())
+
+
+class TaskWorker:
+    """Pool of daemon threads running queued tasks inside an app context"""
+
+    def __init__(self, app, threads=2, poll_interval=1.0):
+        self.app = app
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self._stop = threading.Event()
+        self._threads = []
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                with self.app.app_context():
+                    ran = run_next(self.worker_id)
+            except Exception as e:
+                # e.g. the database is locked or unreachable; back off and try again
+                logger.exception("Task worker error: %s", e)
+                ran = False
+            if not ran:
+                _wakeup.wait(self.poll_interval)
+                _wakeup.clear()
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        for number in range(self.threads):
+            thread = threading.Thread(target=self._loop, name=f'task-worker-{number}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info("Task workers started", extra={'threads': self.threads, 'worker_id': self.worker_id})
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        _wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+
+def scheduler_tick():
+    """Recover tasks from dead workers, then enqueue due schedules"""
+    requeue_stale(current_app.config['TASK_LEASE_SECONDS'])
+    return run_due_schedules()
+
+
+def init_tasks(app):
+    """Start task worker threads and the scheduler in the server process; under TESTING tasks run inline instead
+
+    Set TASK_WORKER_THREADS = 0 on web processes to leave the work to a
+    separate `flask tasks work` process.
+    """
+    app.config.setdefault('TASK_QUEUE_EAGER', app.testing)
+    app.config.setdefault('TASK_EAGER_PROPAGATE', app.testing)
+    app.config.setdefault('TASK_WORKER_THREADS', 2)
+    app.config.setdefault('TASK_POLL_INTERVAL', 1.0)
+    app.config.setdefault('TASK_LEASE_SECONDS', 300)
+    app.config.setdefault('TASK_RETENTION_DAYS', 7)
+    app.config.setdefault('TASK_SCHEDULER_INTERVAL', 10)
+    app.config.setdefault('TASK_SCHEDULER_ENABLED', app.config['BACKGROUND_SERVICES'])
+
+    for module in TASK_MODULES:
+        importlib.import_module(module)
+    schedule('tasks.purge_finished', 24 * 3600, 'tasks.purge_finished',
+             older_than_days=app.config['TASK_RETENTION_DAYS'])
+
+    if app.config['TASK_QUEUE_EAGER']:
+        return
+    if app.config['BACKGROUND_SERVICES'] and app.config['TASK_WORKER_THREADS']:
+        worker = TaskWorker(app, app.config['TASK_WORKER_THREADS'], app.config['TASK_POLL_INTERVAL'])
+        app.extensions['task_worker'] = worker
+        worker.start()
+    if app.config['TASK_SCHEDULER_ENABLED']:
+        scheduler = PeriodicTask(app, 'task-scheduler', app.config['TASK_SCHEDULER_INTERVAL'], scheduler_tick)
+        app.extensions['task_scheduler'] = scheduler
+        scheduler.start()
@@ -0,0 +1,66 @@
+"""
+Ahead-of-time Jinja template compilation into a shared bytecode cache
+"""
+import logging
+import os
+import time
+
+from jinja2 import FileSystemBytecodeCache
+
+logger = logging.getLogger(__name__)
+
+
+class LazyDirectoryBytecodeCache(FileSystemBytecodeCache):
+    """FileSystemBytecodeCache that creates its directory on the first write
+
+    Processes that never render a template (CLI commands, scripts) leave no
+    cache directory behind.
+    """
+
+    def dump_bytecode(self, bucket):
+        os.makedirs(self.directory, exist_ok=True)
+        super().dump_bytecode(bucket)
+
+
+def precompile_templates(app):
+    """Load every template once, filling the bytecode cache; returns [(name, seconds)] slowest first
+
+    Templates already in the cache (e.g. compiled by another worker) are
+    only unmarshalled, so their time shows the cost a worker now pays.
+    """
+    env = app.jinja_env
+    report = []
+    for name in env.list_templates(filter_func=lambda name: name.endswith('.html')):
+        started = time.perf_counter()
+        env.get_template(name)
+        report.append((name, time.perf_counter() - started))
+    report.sort(key=lambda item: item[1], reverse=True)
+    return report
+
+
+def init_templates(app):
+    """Attach the bytecode cache, turn auto-reload off outside debug and optionally precompile
+
+    Call after every filter and global is registered: compiling checks that
+    the filters a template uses exist.
+    """
+    app.config.setdefault('TEMPLATE_BYTECODE_CACHE', not app.testing)
+    app.config.setdefault('TEMPLATE_CACHE_DIR', os.path.join(app.instance_path, 'jinja_cache'))
+    app.config.setdefault('TEMPLATE_PRECOMPILE', False)
+
+    if app.config.get('TEMPLATES_AUTO_RELOAD') is None and not app.debug:
+        # Skip the per-render stat() of every template file in production
+        app.jinja_env.auto_reload = False
+
+    if app.config['TEMPLATE_BYTECODE_CACHE']:
+        # Entries are keyed by template name and source checksum, so a deploy never serves stale bytecode
+        app.jinja_env.bytecode_cache = LazyDirectoryBytecodeCache(app.config['TEMPLATE_CACHE_DIR'])
+
+    if app.config['TEMPLATE_PRECOMPILE']:
+        started = time.perf_counter()
+        report = precompile_templates(app)
+        for name, seconds in report:
+            logger.info("Template compiled", extra={'template': name, 'ms': round(seconds * 1000, 2)})
+        logger.info("Templates precompiled", extra={
+            'templates': len(report), 'ms': round((time.perf_counter() - started) * 1000, 1)
+        })
@@ -0,0 +1,39 @@
+"""
+Shared test setup: an app on an in-memory database, its test client and a session login helper
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from app import create_app
+
+TEST_CONFIG = {
+    'TESTING': True,
+    'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+}
+
+
+def make_app(**overrides):
+    """A fresh app on TEST_CONFIG plus overrides"""
+    return create_app(dict(TEST_CONFIG, **overrides))
+
+
+def login(client, user_id, role, username):
+    """Mark the client's session as signed in, as the login view does"""
+    with client.session_transaction() as sess:
+        sess['user_id'] = user_id
+        sess['user_role'] = role
+        sess['username'] = username
+        sess['logged_in'] = True
+
+
+@pytest.fixture
+def app():
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
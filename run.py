@@ -3,8 +3,12 @@
 import os
 from app import create_app
 
-# Create the Flask application
-app = create_app()
+# Create the Flask application. Background services (task workers, schedulers,
+# sweepers) start when this is the server: `python run.py`, or a WSGI server
+# importing run:app with BACKGROUND_SERVICES=1. `flask --app run <command>` leaves them off
+app = create_app({
+    'BACKGROUND_SERVICES': __name__ == '__main__' or os.environ.get('BACKGROUND_SERVICES', '') == '1'
+})
 
 if __name__ == '__main__':
     # Get environment variables with Render defaults
@@ -201,16 +201,37 @@ function initializeSearch() {
             }
         });
         
-        // Real-time search (debounced)
+        // Real-time suggestions (debounced)
         const searchInput = searchForm.querySelector('input[name="search"]');
-        if (searchInput) {
+        if (searchInput && searchInput.dataset.suggestUrl) {
+            const suggestionList = document.getElementById(searchInput.getAttribute('list'));
             let searchTimeout;
+            let latestQuery = '';
             searchInput.addEventListener('input', function() {
                 clearTimeout(searchTimeout);
+                const query = this.value.trim();
+                if (query.length < 2 || !suggestionList) {
+                    return;
+                }
                 searchTimeout = setTimeout(() => {
-                    console.log('Searching for:', this.value);
-                    // Implement real-time search here
-                }, 500);
+                    latestQuery = query;
+                    fetch(searchInput.dataset.suggestUrl + '?q=' + encodeURIComponent(query))
+                        .then(response => response.json())
+                        .then(data => {
+                            // Ignore responses for queries the user has already typed past
+                            if (data.query !== latestQuery) {
+                                return;
+                            }
+                            suggestionList.innerHTML = '';
+                            data.suggestions.forEach(suggestion => {
+                                const option = document.createElement('option');
+                                option.value = suggestion.text;
+                                option.label = suggestion.type + ' (' + suggestion.count + ')';
+                                suggestionList.appendChild(option);
+                            });
+                        })
+                        .catch(() => {});
+                }, 150);
             });
         }
     }
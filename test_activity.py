@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from conftest import make_app
+from app.models import db, User
+from app.activity import ActivityTracker
+
+
+def test_activity_is_written_behind(app):
+    """Logins and visits are counted immediately and reach users only on flush"""
+    with app.app_context():
+        alice = User('alice', 'alice@example.com', 'password')
+        bob = User('bob', 'bob@example.com', 'password')
+        db.session.add_all([alice, bob])
+        db.session.commit()
+
+        tracker = ActivityTracker(window_seconds=60)
+        tracker.login(alice.id)
+        tracker.seen(bob.id)
+        tracker.seen(alice.id)
+        assert tracker.active_count() == 2
+        assert db.session.get(User, alice.id).last_login is None
+
+        assert tracker.flush() == 2
+        assert tracker.flush() == 0
+        db.session.expire_all()
+        alice, bob = db.session.get(User, alice.id), db.session.get(User, bob.id)
+        assert alice.last_login is not None and alice.last_seen >= alice.last_login
+        assert bob.last_login is None and bob.last_seen is not None
+
+        tracker.seen(12345)  # deleted or unknown users are skipped
+        assert tracker.flush() == 1
+
+        tracker.window_seconds = 0
+        assert tracker.active_count() == 0
+
+
+if __name__ == "__main__":
+    test_activity_is_written_behind(make_app())
+    print("✅ All activity tracker tests passed!")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from email import message_from_bytes
+
+from conftest import make_app, login
+from app.models import db, User, JobPosting, SavedSearchMatch
+from app.alerts import (percolator, compile_search, job_features, save_search, delete_search, percolate_job,
+                        send_digests, DigestSender, FileSender)
+
+
+class Posting:
+    def __init__(self, title, description='', company_name=None, location=None, location_place_id=None,
+                 job_type='full-time'):
+        self.title, self.description, self.company_name = title, description, company_name
+        self.location, self.location_place_id, self.job_type = location, location_place_id, job_type
+
+
+def test_postings_are_checked_against_candidate_searches_only():
+    """A posting is verified only against searches filed under its words, place or job type"""
+    percolator.rebuild([
+        compile_search(1, keywords='python developer'),
+        compile_search(2, keywords='python', location='Berlin'),
+        compile_search(3, keywords='nurse'),
+        compile_search(4, location='Lagos'),
+        compile_search(5, job_type='internship'),
+    ] + [compile_search(100 + n, keywords=f'unrelated{n}') for n in range(500)])
+
+    posting = Posting('Senior Python Developer', 'Django and APIs', location='Berlin, Germany',
+                      location_place_id='de-berlin')
+    candidates = percolator.candidates(job_features(posting))
+    assert {spec.search_id for spec in candidates} == {1, 2}
+    assert percolator.match(job_features(posting)) == [1, 2]
+
+    assert percolator.match(job_features(Posting('Python Developer', location='Lagos',
+                                                 location_place_id='ng-lagos'))) == [1, 4]
+    assert percolator.match(job_features(Posting('Summer role', job_type='internship'))) == [5]
+    percolator.remove(1)
+    assert percolator.match(job_features(posting)) == [2]
+
+
+def test_new_postings_are_sent_in_one_digest():
+    """Matches pile up per seeker and go out once, through the configured sender"""
+    with tempfile.TemporaryDirectory() as outbox:
+        app = make_app(ALERT_OUTBOX_DIR=outbox)
+        with app.app_context():
+            employer = User('employer', 'employer@example.com', 'password', role='employer')
+            seeker = User('seeker', 'seeker@example.com', 'password', full_name='Sam Seeker')
+            db.session.add_all([employer, seeker])
+            db.session.commit()
+            employer_id = employer.id
+            python = save_search(seeker.id, '', keywords='python')
+            save_search(seeker.id, 'Remote contracts', location='Remote', job_type='contract')
+            gone = save_search(seeker.id, 'Gone', keywords='python')
+            assert delete_search(seeker.id, gone.id)
+            assert python.name == 'python'
+
+        client = app.test_client()
+        login(client, employer_id, 'employer', 'employer')
+        for title, location, job_type in [('Python Engineer', 'Berlin', 'full-time'),
+                                          ('Data Analyst', 'Remote', 'contract'),
+                                          ('Chef', 'Lagos', 'full-time')]:
+            response = client.post('/post_job', data={
+                'title': title, 'description': 'A role on a small team.', 'location': location,
+                'job_type': job_type, 'company_name': 'Acme', 'confirm_duplicate': '1'
+            })
+            assert response.status_code == 302
+
+        with app.app_context():
+            assert SavedSearchMatch.query.count() == 2
+            assert send_digests() == 1
+            assert send_digests() == 0  # nothing new since
+            assert SavedSearchMatch.query.filter(SavedSearchMatch.notified_at.is_(None)).count() == 0
+
+        files = os.listdir(outbox)
+        assert len(files) == 1
+        with open(os.path.join(outbox, files[0]), 'rb') as handle:
+            message = message_from_bytes(handle.read())
+        body = message.get_payload()
+        assert message['To'] == 'seeker@example.com'
+        assert message['Subject'] == '2 new jobs for your saved searches'
+        assert 'Hi Sam Seeker' in body and 'Python Engineer (Acme, Berlin)' in body
+        assert 'Remote contracts:' in body and 'Chef' not in body
+
+
+def test_failed_delivery_is_retried():
+    """Matches stay pending when the sender fails"""
+    class BrokenSender(FileSender):
+        def send(self, to_address, subject, body):
+            raise OSError('relay down')
+
+    with tempfile.TemporaryDirectory() as outbox:
+        app = make_app(ALERT_OUTBOX_DIR=outbox)
+        with app.app_context():
+            employer = User('employer', 'employer@example.com', 'password', role='employer')
+            seeker = User('seeker', 'seeker@example.com', 'password')
+            db.session.add_all([employer, seeker])
+            db.session.commit()
+            save_search(seeker.id, 'Nurses', keywords='nurse')
+            db.session.add(JobPosting(title='Night Nurse', description='Ward work', employer_id=employer.id))
+            db.session.commit()
+            assert percolate_job(JobPosting.query.one()) == 1
+            assert percolate_job(JobPosting.query.one()) == 0  # a refresh doesn't match twice
+
+            assert send_digests(sender=BrokenSender(outbox, 'alerts@example.com')) == 0
+            try:
+                DigestSender('alerts@example.com')  # send() is abstract
+            except TypeError:
+                pass
+            else:
+                raise AssertionError('DigestSender was instantiated without send()')
+            assert send_digests() == 1
+            assert len(os.listdir(outbox)) == 1
+
+
+if __name__ == "__main__":
+    test_postings_are_checked_against_candidate_searches_only()
+    test_new_postings_are_sent_in_one_digest()
+    test_failed_delivery_is_retried()
+    print("✅ All alerts tests passed!")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from conftest import make_app, login
+from app.models import db, User, JobPosting, Application
+from app.applications import (update_application_status, status_counts, apply_to_job, idempotency_keys,
+                              APPLIED, DUPLICATE, CLOSED)
+
+
+def test_bulk_status_update_respects_ownership(app):
+    """Bulk status changes only touch applications to the employer's own postings"""
+    with app.app_context():
+        owner = User('owner', 'owner@example.com', 'password', role='employer')
+        other = User('other', 'other@example.com', 'password', role='employer')
+        seekers = [User(f'seeker{i}', f'seeker{i}@example.com', 'password') for i in range(3)]
+        db.session.add_all([owner, other] + seekers)
+        db.session.commit()
+        mine = JobPosting(title='Mine', description='d', employer_id=owner.id, is_active=False)
+        theirs = JobPosting(title='Theirs', description='d', employer_id=other.id)
+        db.session.add_all([mine, theirs])
+        db.session.commit()
+        db.session.add_all([Application(job_id=job.id, seeker_id=seeker.id)
+                            for job in (mine, theirs) for seeker in seekers])
+        db.session.commit()
+        first = Application.query.filter_by(job_id=mine.id).first().id
+        foreign = Application.query.filter_by(job_id=theirs.id).first().id
+
+        assert update_application_status(owner.id, 'accepted', application_ids=[first, foreign]) == 1
+        assert update_application_status(owner.id, 'rejected', job_ids=[mine.id, theirs.id], from_status='pending') == 2
+        assert update_application_status(owner.id, 'rejected', job_ids=[mine.id], from_status='pending') == 0
+        assert status_counts(owner.id) == {'pending': 0, 'reviewed': 0, 'accepted': 1, 'rejected': 2}
+        assert status_counts(other.id)['pending'] == 3
+
+
+def test_json_ids_must_be_lists(app, client):
+    """A string of ids is rejected rather than read digit by digit"""
+    with app.app_context():
+        employer = User('employer', 'employer@example.com', 'password', role='employer')
+        db.session.add(employer)
+        db.session.commit()
+        employer_id = employer.id
+    login(client, employer_id, 'employer', 'employer')
+
+    response = client.post('/applications/status', json={'job_ids': '12', 'status': 'rejected'})
+    assert response.status_code == 400
+    assert response.get_json()['updated'] == 0
+    assert client.post('/applications/status', json=[12]).status_code == 400
+    assert client.post('/applications/status', json={'job_ids': [12], 'status': 'rejected'}).status_code == 200
+
+
+def test_apply_is_idempotent(app):
+    """Repeat and closed-job applications are absorbed without errors"""
+    with app.app_context():
+        idempotency_keys.clear()
+        employer = User('employer', 'employer@example.com', 'password', role='employer')
+        seeker = User('seeker', 'seeker@example.com', 'password')
+        db.session.add_all([employer, seeker])
+        db.session.commit()
+        job = JobPosting(title='Open', description='d', employer_id=employer.id)
+        closed = JobPosting(title='Closed', description='d', employer_id=employer.id, is_active=False)
+        db.session.add_all([job, closed])
+        db.session.commit()
+
+        assert apply_to_job(job.id, seeker.id, 'Hello', idempotency_key='k1') == APPLIED
+        assert apply_to_job(job.id, seeker.id, 'Hello', idempotency_key='k1') == APPLIED
+        assert apply_to_job(job.id, seeker.id, 'Hello again') == DUPLICATE
+        assert apply_to_job(closed.id, seeker.id) == CLOSED
+        assert apply_to_job(9999, seeker.id) == CLOSED
+        assert Application.query.one().cover_letter == 'Hello'
+
+
+def test_concurrent_applies_insert_once():
+    """A burst of submissions for the same seeker and job leaves exactly one application"""
+    handle, path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    app = make_app(SQLALCHEMY_DATABASE_URI=f'sqlite:///{path}')
+    try:
+        with app.app_context():
+            employer = User('employer', 'employer@example.com', 'password', role='employer')
+            seekers = [User(f'seeker{i}', f'seeker{i}@example.com', 'password') for i in range(4)]
+            db.session.add_all([employer] + seekers)
+            db.session.commit()
+            job = JobPosting(title='Hot', description='d', employer_id=employer.id)
+            db.session.add(job)
+            db.session.commit()
+            job_id, seeker_ids = job.id, [seeker.id for seeker in seekers]
+
+        outcomes, errors = [], []
+
+        def submit(seeker_id):
+            try:
+                with app.app_context():
+                    outcomes.append(apply_to_job(job_id, seeker_id))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=submit, args=(seeker_id,)) for seeker_id in seeker_ids for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert outcomes.count(APPLIED) == len(seeker_ids)
+        assert outcomes.count(DUPLICATE) == len(threads) - len(seeker_ids)
+        with app.app_context():
+            assert Application.query.count() == len(seeker_ids)
+            db.engine.dispose()
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    test_bulk_status_update_respects_ownership(make_app())
+    app = make_app()
+    test_json_ids_must_be_lists(app, app.test_client())
+    test_apply_is_idempotent(make_app())
+    test_concurrent_applies_insert_once()
+    print("✅ All application status tests passed!")
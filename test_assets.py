@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import gzip
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from conftest import make_app
+from app.assets import build_assets, BUNDLES
+
+
+def _write(static_dir, relative_path, content):
+    path = os.path.join(static_dir, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as handle:
+        handle.write(content)
+
+
+def _sources(static_dir):
+    """Stand-ins for the vendored and local files the bundles are built from"""
+    for sources in BUNDLES.values():
+        for source in sources:
+            _write(static_dir, source, f'/* {source} */\n'.encode())
+    _write(static_dir, 'vendor/fontawesome/css/all.min.css',
+           b'.fa{font-family:"FA";src:url(../webfonts/fa-solid.woff2)}')
+    _write(static_dir, 'vendor/fontawesome/webfonts/fa-solid.woff2', b'font bytes')
+    _write(static_dir, 'css/style.css', b'body {\n    color: red;\n}\n')
+    _write(static_dir, 'js/main.js', b'// setup\nconsole.log("ready");\n')
+
+
+def test_fingerprints_are_stable():
+    """Rebuilding unchanged sources gives the same names; a change renames only its bundle"""
+    with tempfile.TemporaryDirectory() as static_dir:
+        _sources(static_dir)
+        first = build_assets(static_dir, fetch=False)
+        assert build_assets(static_dir, fetch=False) == first
+        assert first['app.css'].startswith('app.') and first['app.css'].endswith('.css')
+
+        _write(static_dir, 'js/main.js', b'console.log("changed");\n')
+        second = build_assets(static_dir, fetch=False)
+        assert second['app.css'] == first['app.css']
+        assert second['app.js'] != first['app.js']
+
+        dist = os.path.join(static_dir, 'dist')
+        with open(os.path.join(dist, first['app.css']), 'rb') as handle:
+            css = handle.read()
+        assert b'color:red' in css and b'url(fa-solid.' in css  # minified, font fingerprinted
+        with gzip.open(os.path.join(dist, second['app.js'] + '.gz')) as handle:
+            assert b'console.log("changed");' in handle.read()
+
+
+def test_built_assets_are_served_immutable():
+    """Fingerprinted files are served precompressed with a one-year immutable Cache-Control"""
+    with tempfile.TemporaryDirectory() as static_dir:
+        _sources(static_dir)
+        manifest = build_assets(static_dir, fetch=False)
+        app = make_app()
+        app.static_folder = static_dir
+        client = app.test_client()
+
+        response = client.get(f"/assets/{manifest['app.js']}", headers={'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert response.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert client.get('/assets/manifest.json').status_code == 404
+
+        page = client.get('/').get_data(as_text=True)
+        assert f"/assets/{manifest['app.css']}" in page and 'cdn.jsdelivr.net' not in page
+
+
+def test_cdn_fallback_without_manifest():
+    """Before `assets build` has run, pages keep loading Bootstrap and Font Awesome from the CDNs"""
+    with tempfile.TemporaryDirectory() as static_dir:
+        app = make_app()
+        app.static_folder = static_dir
+        page = app.test_client().get('/').get_data(as_text=True)
+        assert 'https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css' in page
+        assert 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css' in page
+        assert '/assets/' not in page
+
+
+if __name__ == "__main__":
+    test_fingerprints_are_stable()
+    test_built_assets_are_served_immutable()
+    test_cdn_fallback_without_manifest()
+    print("✅ All asset pipeline tests passed!")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from conftest import make_app, login
+from app.models import db, User, AuditLog
+from app.audit import audit_trail, recent_activity
+
+
+def test_entries_are_written_in_batches(app):
+    """Recording only queues; a flush writes the whole batch and readers see it newest first"""
+    with app.app_context():
+        admin = User('admin', 'admin@example.com', 'password', role='admin')
+        db.session.add(admin)
+        db.session.commit()
+        audit_trail.clear()
+
+        for n in range(3):
+            audit_trail.record('jobs_close', f'Closed {n + 1} job posting(s)', actor_id=admin.id,
+                               details={'job_ids': list(range(n + 1))})
+        assert AuditLog.query.count() == 0
+        assert audit_trail.flush() == 3
+        assert len(audit_trail) == 0
+        assert AuditLog.query.count() == 3
+
+        audit_trail.record('create_admin', 'Created admin second', actor_id=admin.id)
+        page = recent_activity(per_page=2)
+        assert page.total == 4  # reading flushes what was still queued
+        assert [entry.summary for entry in page.items] == ['Created admin second', 'Closed 3 job posting(s)']
+        assert page.items[0].username == 'admin'
+        assert recent_activity(actor_id=admin.id + 1).total == 0
+        assert User.get_recent_admin_activities(limit=1)[0]['action'] == 'Created admin second'
+
+
+def test_log_is_append_only(app):
+    """Entries can't be edited or deleted through the ORM"""
+    with app.app_context():
+        audit_trail.clear()
+        audit_trail.record('admin_login', 'Signed in', actor_id=1)
+        audit_trail.flush()
+        entry = AuditLog.query.one()
+
+        entry.summary = 'Nothing happened'
+        try:
+            db.session.commit()
+            assert False, 'update should be refused'
+        except ValueError:
+            db.session.rollback()
+
+        db.session.delete(entry)
+        try:
+            db.session.commit()
+            assert False, 'delete should be refused'
+        except ValueError:
+            db.session.rollback()
+        assert AuditLog.query.one().summary == 'Signed in'
+
+
+def test_admin_actions_are_audited(app, client):
+    """Creating an admin through the route leaves a trail entry for the acting admin"""
+    with app.app_context():
+        root = User('root', 'root@example.com', 'password', role='admin')
+        root.set_permissions({'manage_users': True, 'manage_jobs': True, 'view_reports': True})
+        db.session.add(root)
+        db.session.commit()
+        root_id = root.id
+        audit_trail.clear()
+
+    login(client, root_id, 'admin', 'root')
+    response = client.post('/admin/create_admin', data={
+        'username': 'helper', 'email': 'helper@example.com', 'password': 'password123',
+        'confirm_password': 'password123', 'manage_jobs': 'on'
+    })
+    assert response.status_code == 302
+
+    response = client.get('/admin/audit')
+    assert response.status_code == 200
+    assert b'Created admin helper' in response.data
+    with app.app_context():
+        entry = AuditLog.query.filter_by(action='create_admin').one()
+        assert entry.actor_id == root_id
+        assert entry.target_id == User.query.filter_by(username='helper').one().id
+
+
+if __name__ == "__main__":
+    test_entries_are_written_in_batches(make_app())
+    test_log_is_append_only(make_app())
+    app = make_app()
+    test_admin_actions_are_audited(app, app.test_client())
+    print("✅ All audit tests passed!")
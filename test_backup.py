@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import gzip
+import sqlite3
+import tempfile
+import threading
+from types import SimpleNamespace
+
+from sqlalchemy import insert
+
+from conftest import make_app
+from app.models import db, User
+from app import backup as backup_module
+from app.backup import copy_database, create_snapshot, backup_if_due, last_backup, last_backup_label, list_snapshots
+
+
+def file_backed_app(tmpdir, **config):
+    return make_app(**dict({
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(tmpdir, 'job_board.db'),
+        'BACKUP_DIR': os.path.join(tmpdir, 'backups'),
+        'BACKUP_PAGES_PER_STEP': 4,
+        'BACKUP_STEP_SLEEP': 0,
+    }, **config))
+
+
+def add_users(prefix, count):
+    # Core insert, skipping password hashing, so the database grows quickly
+    db.session.execute(insert(User), [{'username': f'{prefix}{n}', 'email': f'{prefix}{n}@example.com',
+                                       'password': 'x', 'role': 'seeker'} for n in range(count)])
+    db.session.commit()
+
+
+def test_snapshot_is_a_consistent_compressed_copy():
+    """The snapshot restores to a database holding every committed row"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        app = file_backed_app(tmpdir)
+        with app.app_context():
+            assert last_backup_label() == 'Not configured'
+            add_users('user', 200)
+
+            status = create_snapshot()
+            assert status['steps'] > 1  # copied a few pages at a time
+            assert list_snapshots() == [(status['file'], status['bytes'])]
+            assert last_backup()['file'] == status['file']
+            assert last_backup_label().endswith('MB)')
+
+            restored = os.path.join(tmpdir, 'restored.db')
+            with gzip.open(os.path.join(tmpdir, 'backups', status['file'])) as packed, open(restored, 'wb') as raw:
+                raw.write(packed.read())
+            conn = sqlite3.connect(restored)
+            assert conn.execute('SELECT count(*) FROM users').fetchone()[0] == 200
+            conn.close()
+            assert sorted(os.listdir(os.path.join(tmpdir, 'backups'))) == sorted([status['file'], 'last_backup.json'])
+
+
+def test_backup_runs_alongside_writers():
+    """Writers keep committing while a backup is copying"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        app = file_backed_app(tmpdir, BACKUP_PAGES_PER_STEP=1, BACKUP_STEP_SLEEP=0.001)
+        with app.app_context():
+            add_users('user', 2000)
+
+        def write_more():
+            with app.app_context():
+                for n in range(20):
+                    add_users(f'late{n}-', 5)
+
+        writer = threading.Thread(target=write_more)
+        with app.app_context():
+            writer.start()
+            status = create_snapshot()
+            writer.join()
+            assert status['file']
+            assert User.query.count() == 2100
+
+
+def test_retention_and_schedule():
+    """Old snapshots are pruned and backup_if_due skips while the last one is recent"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        app = file_backed_app(tmpdir, BACKUP_RETAIN=2, BACKUP_INTERVAL=3600)
+        backup_dir = os.path.join(tmpdir, 'backups')
+        os.makedirs(backup_dir)
+        for stamp in ('20240101T000000Z', '20240102T000000Z', '20240103T000000Z'):
+            with open(os.path.join(backup_dir, f'job_board-{stamp}.db.gz'), 'wb') as handle:
+                handle.write(b'old')
+        with app.app_context():
+            status = backup_if_due()
+            assert status is not None
+            assert [name for name, _size in list_snapshots()] == [status['file'], 'job_board-20240103T000000Z.db.gz']
+            assert backup_if_due() is None
+
+
+class WritingConnection(sqlite3.Connection):
+    """Source connection whose stepped backups see a write from another connection before every step report"""
+    writer = None
+
+    def backup(self, target, *, pages=-1, progress=None, name='main', sleep=0.25):
+        def write_then_report(status, remaining, total):
+            self.writer.execute('INSERT INTO notes VALUES (?)', ('late',))
+            self.writer.commit()
+            progress(status, remaining, total)
+        return super().backup(target, pages=pages, progress=progress and write_then_report, name=name, sleep=sleep)
+
+
+def test_restarts_fall_back_to_a_single_step():
+    """A copy restarted by writes more than max_restarts times finishes in one step instead"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source_path = os.path.join(tmpdir, 'source.db')
+        source = sqlite3.connect(source_path)
+        source.execute('CREATE TABLE notes (body TEXT)')
+        source.executemany('INSERT INTO notes VALUES (?)', [('x' * 500,)] * 200)
+        source.commit()
+        WritingConnection.writer = source
+
+        original = backup_module.sqlite3
+        backup_module.sqlite3 = SimpleNamespace(
+            connect=lambda path, **kwargs: sqlite3.connect(path, factory=WritingConnection, **kwargs))
+        dest_path = os.path.join(tmpdir, 'copy.db')
+        try:
+            pages, steps, restarts = copy_database(source_path, dest_path, pages_per_step=4, sleep=0, max_restarts=2)
+        finally:
+            backup_module.sqlite3 = original
+        assert restarts == 2 and pages > 0
+
+        copy = sqlite3.connect(dest_path)
+        assert copy.execute('SELECT count(*) FROM notes').fetchone()[0] == \
+            source.execute('SELECT count(*) FROM notes').fetchone()[0]
+        copy.close()
+        source.close()
+
+
+if __name__ == "__main__":
+    test_snapshot_is_a_consistent_compressed_copy()
+    test_backup_runs_alongside_writers()
+    test_retention_and_schedule()
+    test_restarts_fall_back_to_a_single_step()
+    print("✅ All backup tests passed!")
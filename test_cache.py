@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from conftest import make_app
+from app.models import db, User, JobPosting
+from app.cache import QueryCache, LRUBackend, SQLiteBackend
+from app.applications import apply_to_job, update_application_status
+
+
+def test_tags_invalidate_entries():
+    """Invalidating a tag drops exactly the entries carrying it, on either backend"""
+    handle, path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    try:
+        for backend in (LRUBackend(max_entries=100), SQLiteBackend(path)):
+            cache = QueryCache(backend)
+            calls = []
+
+            @cache.cached('double', key=lambda n: n, tags=lambda result, n: [f'n:{n}', 'all'])
+            def double(n):
+                calls.append(n)
+                return n * 2
+
+            assert [double(1), double(1), double(2)] == [2, 2, 4]
+            cache.invalidate('n:1')
+            assert [double(1), double(2)] == [2, 4]
+            assert calls == [1, 2, 1]
+            cache.invalidate('all')
+            double(1), double(2)
+            assert calls == [1, 2, 1, 1, 2]
+    finally:
+        os.remove(path)
+
+
+def test_fallback_results_are_not_stored():
+    """A helper that falls back after a failed query calls skip(), so the next call queries again"""
+    cache = QueryCache(LRUBackend(max_entries=100))
+    failures = [False, True]  # popped from the end: fail once, then succeed
+
+    @cache.cached('rows', key=lambda: (), tags=lambda result: ['rows'])
+    def rows():
+        if failures.pop():
+            cache.skip()
+            return []
+        return [1, 2]
+
+    assert rows() == []
+    assert rows() == [1, 2]
+    assert rows() == [1, 2]  # served from the cache; failures is empty now
+
+
+def test_lru_evicts_and_treats_lost_tags_as_stale():
+    """Past max_entries the least recently used key goes, and an evicted tag version means a miss"""
+    cache = QueryCache(LRUBackend(max_entries=3))
+    cache.set('a', 1, tags=['t'])
+    assert cache.get('a') == 1
+    cache.backend.delete('tag:t')
+    assert cache.get('a') != 1
+
+    backend = LRUBackend(max_entries=2)
+    backend.set('x', 1)
+    backend.set('y', 2)
+    backend.get('x')
+    backend.set('z', 3)
+    assert backend.get('y') is None and backend.get('x') == 1
+
+
+def test_dashboard_helpers_are_invalidated_by_writes(app):
+    """Cached dashboard queries refresh after applications and status changes"""
+    with app.app_context():
+        employer = User('employer', 'employer@example.com', 'password', role='employer')
+        seeker = User('seeker', 'seeker@example.com', 'password')
+        db.session.add_all([employer, seeker])
+        db.session.commit()
+        job = JobPosting(title='Engineer', description='d', employer_id=employer.id)
+        db.session.add(job)
+        db.session.commit()
+
+        assert seeker.get_applied_jobs() == [] and employer.get_recent_applications() == []
+        assert employer.get_posted_jobs()[0]['application_count'] == 0
+
+        apply_to_job(job.id, seeker.id)
+        assert [row['job_title'] for row in seeker.get_applied_jobs()] == ['Engineer']
+        assert len(employer.get_recent_applications()) == 1
+        assert employer.get_posted_jobs()[0]['application_count'] == 1
+
+        update_application_status(employer.id, 'accepted', job_ids=[job.id])
+        assert seeker.get_applied_jobs()[0]['status'] == 'accepted'
+        assert employer.get_recent_applications()[0]['status'] == 'accepted'
+
+
+if __name__ == "__main__":
+    test_tags_invalidate_entries()
+    test_fallback_results_are_not_stored()
+    test_lru_evicts_and_treats_lost_tags_as_stale()
+    test_dashboard_helpers_are_invalidated_by_writes(make_app())
+    print("✅ All query cache tests passed!")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import gzip
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import jsonify
+
+from conftest import make_app
+
+
+def compression_app(**overrides):
+    """Create a test app with a couple of routes of known size"""
+    app = make_app(**dict({'COMPRESS_MIN_SIZE': 100}, **overrides))
+
+    @app.route('/_test/big')
+    def big():
+        return jsonify(items=['job posting %d' % i for i in range(200)])
+
+    @app.route('/_test/small')
+    def small():
+        return 'tiny'
+
+    return app
+
+
+def test_gzip_negotiated_and_etag_304():
+    """Large JSON is gzipped and revalidation returns 304 without a body"""
+    client = compression_app().test_client()
+
+    response = client.get('/_test/big', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert b'job posting 199' in gzip.decompress(response.data)
+
+    etag = response.headers['ETag']
+    assert etag.startswith('W/')
+    revalidated = client.get('/_test/big', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b''
+
+    # The same weak ETag validates the identity representation as well
+    identity = client.get('/_test/big', headers={'If-None-Match': etag})
+    assert identity.status_code == 304
+
+
+def test_skips_small_bodies_and_unsupported_clients():
+    """Bodies under the threshold and clients without gzip get identity encoding"""
+    client = compression_app().test_client()
+
+    assert 'Content-Encoding' not in client.get('/_test/small', headers={'Accept-Encoding': 'gzip'}).headers
+    assert 'Content-Encoding' not in client.get('/_test/big', headers={'Accept-Encoding': 'identity'}).headers
+
+
+def test_large_bodies_are_streamed():
+    """Bodies over the streaming threshold are sent chunked without Content-Length"""
+    client = compression_app(COMPRESS_STREAM_THRESHOLD=1000).test_client()
+
+    response = client.get('/_test/big', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.is_streamed or 'Content-Length' not in response.headers
+    assert b'job posting 0' in gzip.decompress(response.get_data())
+
+
+if __name__ == "__main__":
+    test_gzip_negotiated_and_etag_304()
+    test_skips_small_bodies_and_unsupported_clients()
+    test_large_bodies_are_streamed()
+    print("✅ All compression tests passed!")
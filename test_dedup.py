@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.dedup import minhash, band_keys, similarity
+
+DESCRIPTION = ('We are hiring a senior Python developer to build Flask APIs, maintain '
+               'SQLAlchemy models and mentor junior engineers in our Lagos office.')
+
+
+def test_reposts_share_buckets():
+    """A lightly edited repost shares LSH buckets and scores as a near-duplicate"""
+    original = minhash('Senior Python Developer', DESCRIPTION)
+    repost = minhash('Senior Python Developer', DESCRIPTION + ' Apply today!')
+    assert minhash('Senior Python Developer', DESCRIPTION) == original
+    assert set(band_keys(original)) & set(band_keys(repost))
+    assert similarity(original, repost) >= 0.8
+
+
+def test_unrelated_postings_do_not_match():
+    """Different postings share no buckets and score low"""
+    developer = minhash('Senior Python Developer', DESCRIPTION)
+    chef = minhash('Pastry Chef', 'Bake bread, cakes and pastries for our busy Abuja restaurant every morning.')
+    assert not set(band_keys(developer)) & set(band_keys(chef))
+    assert similarity(developer, chef) < 0.2
+
+
+if __name__ == "__main__":
+    test_reposts_share_buckets()
+    test_unrelated_postings_do_not_match()
+    print("✅ All duplicate detection tests passed!")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from conftest import make_app, login
+from app.models import db, User, JobPosting
+from app.facets import FacetIndex, facet_index
+from app.lifecycle import bulk_job_action
+
+
+def _counts(index, facet, job_ids=None):
+    return {row['value']: row['count'] for row in index.counts(job_ids)[facet]}
+
+
+def test_add_and_remove_keep_counts_current():
+    """Adding, re-adding and removing postings move the running counts"""
+    index = FacetIndex()
+    index.add_job(1, 'full-time', 'Lagos', 60000)
+    index.add_job(2, 'contract', 'lagos ', 120000)
+    index.add_job(3, 'full-time', None, None)
+    assert len(index) == 3
+    assert _counts(index, 'job_type') == {'full-time': 2, 'contract': 1}
+    assert _counts(index, 'location') == {'ng-lagos': 2, 'not-specified': 1}
+    assert _counts(index, 'salary') == {'50k-100k': 1, '100k-150k': 1, 'not-specified': 1}
+
+    index.add_job(2, 'full-time', 'Abuja', 120000)  # an edit replaces the old values
+    assert _counts(index, 'job_type') == {'full-time': 3}
+    assert _counts(index, 'location') == {'ng-lagos': 1, 'ng-abuja': 1, 'not-specified': 1}
+
+    index.remove_job(1)
+    index.remove_job(99)  # unknown ids are ignored
+    assert len(index) == 2
+    assert _counts(index, 'location') == {'ng-abuja': 1, 'not-specified': 1}
+
+
+def test_counts_over_a_subset():
+    """Drill-down counts cover only the given ids and skip ids the index doesn't hold"""
+    index = FacetIndex()
+    index.add_job(1, 'full-time', 'Lagos', 60000)
+    index.add_job(2, 'contract', 'Lagos', 160000)
+    index.add_job(3, 'internship', 'Remote', 20000)
+    assert _counts(index, 'job_type', [1, 3, 42]) == {'full-time': 1, 'internship': 1}
+    assert _counts(index, 'salary', [2]) == {'150k-plus': 1}
+    assert _counts(index, 'job_type', []) == {}
+    labels = {row['value']: row['label'] for row in index.counts()['salary']}
+    assert labels['150k-plus'] == '150k+'
+
+
+def test_signals_move_the_counts(app, client):
+    """Posting, closing and reopening a job update the shared index through job signals"""
+    with app.app_context():
+        employer = User('employer', 'employer@example.com', 'password', role='employer')
+        db.session.add(employer)
+        db.session.commit()
+        employer_id = employer.id
+    before = _counts(facet_index, 'job_type').get('internship', 0)
+
+    login(client, employer_id, 'employer', 'employer')
+    response = client.post('/post_job', data={
+        'title': 'Summer Intern', 'description': 'Ten weeks on the data team.', 'location': 'Lagos',
+        'job_type': 'internship', 'salary_range': '20k', 'company_name': 'Acme', 'confirm_duplicate': '1'
+    })
+    assert response.status_code == 302
+    assert _counts(facet_index, 'job_type')['internship'] == before + 1
+
+    with app.app_context():
+        job_id = JobPosting.query.filter_by(title='Summer Intern').one().id
+        bulk_job_action('close', [job_id], employer_id=employer_id)
+        assert _counts(facet_index, 'job_type').get('internship', 0) == before
+        bulk_job_action('reopen', [job_id], employer_id=employer_id)
+        assert _counts(facet_index, 'job_type')['internship'] == before + 1
+
+
+if __name__ == "__main__":
+    test_add_and_remove_keep_counts_current()
+    test_counts_over_a_subset()
+    app = make_app()
+    test_signals_move_the_counts(app, app.test_client())
+    print("✅ All facet tests passed!")
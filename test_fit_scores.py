@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import app.fit_scores as fit_scores_module
+from conftest import make_app
+from app.models import db, User, JobPosting, Application, ApplicationFitScore
+from app.applications import apply_to_job
+from app.fit_scores import input_hash, score_batch
+from app.recommend import recommender, TfidfModel, job_tokens
+from app.tasks import enqueue
+
+
+def test_input_hash_tracks_every_input():
+    """Changing any scored input changes the hash; identical inputs reuse it"""
+    base = input_hash('Python Developer', 'Flask APIs', 'Python dev', 'Hire me')
+    assert base == input_hash('Python Developer', 'Flask APIs', 'Python dev', 'Hire me')
+    assert base != input_hash('Python Developer', 'Flask APIs', 'Python dev', 'Hire me!')
+    assert base != input_hash('Python Developer', 'Flask APIs', None, 'Hire me')
+    assert input_hash('ab', 'c', None, None) != input_hash('a', 'bc', None, None)
+    assert base != input_hash('Python Developer', 'Flask APIs', 'Python dev', 'Hire me', 'refitted')
+
+
+def test_relevant_applicants_score_higher():
+    """An applicant whose bio matches the job outscores an unrelated one"""
+    model = TfidfModel()
+    model.fit([job_tokens('Python Developer', 'Flask and SQLAlchemy APIs', 'Lagos'),
+               job_tokens('Pastry Chef', 'Bread and cakes', 'Abuja')])
+    scores = score_batch([
+        (1, 'Python Developer', 'Flask and SQLAlchemy APIs', 'Python developer', 'I build Flask APIs'),
+        (1, 'Python Developer', 'Flask and SQLAlchemy APIs', 'Pastry chef', 'I bake bread'),
+    ], model=model)
+    assert scores[0] > 0.5 > scores[1]
+
+
+def test_sparse_and_fallback_scores_agree():
+    """Row-wise cosines from the SciPy path (when installed) match the per-pair fallback"""
+    left = [{'python': 0.8, 'flask': 0.6}, {'bread': 1.0}, {}]
+    right = [{'python': 0.6, 'sql': 0.8}, {'python': 1.0}, {'python': 1.0}]
+    installed = fit_scores_module.sparse
+    scores = fit_scores_module._cosine_rows(left, right)
+    try:
+        fit_scores_module.sparse = None
+        fallback = fit_scores_module._cosine_rows(left, right)
+    finally:
+        fit_scores_module.sparse = installed
+    assert fallback == [0.48, 0.0, 0.0]
+    assert all(abs(score - expected) < 1e-9 for score, expected in zip(scores, fallback))
+
+
+def test_fit_sorted_dashboard_reads_stored_scores_only(app):
+    """Sorting by fit never scores inline; a queued seeker refresh fills the score in"""
+    with app.app_context():
+        employer = User('employer', 'employer@example.com', 'password', role='employer')
+        seeker = User('seeker', 'seeker@example.com', 'password', bio='Python developer building Flask APIs')
+        db.session.add_all([employer, seeker])
+        db.session.commit()
+        job = JobPosting(title='Python Developer', description='Flask and SQLAlchemy APIs', employer_id=employer.id)
+        db.session.add(job)
+        db.session.commit()
+        db.session.add(Application(job_id=job.id, seeker_id=seeker.id, cover_letter='I build Flask APIs'))
+        db.session.commit()
+
+        [row] = employer.get_recent_applications(sort='fit')
+        assert row['fit_score'] is None
+
+        enqueue('fit_scores.refresh_seeker', seeker_id=seeker.id)
+        [row] = employer.get_recent_applications(sort='fit')
+        assert row['fit_score'] is not None and row['fit_score'] > 0
+
+
+def test_new_application_scores_only_itself(app):
+    """Applying queues a score for the new application alone, not a rescan of the job"""
+    with app.app_context():
+        employer = User('employer', 'employer@example.com', 'password', role='employer')
+        seekers = [User(f'seeker{n}', f'seeker{n}@example.com', 'password', bio='Python developer') for n in range(2)]
+        db.session.add_all([employer] + seekers)
+        db.session.commit()
+        job = JobPosting(title='Python Developer', description='Flask and SQLAlchemy APIs', employer_id=employer.id)
+        db.session.add(job)
+        db.session.commit()
+        unscored = Application(job_id=job.id, seeker_id=seekers[0].id)  # inserted without the apply signal
+        db.session.add(unscored)
+        db.session.commit()
+
+        apply_to_job(job.id, seekers[1].id, 'I build Flask APIs')
+        scored = {row.application_id for row in ApplicationFitScore.query.all()}
+        applied = Application.query.filter_by(seeker_id=seekers[1].id).one()
+        assert scored == {applied.id}
+
+
+def test_refit_rescores_the_whole_posting(app):
+    """An applicant scored under a new IDF fit brings the posting's other scores onto the same fit"""
+    with app.app_context():
+        employer = User('employer', 'employer@example.com', 'password', role='employer')
+        seekers = [User(f'seeker{n}', f'seeker{n}@example.com', 'password', bio='Python developer') for n in range(3)]
+        db.session.add_all([employer] + seekers)
+        db.session.commit()
+        job = JobPosting(title='Python Developer', description='Flask and SQLAlchemy APIs', employer_id=employer.id)
+        db.session.add(job)
+        db.session.commit()
+        apply_to_job(job.id, seekers[0].id, 'I build Flask APIs')
+        apply_to_job(job.id, seekers[1].id, 'I write SQL')
+
+        fitted = recommender.model
+        refitted = TfidfModel()
+        refitted.fit([job_tokens('Python Developer', 'Flask and SQLAlchemy APIs', None),
+                      job_tokens('Pastry Chef', 'Bread and cakes', None)])
+        assert refitted.fingerprint != fitted.fingerprint
+        try:
+            recommender.model = refitted
+            apply_to_job(job.id, seekers[2].id, 'Python all day')
+            versions = {row.model_version for row in ApplicationFitScore.query.filter_by(job_id=job.id)}
+            assert versions == {refitted.fingerprint}
+            assert ApplicationFitScore.query.count() == 3
+        finally:
+            recommender.model = fitted
+
+
+if __name__ == "__main__":
+    test_input_hash_tracks_every_input()
+    test_relevant_applicants_score_higher()
+    test_sparse_and_fallback_scores_agree()
+    test_fit_sorted_dashboard_reads_stored_scores_only(make_app())
+    test_new_application_scores_only_itself(make_app())
+    test_refit_rescores_the_whole_posting(make_app())
+    print("✅ All fit score tests passed!")
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.geo import gazetteer, geohash_encode, covering_prefixes, haversine_km
+
+
+def test_resolve_spelling_variants():
+    """Spelling variants of a place resolve to one canonical place id"""
+    places = {gazetteer().resolve(text).place_id for text in ('Lagos', 'lagos ', 'Lagos, NG', 'LAGOS, Nigeria')}
+    assert places == {'ng-lagos'}
+    assert gazetteer().resolve('Ikeja, Lagos').place_id == 'ng-ikeja'
+    assert gazetteer().resolve('Remote').place_id == 'remote'
+    assert gazetteer().resolve('Atlantis') is None
+
+
+def test_radius_cells_cover_nearby_places():
+    """The covering cells around Lagos include Ikeja's geohash but not Abuja's"""
+    lagos, ikeja, abuja = (gazetteer().get(place_id) for place_id in ('ng-lagos', 'ng-ikeja', 'ng-abuja'))
+    assert geohash_encode(57.64911, 10.40744) == 'u4pruy'
+    prefixes = covering_prefixes(lagos.lat, lagos.lon, 50)
+    assert any(geohash_encode(ikeja.lat, ikeja.lon).startswith(prefix) for prefix in prefixes)
+    assert not any(geohash_encode(abuja.lat, abuja.lon).startswith(prefix) for prefix in prefixes)
+    distances = haversine_km(lagos.lat, lagos.lon, [ikeja.lat, abuja.lat], [ikeja.lon, abuja.lon])
+    assert distances[0] < 50 < distances[1]
+
+
+if __name__ == "__main__":
+    test_resolve_spelling_variants()
+    test_radius_cells_cover_nearby_places()
+    print("✅ All geo tests passed!")
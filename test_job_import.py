@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+import io
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from conftest import make_app
+import json
+
+from app.models import db, User, JobPosting, QueuedTask, SeekerRecommendation
+from app.job_import import validate_job, import_jobs
+from app.recommend import rebuild_recommendations
+from app.tasks import run_next
+
+
+def test_validation_matches_post_job_rules():
+    """Rows are held to post_job's rules"""
+    fields, error = validate_job({'title': ' Developer ', 'description': 'Build APIs'})
+    assert error is None
+    assert fields['title'] == 'Developer' and fields['job_type'] == 'full-time' and fields['location'] is None
+    assert validate_job({'description': 'x'})[1] == 'Job title is required.'
+    assert validate_job({'title': 'x'})[1] == 'Job description is required.'
+    assert validate_job({'title': 'x' * 201, 'description': 'x'})[1] == 'Job title must be 200 characters or less.'
+
+
+def test_import_reports_row_errors(app):
+    """Valid rows are inserted in chunks with derived columns; bad rows are reported by line"""
+    with app.app_context():
+        employer = User('employer', 'employer@example.com', 'password', role='employer')
+        db.session.add(employer)
+        db.session.commit()
+
+        upload = io.BytesIO(
+            b'title,description,location,salary_range\n'
+            b'Developer,Build APIs,Lagos,50k-70k\n'
+            b',Missing title,,\n'
+            b'Designer,Design things,"Abuja, NG",\n'
+        )
+        report = import_jobs(upload, 'csv', employer.id, chunk_size=1)
+        assert report.imported == 2
+        assert report.errors == [(3, 'Job title is required.')]
+
+        developer = JobPosting.query.filter_by(title='Developer').one()
+        assert developer.employer_id == employer.id
+        assert developer.salary_min == 50000 and developer.location_place_id == 'ng-lagos'
+        assert developer.expires_at is not None
+
+        report = import_jobs(io.StringIO('{"title": "Chef", "description": "Cook"}\nnot json\n'), 'ndjson', employer.id)
+        assert report.imported == 1 and report.errors == [(2, 'Row is not a JSON object.')]
+
+
+def test_import_handles_mixed_json_types(app):
+    """Numbers in JSON rows are read as text; lists, objects and booleans are row errors, not a failed upload"""
+    with app.app_context():
+        employer = User('employer', 'employer@example.com', 'password', role='employer')
+        db.session.add(employer)
+        db.session.commit()
+
+        upload = io.StringIO(
+            '{"title": 5, "description": "Numbered role", "salary_range": 50000}\n'
+            '{"title": ["Chef"], "description": "Cook"}\n'
+            '{"title": "Driver", "description": "Drive", "location": {"city": "Lagos"}}\n'
+            '{"title": "Cleaner", "description": "Clean", "job_type": true}\n'
+            '{"title": "Baker", "description": "Bake", "company_name": null}\n'
+        )
+        report = import_jobs(upload, 'ndjson', employer.id)
+        assert report.imported == 2
+        assert report.errors == [(2, 'Title must be text.'), (3, 'Location must be text.'),
+                                 (4, 'Job type must be text.')]
+
+        numbered = JobPosting.query.filter_by(title='5').one()
+        assert numbered.salary_range == '50000' and numbered.salary_min == 50000
+
+
+def test_follow_up_work_is_queued_per_chunk():
+    """Alerts and recommendation updates get one queued task per inserted chunk, not one per row"""
+    app = make_app(TASK_QUEUE_EAGER=False)
+    with app.app_context():
+        employer = User('employer', 'employer@example.com', 'password', role='employer')
+        seeker = User('seeker', 'seeker@example.com', 'password', bio='Registered nurse, patient care')
+        db.session.add_all([employer, seeker])
+        db.session.commit()
+        db.session.add(JobPosting(title='Accountant', description='Ledgers', employer_id=employer.id))
+        db.session.commit()
+        rebuild_recommendations()
+        QueuedTask.query.delete()
+        db.session.commit()
+
+        rows = [{'title': f'Night Nurse {n}', 'description': 'Patient care on the ward'} for n in range(5)]
+        upload = io.StringIO(''.join(json.dumps(row) + '\n' for row in rows))
+        assert import_jobs(upload, 'ndjson', employer.id, chunk_size=2).imported == 5
+        queued = sorted((task.name, len(json.loads(task.payload)['job_ids'])) for task in QueuedTask.query)
+        assert queued == sorted([('alerts.percolate_jobs', 2), ('alerts.percolate_jobs', 2), ('alerts.percolate_jobs', 1),
+                                 ('recommendations.fold_in_jobs', 2), ('recommendations.fold_in_jobs', 2),
+                                 ('recommendations.fold_in_jobs', 1)])
+
+        while run_next('test'):
+            pass
+        db.session.expire_all()
+        assert {task.status for task in QueuedTask.query} == {'done'}
+        items = json.loads(db.session.get(SeekerRecommendation, seeker.id).items)
+        nurse_ids = {job.id for job in JobPosting.query.filter(JobPosting.title.like('Night Nurse%'))}
+        assert nurse_ids <= {job_id for job_id, _score in items}
+
+
+if __name__ == "__main__":
+    test_validation_matches_post_job_rules()
+    test_import_reports_row_errors(make_app())
+    test_import_handles_mixed_json_types(make_app())
+    test_follow_up_work_is_queued_per_chunk()
+    print("✅ All job import tests passed!")
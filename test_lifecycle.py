@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import datetime, timedelta
+
+from conftest import make_app
+from app.models import db, User, JobPosting, Application, JobPostingArchive, ApplicationArchive
+from app.lifecycle import expire_postings, archive_postings, close_jobs, reopen_jobs, delete_jobs
+
+
+def test_expire_then_archive(app):
+    """Expired postings are deactivated, then moved to the archive with their applications"""
+    with app.app_context():
+        employer = User('employer', 'employer@example.com', 'password', role='employer')
+        seeker = User('seeker', 'seeker@example.com', 'password')
+        db.session.add_all([employer, seeker])
+        db.session.commit()
+
+        expired = JobPosting(title='Expired', description='d', employer_id=employer.id,
+                             expires_at=datetime.utcnow() - timedelta(days=1))
+        legacy = JobPosting(title='Legacy', description='d', employer_id=employer.id,
+                            posted_date=datetime.utcnow() - timedelta(days=60))
+        live = JobPosting(title='Live', description='d', employer_id=employer.id)
+        db.session.add_all([expired, legacy, live])
+        db.session.commit()
+        legacy.expires_at = None
+        db.session.add(Application(job_id=expired.id, seeker_id=seeker.id))
+        db.session.commit()
+
+        assert expire_postings() == 2
+        assert [job.title for job in JobPosting.query.filter_by(is_active=True)] == ['Live']
+
+        assert archive_postings(older_than_days=30) == 1
+        assert archive_postings(older_than_days=0) == 1
+        assert JobPosting.query.count() == 1
+        assert Application.query.count() == 0
+        assert sorted(job.title for job in JobPostingArchive.query) == ['Expired', 'Legacy']
+        assert ApplicationArchive.query.one().seeker_id == seeker.id
+
+
+def test_bulk_actions_respect_ownership(app):
+    """Bulk close/reopen/delete only touch the employer's own postings"""
+    with app.app_context():
+        owner = User('owner', 'owner@example.com', 'password', role='employer')
+        other = User('other', 'other@example.com', 'password', role='employer')
+        seeker = User('seeker', 'seeker@example.com', 'password')
+        db.session.add_all([owner, other, seeker])
+        db.session.commit()
+        mine = JobPosting(title='Mine', description='d', employer_id=owner.id)
+        theirs = JobPosting(title='Theirs', description='d', employer_id=other.id)
+        db.session.add_all([mine, theirs])
+        db.session.commit()
+        db.session.add(Application(job_id=mine.id, seeker_id=seeker.id))
+        db.session.commit()
+        mine_id, theirs_id = mine.id, theirs.id
+
+        assert close_jobs([mine_id, theirs_id], employer_id=owner.id) == [mine_id]
+        assert reopen_jobs([mine_id], employer_id=other.id) == []
+        assert reopen_jobs([mine_id], employer_id=owner.id) == [mine_id]
+        assert delete_jobs([mine_id, theirs_id], employer_id=owner.id) == [mine_id]
+        assert [job.id for job in JobPosting.query] == [theirs_id]
+        assert Application.query.count() == 0
+
+
+if __name__ == "__main__":
+    test_expire_then_archive(make_app())
+    test_bulk_actions_respect_ownership(make_app())
+    print("✅ All job lifecycle tests passed!")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import json
+import logging
+import queue
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from conftest import make_app
+from app.logging_config import SamplingFilter, JsonFormatter, _DroppingQueueHandler
+
+
+def _record(name, level=logging.INFO, msg='hello %s', args=('world',), extra=None):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    for key, value in (extra or {}).items():
+        setattr(record, key, value)
+    return record
+
+
+def test_sampling_keeps_one_in_n():
+    """Sampled loggers (and their children) keep 1 in N info records per call site; warnings always pass"""
+    sampler = SamplingFilter({'app.routes': 10})
+    kept = [sampler.filter(_record('app.routes.search')) for _ in range(30)]
+    assert kept.count(True) == 3 and kept[0]
+    assert all(sampler.filter(_record('app.routes', logging.WARNING)) for _ in range(5))
+    assert all(sampler.filter(_record('app.models')) for _ in range(5))
+
+    # A second call site gets its own count instead of sharing the first one's, and kept records carry the rate
+    other = _record('app.routes.search', msg='other %s')
+    assert sampler.filter(other) and other.sample_rate == 10
+
+
+def test_json_formatter_includes_extra_fields():
+    """Records become one JSON object with the standard keys plus whatever was passed in extra="""
+    line = JsonFormatter().format(_record('app.jobs', extra={'request_id': 'abc', 'job_id': 7, 'tags': {'a': 1}}))
+    payload = json.loads(line)
+    assert payload['logger'] == 'app.jobs' and payload['level'] == 'INFO'
+    assert payload['message'] == 'hello world' and payload['request_id'] == 'abc'
+    assert payload['job_id'] == 7 and payload['tags'] == {'a': 1}
+    assert payload['ts'].endswith('+00:00')
+    assert 'args' not in payload and 'msg' not in payload
+
+    try:
+        raise RuntimeError('boom')
+    except RuntimeError:
+        record = _record('app.jobs')
+        record.exc_info = sys.exc_info()
+    assert 'RuntimeError: boom' in json.loads(JsonFormatter().format(record))['exc_info']
+
+
+def test_request_id_reaches_records_and_response(app):
+    """An incoming X-Request-ID is echoed back and stamped on records logged while serving it"""
+
+    @app.route('/test-log')
+    def log_something():
+        logging.getLogger('app.test').info("Handled", extra={'step': 'view'})
+        return 'ok'
+
+    captured = queue.Queue()
+    handler = logging.getLogger('app').handlers[0]
+    original, handler.queue = handler.queue, captured
+    try:
+        client = app.test_client()
+        response = client.get('/test-log', headers={'X-Request-ID': 'req-123'})
+        assert response.headers['X-Request-ID'] == 'req-123'
+        records = [captured.get_nowait() for _ in range(captured.qsize())]
+        handled = [record for record in records if record.name == 'app.test']
+        assert handled and handled[0].request_id == 'req-123' and handled[0].step == 'view'
+
+        generated = client.get('/test-log').headers['X-Request-ID']
+        assert len(generated) == 32 and generated != 'req-123'
+    finally:
+        handler.queue = original
+
+
+def test_full_queue_drops_instead_of_blocking():
+    """When the log queue is full records are counted as dropped and the caller moves on"""
+    handler = _DroppingQueueHandler(queue.Queue(maxsize=1))
+    before = _DroppingQueueHandler.dropped
+    for _ in range(3):
+        handler.emit(_record('app.test'))
+    assert handler.queue.qsize() == 1
+    assert _DroppingQueueHandler.dropped == before + 2
+
+
+def test_queued_exceptions_keep_their_traceback_apart():
+    """A traceback logged through the queue reaches the JSON output as exc_info, not inside the message"""
+    handler = _DroppingQueueHandler(queue.Queue())
+    logger = logging.getLogger('app.test.queued')
+    logger.addHandler(handler)
+    try:
+        try:
+            raise RuntimeError('boom')
+        except RuntimeError:
+            logger.exception("Failed for %s", 'job 7', extra={'job_id': 7})
+    finally:
+        logger.removeHandler(handler)
+
+    payload = json.loads(JsonFormatter().format(handler.queue.get_nowait()))
+    assert payload['message'] == 'Failed for job 7' and payload['job_id'] == 7
+    assert 'RuntimeError: boom' in payload['exc_info'] and 'Traceback' not in payload['message']
+
+
+if __name__ == "__main__":
+    test_sampling_keeps_one_in_n()
+    test_json_formatter_includes_extra_fields()
+    test_request_id_reaches_records_and_response(make_app())
+    test_full_queue_drops_instead_of_blocking()
+    test_queued_exceptions_keep_their_traceback_apart()
+    print("✅ All logging tests passed!")
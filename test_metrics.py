@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from conftest import make_app
+from app.metrics import MetricsRegistry, scrape_allowed
+
+
+def test_counters_are_kept_per_label_set():
+    """Counters add up per label combination and reject unknown labels"""
+    registry = MetricsRegistry()
+    requests = registry.counter('test_requests_total', 'Requests', ('endpoint', 'status'))
+    requests.inc(endpoint='jobs', status=200)
+    requests.inc(2, endpoint='jobs', status=200)
+    requests.inc(endpoint='jobs', status=500)
+    assert requests.value(endpoint='jobs', status=200) == 3
+    assert requests.value(endpoint='jobs', status='500') == 1  # label values are compared as text
+    assert requests.value(endpoint='login', status=200) == 0
+    assert requests.total() == 4
+    assert registry.counter('test_requests_total', 'Requests', ('endpoint', 'status')) is requests
+
+    try:
+        requests.inc(endpoint='jobs')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('missing label was accepted')
+
+
+def test_histogram_buckets_are_cumulative():
+    """Observations land in the first bucket whose bound they don't exceed; output is cumulative"""
+    registry = MetricsRegistry()
+    latency = registry.histogram('test_latency_seconds', 'Latency', ('endpoint',), buckets=(0.1, 0.5, 1.0))
+    for value in (0.05, 0.1, 0.3, 0.7, 2.0):
+        latency.observe(value, endpoint='jobs')
+
+    samples = {(suffix, tuple(extra or ())): value for suffix, _labels, extra, value in latency.samples()}
+    assert samples[('_bucket', (('le', '0.1'),))] == 2  # 0.1 is inside le="0.1"
+    assert samples[('_bucket', (('le', '0.5'),))] == 3
+    assert samples[('_bucket', (('le', '1'),))] == 4
+    assert samples[('_bucket', (('le', '+Inf'),))] == 5
+    assert samples[('_count', ())] == 5
+    assert abs(samples[('_sum', ())] - 3.15) < 1e-9
+
+    assert latency.quantile(0.5, endpoint='jobs') == 0.5
+    assert latency.quantile(0.95, endpoint='jobs') == float('inf')
+    assert latency.quantile(0.5, endpoint='login') is None
+
+
+def test_exposition_format():
+    """The registry renders HELP/TYPE headers, escaped labels and Prometheus-style values"""
+    registry = MetricsRegistry()
+    registry.counter('test_events_total', 'Events seen', ('kind',)).inc(kind='say "hi"\n')
+    registry.gauge('test_queue_depth', 'Queue depth', callback=lambda: 2.0)
+    registry.histogram('test_duration_seconds', 'Duration', buckets=(0.25,)).observe(0.125)
+
+    assert registry.render().splitlines() == [
+        '# HELP test_events_total Events seen',
+        '# TYPE test_events_total counter',
+        'test_events_total{kind="say \\"hi\\"\\n"} 1',
+        '# HELP test_queue_depth Queue depth',
+        '# TYPE test_queue_depth gauge',
+        'test_queue_depth 2',
+        '# HELP test_duration_seconds Duration',
+        '# TYPE test_duration_seconds histogram',
+        'test_duration_seconds_bucket{le="0.25"} 1',
+        'test_duration_seconds_bucket{le="+Inf"} 1',
+        'test_duration_seconds_sum 0.125',
+        'test_duration_seconds_count 1',
+    ]
+
+
+def test_metrics_endpoint_requires_the_token(client):
+    """/metrics answers local scrapers without a token, and only bearer-token holders with one"""
+    assert scrape_allowed(None, None, '127.0.0.1')
+    assert not scrape_allowed(None, None, '203.0.113.9')
+    assert scrape_allowed('s3cret', 'Bearer s3cret', '203.0.113.9')
+    assert not scrape_allowed('s3cret', 'Bearer wrong', '127.0.0.1')
+    assert not scrape_allowed('s3cret', None, '127.0.0.1')
+
+    assert client.get('/metrics').status_code == 200
+    assert client.get('/metrics', environ_base={'REMOTE_ADDR': '203.0.113.9'}).status_code == 404
+
+    client = make_app(METRICS_TOKEN='s3cret').test_client()
+    response = client.get('/metrics')
+    assert response.status_code == 401 and response.headers['WWW-Authenticate'] == 'Bearer'
+    response = client.get('/metrics', headers={'Authorization': 'Bearer s3cret'},
+                          environ_base={'REMOTE_ADDR': '203.0.113.9'})
+    assert response.status_code == 200
+    assert '# TYPE jobboard_requests_total counter' in response.get_data(as_text=True)
+
+
+if __name__ == "__main__":
+    test_counters_are_kept_per_label_set()
+    test_histogram_buckets_are_cumulative()
+    test_exposition_format()
+    test_metrics_endpoint_requires_the_token(make_app().test_client())
+    print("✅ All metrics tests passed!")
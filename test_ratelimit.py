@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from conftest import make_app
+from app.ratelimit import MemoryStore, SQLiteStore, parse_rate
+
+
+def test_token_bucket_refills():
+    """Buckets allow a burst up to capacity, then refill at the configured rate"""
+    capacity, per_second = parse_rate('3/minute')
+    assert capacity == 3 and per_second == 3 / 60
+
+    handle, path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    try:
+        for store in (MemoryStore(), SQLiteStore(path)):
+            results = [store.take('k', capacity, per_second, now=100.0)[0] for _ in range(4)]
+            assert results == [True, True, True, False]
+            allowed, retry_after = store.take('k', capacity, per_second, now=100.0)
+            assert not allowed and round(retry_after) == 20
+            assert store.take('k', capacity, per_second, now=120.0)[0]
+            assert store.take('other', capacity, per_second, now=120.0)[0]
+    finally:
+        os.remove(path)
+
+
+def test_over_limit_requests_get_429():
+    """Requests over an endpoint's limit are rejected before the view with Retry-After"""
+    app = make_app(RATELIMIT_ENABLED=True,
+                   RATE_LIMITS={'main.search': [('ip', '2/minute')], 'main.login': [('ip', '1/minute', 'POST')]})
+    client = app.test_client()
+
+    assert [client.get('/search?q=python').status_code for _ in range(3)] == [200, 200, 429]
+    response = client.get('/search?q=python')
+    assert response.status_code == 429 and int(response.headers['Retry-After']) >= 1
+
+    assert client.get('/login').status_code == 200
+    assert client.post('/login', data={'email': '', 'password': ''}).status_code == 200
+    assert client.post('/login', data={'email': '', 'password': ''}).status_code == 429
+    assert client.get('/login').status_code == 200
+
+
+def test_rejected_request_spends_no_tokens():
+    """When a later rule rejects, the earlier rules' buckets keep their tokens"""
+    handle, path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    try:
+        for store in (MemoryStore(), SQLiteStore(path)):
+            buckets = [('ip', 5, 1.0), ('endpoint', 1, 1 / 60)]
+            assert store.take_many(buckets, now=100.0) == (None, 0.0)
+            rejected, retry_after = store.take_many(buckets, now=100.0)
+            assert rejected == 1 and round(retry_after) == 60
+            # 'ip' still holds its 4 remaining tokens
+            assert [store.take('ip', 5, 1.0, now=100.0)[0] for _ in range(5)] == [True] * 4 + [False]
+
+            store.take('old', 5, 1.0, now=100.0)
+            if isinstance(store, SQLiteStore):
+                assert store.purge(3600, now=100.0 + 7200) == 3
+                assert store.take_many([('ip', 5, 1.0)], now=100.0 + 7200) == (None, 0.0)
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    test_token_bucket_refills()
+    test_over_limit_requests_get_429()
+    test_rejected_request_spends_no_tokens()
+    print("✅ All rate limit tests passed!")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import app.recommend as recommend_module
+from conftest import make_app
+from app.models import db, User, JobPosting, Application, SeekerRecommendation
+from app.recommend import Recommender, seeker_tokens, recommended_jobs
+
+
+def _recommender():
+    recommender = Recommender(top_n=2)
+    recommender.fit([
+        (1, 'Python Developer', 'Build Flask APIs with SQLAlchemy', 'Lagos', 'ng-lagos'),
+        (2, 'Registered Nurse', 'Care for patients on the ward', 'Abuja', 'ng-abuja'),
+        (3, 'Data Engineer', 'Python pipelines and SQL warehouses', 'Lagos', 'ng-lagos'),
+    ])
+    return recommender
+
+
+def test_scores_rank_similar_jobs_first():
+    """A Python seeker in Lagos is matched to Python jobs, excluding ones applied to"""
+    recommender = _recommender()
+    profile = recommender.profile_vector(seeker_tokens('Python and Flask developer', 'Lagos', 'ng-lagos'))
+    results = recommender.score({10: profile})
+    assert [job_id for job_id, _score in results[10]] == [1, 3]
+    results = recommender.score({10: profile}, exclude={10: {1}})
+    assert [job_id for job_id, _score in results[10]] == [3]
+
+
+def test_new_postings_match_stored_profiles():
+    """A folded-in posting is matched against stored profiles whose lists it beats"""
+    recommender = _recommender()
+    profile = recommender.profile_vector(seeker_tokens('Nursing and patient care', 'Abuja', 'ng-abuja'))
+    recommender.set_profile(20, profile, floor=0.0)
+    vector = recommender.add_job(4, 'Nurse', 'Patient care in Abuja', 'Abuja', 'ng-abuja')
+    assert [seeker_id for seeker_id, _score in recommender.match_job(vector)] == [20]
+    vector = recommender.add_job(5, 'Accountant', 'Ledgers and audits', 'Kano', 'ng-kano')
+    assert recommender.match_job(vector) == []
+
+
+def test_sparse_and_fallback_scoring_agree():
+    """The SciPy product (when installed) and the inverted-index fallback rank and score alike"""
+    profiles = {
+        10: _recommender().profile_vector(seeker_tokens('Python and Flask developer', 'Lagos', 'ng-lagos')),
+        11: _recommender().profile_vector(seeker_tokens('Nursing and patient care', 'Abuja', 'ng-abuja')),
+    }
+    exclude = {10: {1}}
+    installed = recommend_module.sparse
+    results = _recommender().score(profiles, exclude)
+    try:
+        recommend_module.sparse = None
+        fallback = _recommender().score(profiles, exclude)
+    finally:
+        recommend_module.sparse = installed
+
+    assert [job_id for job_id, _score in fallback[10]] == [3]
+    assert [job_id for job_id, _score in fallback[11]][0] == 2
+    for seeker_id in profiles:
+        assert [job_id for job_id, _score in results[seeker_id]] == [job_id for job_id, _score in fallback[seeker_id]]
+        for (_job, score), (_same_job, expected) in zip(results[seeker_id], fallback[seeker_id]):
+            assert abs(score - expected) < 1e-9
+
+
+def test_stored_lists_skip_jobs_applied_to_since(app):
+    """Reading a stored list drops postings applied to after it was computed; an unstored seeker's list is queued"""
+    with app.app_context():
+        employer = User('employer', 'employer@example.com', 'password', role='employer')
+        seeker = User('seeker', 'seeker@example.com', 'password', bio='Python developer building Flask APIs')
+        db.session.add_all([employer, seeker])
+        db.session.commit()
+        db.session.add_all([
+            JobPosting(title='Python Developer', description='Flask APIs', employer_id=employer.id),
+            JobPosting(title='Backend Python Engineer', description='Flask and SQL', employer_id=employer.id),
+        ])
+        db.session.commit()
+        recommend_module.fit_active_jobs()
+
+        assert len(recommended_jobs(seeker)) == 2
+        assert db.session.get(SeekerRecommendation, seeker.id) is not None  # stored by the queued task
+
+        first = recommended_jobs(seeker)[0]
+        db.session.add(Application(job_id=first.id, seeker_id=seeker.id))
+        db.session.commit()
+        remaining = recommended_jobs(seeker)
+        assert len(remaining) == 1 and remaining[0].id != first.id
+
+
+if __name__ == "__main__":
+    test_scores_rank_similar_jobs_first()
+    test_new_postings_match_stored_profiles()
+    test_sparse_and_fallback_scoring_agree()
+    test_stored_lists_skip_jobs_applied_to_since(make_app())
+    print("✅ All recommendation tests passed!")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from conftest import make_app
+from app.models import db, User, JobPosting
+from app.facets import facet_index
+from app.salary import parse_salary, SalaryInfo
+
+
+def test_parse_common_formats():
+    """Salary text is parsed into annualized min/max, currency and period"""
+    assert parse_salary('$50,000 - $70,000') == SalaryInfo(50000, 70000, 'USD', 'year')
+    assert parse_salary('50k-70k') == SalaryInfo(50000, 70000, None, 'year')
+    assert parse_salary('50-70k per year') == SalaryInfo(50000, 70000, None, 'year')
+    assert parse_salary('₦200,000/month') == SalaryInfo(2400000, 2400000, 'NGN', 'month')
+    assert parse_salary('NGN 300k - 450k monthly') == SalaryInfo(3600000, 5400000, 'NGN', 'month')
+    assert parse_salary('£30 per hour') == SalaryInfo(62400, 62400, 'GBP', 'hour')
+    assert parse_salary('1.2M naira per annum') == SalaryInfo(1200000, 1200000, 'NGN', 'year')
+
+
+def test_open_ended_and_missing_amounts():
+    """Open-ended ranges keep one bound; text without amounts is not parsed"""
+    assert parse_salary('80k+') == SalaryInfo(80000, None, None, 'year')
+    assert parse_salary('Up to $100k') == SalaryInfo(None, 100000, 'USD', 'year')
+    assert parse_salary('Competitive') is None
+    assert parse_salary('') is None
+    assert parse_salary(None) is None
+
+
+def test_filters_keep_open_ended_ranges(app, client):
+    """"80k+" passes a minimum filter and "up to 45k" a maximum filter on their one bound"""
+    with app.app_context():
+        employer = User('employer', 'employer@example.com', 'password', role='employer')
+        db.session.add(employer)
+        db.session.commit()
+        for title, salary_range in [('Senior', '80k+'), ('Junior', 'up to 45k'), ('Mid', '60k-70k')]:
+            db.session.add(JobPosting(title=title, description='Role', salary_range=salary_range,
+                                      employer_id=employer.id))
+        db.session.commit()
+        facet_index.rebuild(db.session.query(
+            JobPosting.id, JobPosting.job_type, JobPosting.location, JobPosting.salary_min, JobPosting.salary_max,
+            JobPosting.salary_currency))
+
+
+    def titles(query):
+        page = client.get(f'/jobs?{query}').get_data(as_text=True)
+        return {title for title in ('Senior', 'Junior', 'Mid') if f'fa-briefcase me-2"></i>{title}' in page}
+
+    assert titles('min_salary=75000') == {'Senior'}
+    assert titles('max_salary=55000') == {'Junior'}
+    assert titles('min_salary=65000&max_salary=90000') == {'Senior', 'Mid'}
+    assert titles('salary=under-50k') == {'Junior'}
+    assert {row['value'] for row in facet_index.counts()['salary']} == {'50k-100k', 'under-50k'}
+
+
+def test_filters_compare_one_currency_at_annual_rates(app, client):
+    """Amounts in other currencies get their own bucket; hourly rates are compared as annual pay"""
+    with app.app_context():
+        employer = User('employer', 'employer@example.com', 'password', role='employer')
+        db.session.add(employer)
+        db.session.commit()
+        for title, salary_range in [('Welder', '$30 per hour'), ('Banker', '₦200,000/month'), ('Clerk', '40k')]:
+            db.session.add(JobPosting(title=title, description='Role', salary_range=salary_range,
+                                      employer_id=employer.id))
+        db.session.commit()
+        facet_index.rebuild(db.session.query(
+            JobPosting.id, JobPosting.job_type, JobPosting.location, JobPosting.salary_min, JobPosting.salary_max,
+            JobPosting.salary_currency))
+
+
+    def titles(query):
+        page = client.get(f'/jobs?{query}').get_data(as_text=True)
+        return {title for title in ('Welder', 'Banker', 'Clerk') if f'fa-briefcase me-2"></i>{title}' in page}
+
+    assert titles('min_salary=60000') == {'Welder'}  # $62,400 a year, not ₦2.4M against USD bounds
+    assert titles('max_salary=50000') == {'Clerk'}
+    assert titles('salary=50k-100k') == {'Welder'}
+    assert titles('salary=other-currency') == {'Banker'}
+    counts = {row['value']: row['count'] for row in facet_index.counts()['salary']}
+    assert counts == {'50k-100k': 1, 'under-50k': 1, 'other-currency': 1}
+
+
+if __name__ == "__main__":
+    test_parse_common_formats()
+    test_open_ended_and_missing_amounts()
+    app = make_app()
+    test_filters_keep_open_ended_ranges(app, app.test_client())
+    app = make_app()
+    test_filters_compare_one_currency_at_annual_rates(app, app.test_client())
+    print("✅ All salary parser tests passed!")
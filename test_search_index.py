@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.search_index import SuggestionIndex
+
+
+def test_prefix_matches_any_word_ranked_by_popularity():
+    """Suggestions match word starts and the most common terms come first"""
+    index = SuggestionIndex()
+    index.add_job(1, 'Senior Developer', 'Acme', 'Lagos')
+    index.add_job(2, 'Developer', 'Acme', 'Lagos, NG')
+    index.add_job(3, 'Developer', 'Globex', 'Abuja')
+
+    suggestions = index.suggest('dev')
+    assert [s['text'] for s in suggestions] == ['Developer', 'Senior Developer']
+    assert suggestions[0]['count'] == 2
+
+    companies = index.suggest('ac', kinds={'company'})
+    assert companies == [{'text': 'Acme', 'type': 'company', 'count': 2}]
+
+
+def test_removing_last_posting_drops_term():
+    """Deactivated postings stop contributing suggestions"""
+    index = SuggestionIndex()
+    index.add_job(1, 'Data Analyst', None, 'Remote')
+    assert index.suggest('analyst')
+
+    index.remove_job(1)
+    assert index.suggest('analyst') == []
+    assert index.suggest('remote') == []
+    assert len(index) == 0
+
+
+def test_broad_prefixes_rank_the_whole_range():
+    """A popular term sorting after thousands of rarer ones under the same prefix still comes first"""
+    index = SuggestionIndex()
+    for job_id in range(3000):
+        index.add_job(job_id, f'Sales Rep {job_id:04d}')
+    for job_id in range(3000, 3005):
+        index.add_job(job_id, 'Software Engineer')
+    assert index.suggest('s', limit=1)[0]['text'] == 'Software Engineer'
+
+    # A memoized lookup is refreshed when a term under its prefix changes popularity
+    for job_id in range(3005, 3011):
+        index.add_job(job_id, 'Sales Rep 0001')
+    assert index.suggest('s', limit=1) == [{'text': 'Sales Rep 0001', 'type': 'title', 'count': 7}]
+    assert index.suggest('software')[0]['count'] == 5
+
+
+if __name__ == "__main__":
+    test_prefix_matches_any_word_ranked_by_popularity()
+    test_removing_last_posting_drops_term()
+    test_broad_prefixes_rank_the_whole_range()
+    print("✅ All search index tests passed!")
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import datetime, timedelta
+
+from app import create_app
+from conftest import make_app
+from app.models import db, QueuedTask, TaskSchedule
+from app.tasks import (task, enqueue, run_next, claim_task, requeue_stale, schedule, run_due_schedules,
+                       TaskWorker, DONE, FAILED, QUEUED, RUNNING)
+
+calls = []
+
+
+@task('test.record')
+def record(value):
+    calls.append(value)
+
+
+@task('test.flaky', max_attempts=2, retry_delay=60)
+def flaky():
+    raise RuntimeError('boom')
+
+
+def test_tasks_persist_and_retry():
+    """Queued tasks wait in the table, run once, and failures back off until attempts run out"""
+    app = make_app(TASK_QUEUE_EAGER=False)
+    with app.app_context():
+        calls.clear()
+        done_id = enqueue('test.record', value=1)
+        flaky_id = enqueue('test.flaky')
+        later_id = enqueue('test.record', delay=3600, value=2)
+        assert calls == []
+
+        assert run_next('w1') and run_next('w1')
+        assert not run_next('w1')  # the retry and the delayed task aren't due yet
+        assert calls == [1]
+        assert db.session.get(QueuedTask, done_id).status == DONE
+
+        retried = db.session.get(QueuedTask, flaky_id)
+        assert retried.status == QUEUED and retried.attempts == 1 and 'boom' in retried.last_error
+        assert retried.run_at > datetime.utcnow() + timedelta(seconds=50)
+
+        retried.run_at = datetime.utcnow()
+        db.session.commit()
+        assert run_next('w1')
+        db.session.expire_all()
+        assert db.session.get(QueuedTask, flaky_id).status == FAILED
+        assert db.session.get(QueuedTask, later_id).status == QUEUED
+
+
+def test_dead_worker_tasks_are_requeued():
+    """A task left running past its lease goes back to the queue"""
+    app = make_app(TASK_QUEUE_EAGER=False)
+    with app.app_context():
+        task_id = enqueue('test.record', value=3)
+        assert claim_task('crashed').id == task_id
+        assert requeue_stale(300) == 0
+        assert requeue_stale(300, now=datetime.utcnow() + timedelta(seconds=301)) == 1
+        db.session.expire_all()
+        stored = db.session.get(QueuedTask, task_id)
+        assert stored.status == QUEUED and stored.locked_by is None
+
+
+def test_schedule_enqueues_once_per_interval():
+    """Several scheduler ticks at the same due time enqueue one task"""
+    app = make_app(TASK_QUEUE_EAGER=False)
+    with app.app_context():
+        schedule('test.every-minute', 60, 'test.record', value='tick')
+        try:
+            now = datetime.utcnow()
+            assert 'test.every-minute' not in run_due_schedules(now)  # registered, first run one interval out
+            due = now + timedelta(seconds=61)
+            assert 'test.every-minute' in run_due_schedules(due)
+            assert 'test.every-minute' not in run_due_schedules(due)  # e.g. a second process ticking
+            assert QueuedTask.query.filter_by(name='test.record').count() == 1
+            assert db.session.get(TaskSchedule, 'test.every-minute').next_run_at == due + timedelta(seconds=60)
+        finally:
+            from app.tasks import _schedules
+            _schedules.pop('test.every-minute', None)
+
+
+def test_worker_threads_drain_the_queue():
+    """Worker threads pick enqueued tasks up without the request waiting for them"""
+    handle, path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    app = make_app(TASK_QUEUE_EAGER=False, SQLALCHEMY_DATABASE_URI=f'sqlite:///{path}')
+    worker = TaskWorker(app, threads=2, poll_interval=0.05)
+    try:
+        with app.app_context():
+            calls.clear()
+            worker.start()
+            for value in range(10):
+                enqueue('test.record', value=value)
+            deadline = time.time() + 10
+            while QueuedTask.query.filter(QueuedTask.status.in_([QUEUED, RUNNING])).count() and time.time() < deadline:
+                time.sleep(0.05)
+            assert sorted(calls) == list(range(10))
+            assert QueuedTask.query.filter_by(status=DONE).count() == 10
+    finally:
+        worker.stop(timeout=5)
+        with app.app_context():
+            db.engine.dispose()
+        os.remove(path)
+
+
+def test_background_services_are_opt_in():
+    """Outside the server entry point create_app starts no threads, even with TESTING off"""
+    handle, path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    try:
+        app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}', 'TEMPLATE_BYTECODE_CACHE': False})
+        assert not app.config['BACKGROUND_SERVICES']
+        started = {'task_worker', 'task_scheduler', 'job_sweeper', 'analytics_rollup', 'database_backup',
+                   'activity_flusher', 'audit_flusher'} & set(app.extensions)
+        assert started == set()
+        with app.app_context():
+            db.engine.dispose()
+    finally:
+        os.remove(path)
+
+
+def test_eager_task_errors_reach_the_caller():
+    """Inline tasks raise under TESTING instead of failing silently"""
+    app = make_app()
+    with app.app_context():
+        try:
+            enqueue('test.flaky')
+        except RuntimeError as e:
+            assert str(e) == 'boom'
+        else:
+            raise AssertionError('eager task error was swallowed')
+
+        app.config['TASK_EAGER_PROPAGATE'] = False
+        assert enqueue('test.flaky') is None  # logged instead
+
+
+if __name__ == "__main__":
+    test_tasks_persist_and_retry()
+    test_dead_worker_tasks_are_requeued()
+    test_schedule_enqueues_once_per_interval()
+    test_worker_threads_drain_the_queue()
+    test_background_services_are_opt_in()
+    test_eager_task_errors_reach_the_caller()
+    print("✅ All task queue tests passed!")
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from conftest import make_app
+from app.template_cache import precompile_templates
+
+
+def test_templates_precompile_into_shared_cache():
+    """Every template compiles into the bytecode cache, which a second app then reuses"""
+    cache_dir = tempfile.mkdtemp()
+    try:
+        config = {'TEMPLATE_BYTECODE_CACHE': True, 'TEMPLATE_CACHE_DIR': cache_dir}
+        app = make_app(TEMPLATE_PRECOMPILE=True, **config)
+        assert app.jinja_env.auto_reload is False
+        cached = sorted(os.listdir(cache_dir))
+        names = [name for name, _seconds in precompile_templates(app)]
+        assert 'base.html' in names and 'errors/404.html' in names
+        assert len(cached) == len(names)
+
+        second = make_app(**config)
+        report = precompile_templates(second)
+        assert sorted(os.listdir(cache_dir)) == cached
+        assert len(report) == len(names)
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+if __name__ == "__main__":
+    test_templates_precompile_into_shared_cache()
+    print("✅ All template cache tests passed!")